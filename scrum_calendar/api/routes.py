@@ -2,7 +2,6 @@ import csv
 import io
 import json
 import re
-import threading
 import unicodedata
 from datetime import date, datetime, timedelta
 import time
@@ -29,9 +28,9 @@ from fastapi import (
 )
 from fastapi.responses import JSONResponse, RedirectResponse
 from starlette.websockets import WebSocketState
-from sqlalchemy import func
+from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 import openpyxl
 
@@ -111,13 +110,27 @@ from api.schemas import (
     SprintOut,
     SprintUpdate,
 )
+from app.modules.reports.application.use_cases import refresh_release_reports
+from app.shared.infrastructure.resource_versions import bump_versions
+from app.shared.interface.conditional import conditional_list
+from app.shared.interface.pagination import (
+    PageParams,
+    apply_keyset,
+    fast_page,
+    keyset_page,
+    page_dicts,
+    page_params,
+    split_page,
+)
 from core.calendar_engine import dias_habiles
 from core.metrics import porcentaje_capacidad
 from core.sprint_capacity import clasificar_estado
 from core.audit import log_security_event
+from core.rate_limit import build_login_rate_limiter
 from core.security import hash_password, needs_password_rehash, new_session_token, verify_password
+from core.ui_session import UI_SESSION_HINTS, clear_ui_hint_cookie
 from config.settings import settings
-from data.db import SessionLocal, get_db
+from data.db import get_db, run_db, run_ws_db
 from data.models import (
     Celula,
     Evento,
@@ -141,12 +154,14 @@ from data.models import (
     RetrospectiveItem,
     Persona,
     QuarterOption,
+    QuarterRollup,
     ReleaseImportItem,
     ReleaseItem,
     Sesion,
     Sprint,
     SprintImportItem,
     SprintItem,
+    SprintMetric,
     Usuario,
     now_py,
     persona_celulas,
@@ -160,60 +175,7 @@ SESSION_COOKIE = "scrum_session"
 SESSION_DAYS = 14
 
 
-class LoginRateLimiter:
-    def __init__(self, max_attempts: int, window_seconds: int, block_seconds: int) -> None:
-        self.max_attempts = max(1, int(max_attempts or 1))
-        self.window_seconds = max(1, int(window_seconds or 1))
-        self.block_seconds = max(1, int(block_seconds or 1))
-        self._lock = threading.Lock()
-        self._state: dict[str, dict[str, object]] = {}
-
-    def _prune(self, attempts: list[float], now_ts: float) -> list[float]:
-        floor = now_ts - self.window_seconds
-        return [ts for ts in attempts if ts >= floor]
-
-    def check(self, key: str) -> tuple[bool, int]:
-        now_ts = time.time()
-        with self._lock:
-            row = self._state.get(key)
-            if not row:
-                return True, 0
-            blocked_until = float(row.get("blocked_until") or 0)
-            if blocked_until > now_ts:
-                return False, max(1, int(blocked_until - now_ts))
-            attempts = self._prune(list(row.get("attempts") or []), now_ts)
-            if attempts:
-                row["attempts"] = attempts
-                row["blocked_until"] = 0.0
-                self._state[key] = row
-            else:
-                self._state.pop(key, None)
-            return True, 0
-
-    def fail(self, key: str) -> None:
-        now_ts = time.time()
-        with self._lock:
-            row = self._state.get(key) or {"attempts": [], "blocked_until": 0.0}
-            attempts = self._prune(list(row.get("attempts") or []), now_ts)
-            attempts.append(now_ts)
-            if len(attempts) >= self.max_attempts:
-                row["attempts"] = []
-                row["blocked_until"] = now_ts + self.block_seconds
-            else:
-                row["attempts"] = attempts
-                row["blocked_until"] = 0.0
-            self._state[key] = row
-
-    def success(self, key: str) -> None:
-        with self._lock:
-            self._state.pop(key, None)
-
-
-LOGIN_RATE_LIMITER = LoginRateLimiter(
-    settings.login_rate_limit_max_attempts,
-    settings.login_rate_limit_window_seconds,
-    settings.login_rate_limit_block_seconds,
-)
+LOGIN_RATE_LIMITER = build_login_rate_limiter()
 
 
 def _request_ip(request: Request) -> str:
@@ -668,7 +630,9 @@ def logout(
     if scrum_session:
         db.query(Sesion).filter(Sesion.token == scrum_session).delete(synchronize_session=False)
         db.commit()
+        UI_SESSION_HINTS.revoke_session(scrum_session)
     response.delete_cookie(SESSION_COOKIE, path="/")
+    clear_ui_hint_cookie(response)
     log_security_event(
         "logout",
         "INFO",
@@ -794,6 +758,7 @@ def actualizar_usuario(
         target.password_hash = hash_password(payload.password)
     db.commit()
     db.refresh(target)
+    UI_SESSION_HINTS.revoke_user(target.id)
     log_security_event(
         "user_updated",
         "INFO",
@@ -1537,69 +1502,65 @@ async def retro_ws(websocket: WebSocket, token: str) -> None:
                     item_payload = payload.get("item") if isinstance(payload.get("item"), dict) else {}
                     # IMPORTANT: SQLAlchemy is sync. Never run DB queries inside the WS event loop,
                     # otherwise 20 concurrent users will stall BOTH WS and HTTP endpoints.
-                    def persist_item() -> tuple[Retrospective, dict]:
-                        db = SessionLocal()
-                        try:
-                            retro = (
-                                db.query(Retrospective)
-                                .filter(Retrospective.token == token)
-                                .first()
+                    def persist_item(db: Session) -> tuple[dict, dict]:
+                        retro = (
+                            db.query(Retrospective)
+                            .filter(Retrospective.token == token)
+                            .first()
+                        )
+                        if not retro:
+                            raise HTTPException(
+                                status_code=404, detail="Retrospectiva no encontrada"
                             )
-                            if not retro:
-                                raise HTTPException(
-                                    status_code=404, detail="Retrospectiva no encontrada"
-                                )
-                            if retro.estado != "abierta":
-                                raise HTTPException(status_code=403, detail="Retrospectiva cerrada")
-                            if retro.fase not in {"bien", "mal"}:
-                                raise HTTPException(
-                                    status_code=403, detail="Esperando inicio del SM"
-                                )
-                            tipo = normalize_retro_tipo(item_payload.get("tipo"))
-                            if tipo == "compromiso":
-                                raise HTTPException(status_code=403, detail="Compromisos solo SM")
-                            if retro.fase != tipo:
-                                raise HTTPException(status_code=400, detail="Fase actual distinta")
-                            detalle = (item_payload.get("detalle") or "").strip()
-                            if not detalle:
-                                raise HTTPException(status_code=400, detail="Detalle requerido")
-                            persona_id = item_payload.get("persona_id")
-                            if persona_id is None:
-                                raise HTTPException(status_code=400, detail="Persona requerida")
-                            persona = db.get(Persona, int(persona_id))
-                            if not persona or not persona.activo:
-                                raise HTTPException(status_code=404, detail="Persona no encontrada")
-                            belongs = db.execute(
-                                persona_celulas.select().where(
-                                    persona_celulas.c.persona_id == persona.id,
-                                    persona_celulas.c.celula_id == retro.celula_id,
-                                )
-                            ).first()
-                            if not belongs:
-                                raise HTTPException(status_code=404, detail="Persona no encontrada")
-                            item = RetrospectiveItem(
-                                retro_id=retro.id,
-                                tipo=tipo,
-                                detalle=detalle,
-                                persona_id=persona.id,
-                                estado="pendiente",
+                        if retro.estado != "abierta":
+                            raise HTTPException(status_code=403, detail="Retrospectiva cerrada")
+                        if retro.fase not in {"bien", "mal"}:
+                            raise HTTPException(
+                                status_code=403, detail="Esperando inicio del SM"
                             )
-                            db.add(item)
-                            try:
-                                db.commit()
-                            except IntegrityError:
-                                db.rollback()
-                                raise HTTPException(status_code=400, detail="No se pudo guardar")
-                            db.refresh(item)
-                            # Detach data from the session for safe cross-thread usage.
-                            retro_schema = {"id": retro.id, "token": retro.token}
-                            return retro_schema, retro_item_to_schema(item)
-                        finally:
-                            db.close()
-
-                    # anyio.to_thread.run_sync may hang in some WS contexts; asyncio.to_thread is
-                    # reliable under uvicorn's asyncio loop.
-                    retro_schema, item_schema = await asyncio.to_thread(persist_item)
+                        tipo = normalize_retro_tipo(item_payload.get("tipo"))
+                        if tipo == "compromiso":
+                            raise HTTPException(status_code=403, detail="Compromisos solo SM")
+                        if retro.fase != tipo:
+                            raise HTTPException(status_code=400, detail="Fase actual distinta")
+                        detalle = (item_payload.get("detalle") or "").strip()
+                        if not detalle:
+                            raise HTTPException(status_code=400, detail="Detalle requerido")
+                        persona_id = item_payload.get("persona_id")
+                        if persona_id is None:
+                            raise HTTPException(status_code=400, detail="Persona requerida")
+                        persona = db.get(Persona, int(persona_id))
+                        if not persona or not persona.activo:
+                            raise HTTPException(status_code=404, detail="Persona no encontrada")
+                        belongs = db.execute(
+                            persona_celulas.select().where(
+                                persona_celulas.c.persona_id == persona.id,
+                                persona_celulas.c.celula_id == retro.celula_id,
+                            )
+                        ).first()
+                        if not belongs:
+                            raise HTTPException(status_code=404, detail="Persona no encontrada")
+                        item = RetrospectiveItem(
+                            retro_id=retro.id,
+                            tipo=tipo,
+                            detalle=detalle,
+                            persona_id=persona.id,
+                            estado="pendiente",
+                        )
+                        db.add(item)
+                        try:
+                            db.commit()
+                        except IntegrityError:
+                            db.rollback()
+                            raise HTTPException(status_code=400, detail="No se pudo guardar")
+                        db.refresh(item)
+                        # Detach data from the session for safe cross-thread usage.
+                        retro_schema = {"id": retro.id, "token": retro.token}
+                        return retro_schema, retro_item_to_schema(item)
+
+                    # Async driver when installed, else the bounded WS executor (anyio.to_thread
+                    # may hang in some WS contexts).
+                    retro_schema, item_schema = await run_ws_db(persist_item)
                     # Ack the sender quickly, then broadcast to everyone.
                     await retro_ws_manager.send_one(
                         token, websocket, {"type": "submit_ack", "item": item_schema}
@@ -1658,77 +1619,73 @@ async def poker_ws(websocket: WebSocket, token: str) -> None:
                 try:
                     vote_payload = payload.get("vote") if isinstance(payload.get("vote"), dict) else {}
 
-                    def persist_vote() -> dict:
-                        db = SessionLocal()
+                    def persist_vote(db: Session) -> dict:
+                        sesion = (
+                            db.query(PokerSession)
+                            .filter(PokerSession.token == token)
+                            .first()
+                        )
+                        if not sesion:
+                            raise HTTPException(status_code=404, detail="Sesion no encontrada")
+                        if sesion.estado != "abierta":
+                            raise HTTPException(status_code=403, detail="Sesion cerrada")
+                        if sesion.fase not in {"votacion", "espera"}:
+                            raise HTTPException(status_code=403, detail="Votacion no habilitada")
+
+                        raw_valor = vote_payload.get("valor")
                         try:
-                            sesion = (
-                                db.query(PokerSession)
-                                .filter(PokerSession.token == token)
-                                .first()
+                            valor = int(raw_valor)
+                        except Exception:
+                            raise HTTPException(status_code=400, detail="Valor invalido")
+                        if valor not in {1, 2, 3, 5, 8, 13, 21}:
+                            raise HTTPException(status_code=400, detail="Valor invalido")
+
+                        raw_persona_id = vote_payload.get("persona_id")
+                        try:
+                            persona_id = int(raw_persona_id)
+                        except Exception:
+                            raise HTTPException(status_code=400, detail="Persona requerida")
+
+                        persona = (
+                            db.query(Persona)
+                            .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
+                            .filter(
+                                Persona.id == persona_id,
+                                persona_celulas.c.celula_id == sesion.celula_id,
+                                Persona.activo.is_(True),
                             )
-                            if not sesion:
-                                raise HTTPException(status_code=404, detail="Sesion no encontrada")
-                            if sesion.estado != "abierta":
-                                raise HTTPException(status_code=403, detail="Sesion cerrada")
-                            if sesion.fase not in {"votacion", "espera"}:
-                                raise HTTPException(status_code=403, detail="Votacion no habilitada")
-
-                            raw_valor = vote_payload.get("valor")
-                            try:
-                                valor = int(raw_valor)
-                            except Exception:
-                                raise HTTPException(status_code=400, detail="Valor invalido")
-                            if valor not in {1, 2, 3, 5, 8, 13, 21}:
-                                raise HTTPException(status_code=400, detail="Valor invalido")
-
-                            raw_persona_id = vote_payload.get("persona_id")
-                            try:
-                                persona_id = int(raw_persona_id)
-                            except Exception:
-                                raise HTTPException(status_code=400, detail="Persona requerida")
-
-                            persona = (
-                                db.query(Persona)
-                                .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
-                                .filter(
-                                    Persona.id == persona_id,
-                                    persona_celulas.c.celula_id == sesion.celula_id,
-                                    Persona.activo.is_(True),
-                                )
-                                .first()
+                            .first()
+                        )
+                        if not persona:
+                            raise HTTPException(status_code=404, detail="Persona no encontrada")
+
+                        vote = (
+                            db.query(PokerVote)
+                            .filter(
+                                PokerVote.sesion_id == sesion.id,
+                                PokerVote.persona_id == persona.id,
                             )
-                            if not persona:
-                                raise HTTPException(status_code=404, detail="Persona no encontrada")
-
-                            vote = (
-                                db.query(PokerVote)
-                                .filter(
-                                    PokerVote.sesion_id == sesion.id,
-                                    PokerVote.persona_id == persona.id,
-                                )
-                                .first()
+                            .first()
+                        )
+                        if not vote:
+                            vote = PokerVote(
+                                sesion_id=sesion.id,
+                                persona_id=persona.id,
+                                valor=valor,
                             )
-                            if not vote:
-                                vote = PokerVote(
-                                    sesion_id=sesion.id,
-                                    persona_id=persona.id,
-                                    valor=valor,
-                                )
-                                db.add(vote)
-                            else:
-                                vote.valor = valor
-                            vote.actualizado_en = now_py()
-                            db.commit()
-                            db.refresh(vote)
-                            return {
-                                "session_id": int(sesion.id),
-                                "persona_id": int(vote.persona_id),
-                                "valor": int(vote.valor),
-                            }
-                        finally:
-                            db.close()
-
-                    vote_schema = await asyncio.to_thread(persist_vote)
+                            db.add(vote)
+                        else:
+                            vote.valor = valor
+                        vote.actualizado_en = now_py()
+                        db.commit()
+                        db.refresh(vote)
+                        return {
+                            "session_id": int(sesion.id),
+                            "persona_id": int(vote.persona_id),
+                            "valor": int(vote.valor),
+                        }
+
+                    vote_schema = await run_ws_db(persist_vote)
                     await poker_ws_manager.send_one(
                         token,
                         websocket,
@@ -2021,6 +1978,7 @@ def listar_retros(
 @router.get("/retros/compromisos", response_model=List[RetroCommitmentOut])
 def listar_compromisos(
     celula_id: int,
+    page: PageParams = Depends(page_params),
     scrum_session: Optional[str] = Cookie(default=None),
     db: Session = Depends(get_db),
 ):
@@ -2028,7 +1986,7 @@ def listar_compromisos(
     if not user:
         raise HTTPException(status_code=401, detail="No autenticado")
     require_admin(user)
-    items = (
+    query = (
         db.query(RetrospectiveItem)
         .join(Retrospective, RetrospectiveItem.retro_id == Retrospective.id)
         .options(
@@ -2040,8 +1998,10 @@ def listar_compromisos(
             RetrospectiveItem.tipo == "compromiso",
         )
         .order_by(Retrospective.sprint_id.desc(), RetrospectiveItem.fecha_compromiso.desc())
-        .all()
     )
+    if page.paginated:
+        query = apply_keyset(query, RetrospectiveItem, page)
+    items, next_cursor = split_page(query.all(), page)
     results: list[dict] = []
     for item in items:
         sprint_nombre = ""
@@ -2064,7 +2024,7 @@ def listar_compromisos(
                 "estado": item.estado,
             }
         )
-    return results
+    return page_dicts(results, page, RetroCommitmentOut, next_cursor)
 
 
 @router.post("/retros", response_model=RetroOut, status_code=status.HTTP_201_CREATED)
@@ -2229,89 +2189,91 @@ def eliminar_retro_item(
 
 
 @router.get("/retros/public/{token}", response_model=RetroPublicOut)
-def obtener_retro_publico(token: str, db: Session = Depends(get_db)):
-    retro = (
-        db.query(Retrospective)
-        .options(joinedload(Retrospective.celula), joinedload(Retrospective.sprint))
-        .filter(Retrospective.token == token)
-        .first()
-    )
-    if not retro:
-        raise HTTPException(status_code=404, detail="Retrospectiva no encontrada")
-    personas = (
-        db.query(Persona)
-        .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
-        .filter(persona_celulas.c.celula_id == retro.celula_id, Persona.activo.is_(True))
-        .order_by(Persona.nombre, Persona.apellido)
-        .all()
-    )
-    return {
-        "id": retro.id,
-        "celula_id": retro.celula_id,
-        "sprint_id": retro.sprint_id,
-        "celula_nombre": retro.celula.nombre if retro.celula else "",
-        "sprint_nombre": retro.sprint.nombre if retro.sprint else "",
-        "estado": retro.estado,
-        "fase": retro.fase,
-        "token": retro.token,
-        "personas": [
-            {
-                "id": p.id,
-                "nombre": p.nombre,
-                "apellido": p.apellido,
-                "activo": p.activo,
-            }
-            for p in personas
-        ],
-        "claimed_persona_ids": retro_claim_ids(db, retro.id),
-    }
+async def obtener_retro_publico(token: str):
+    def load(db: Session):
+        retro = (
+            db.query(Retrospective)
+            .options(joinedload(Retrospective.celula), joinedload(Retrospective.sprint))
+            .filter(Retrospective.token == token)
+            .first()
+        )
+        if not retro:
+            raise HTTPException(status_code=404, detail="Retrospectiva no encontrada")
+        personas = (
+            db.query(Persona)
+            .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
+            .filter(persona_celulas.c.celula_id == retro.celula_id, Persona.activo.is_(True))
+            .order_by(Persona.nombre, Persona.apellido)
+            .all()
+        )
+        return {
+            "id": retro.id,
+            "celula_id": retro.celula_id,
+            "sprint_id": retro.sprint_id,
+            "celula_nombre": retro.celula.nombre if retro.celula else "",
+            "sprint_nombre": retro.sprint.nombre if retro.sprint else "",
+            "estado": retro.estado,
+            "fase": retro.fase,
+            "token": retro.token,
+            "personas": [
+                {
+                    "id": p.id,
+                    "nombre": p.nombre,
+                    "apellido": p.apellido,
+                    "activo": p.activo,
+                }
+                for p in personas
+            ],
+            "claimed_persona_ids": retro_claim_ids(db, retro.id),
+        }
+
+    return await run_db(load)
 
 
 @router.get("/retros/public", response_model=RetroPublicOut)
-def obtener_retro_publico_por_sprint(
-    celula_id: int,
-    sprint_id: int,
-    db: Session = Depends(get_db),
-):
-    retro = (
-        db.query(Retrospective)
-        .options(joinedload(Retrospective.celula), joinedload(Retrospective.sprint))
-        .filter(
-            Retrospective.celula_id == celula_id,
-            Retrospective.sprint_id == sprint_id,
+async def obtener_retro_publico_por_sprint(celula_id: int, sprint_id: int):
+    def load(db: Session):
+        retro = (
+            db.query(Retrospective)
+            .options(joinedload(Retrospective.celula), joinedload(Retrospective.sprint))
+            .filter(
+                Retrospective.celula_id == celula_id,
+                Retrospective.sprint_id == sprint_id,
+            )
+            .order_by(Retrospective.actualizado_en.desc())
+            .first()
         )
-        .order_by(Retrospective.actualizado_en.desc())
-        .first()
-    )
-    if not retro:
-        raise HTTPException(status_code=404, detail="Retrospectiva no encontrada")
-    personas = (
-        db.query(Persona)
-        .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
-        .filter(persona_celulas.c.celula_id == retro.celula_id, Persona.activo.is_(True))
-        .order_by(Persona.nombre, Persona.apellido)
-        .all()
-    )
-    return {
-        "id": retro.id,
-        "celula_id": retro.celula_id,
-        "sprint_id": retro.sprint_id,
-        "celula_nombre": retro.celula.nombre if retro.celula else "",
-        "sprint_nombre": retro.sprint.nombre if retro.sprint else "",
-        "estado": retro.estado,
-        "fase": retro.fase,
-        "token": retro.token,
-        "personas": [
-            {
-                "id": p.id,
-                "nombre": p.nombre,
-                "apellido": p.apellido,
-                "activo": p.activo,
-            }
-            for p in personas
-        ],
-        "claimed_persona_ids": retro_claim_ids(db, retro.id),
-    }
+        if not retro:
+            raise HTTPException(status_code=404, detail="Retrospectiva no encontrada")
+        personas = (
+            db.query(Persona)
+            .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
+            .filter(persona_celulas.c.celula_id == retro.celula_id, Persona.activo.is_(True))
+            .order_by(Persona.nombre, Persona.apellido)
+            .all()
+        )
+        return {
+            "id": retro.id,
+            "celula_id": retro.celula_id,
+            "sprint_id": retro.sprint_id,
+            "celula_nombre": retro.celula.nombre if retro.celula else "",
+            "sprint_nombre": retro.sprint.nombre if retro.sprint else "",
+            "estado": retro.estado,
+            "fase": retro.fase,
+            "token": retro.token,
+            "personas": [
+                {
+                    "id": p.id,
+                    "nombre": p.nombre,
+                    "apellido": p.apellido,
+                    "activo": p.activo,
+                }
+                for p in personas
+            ],
+            "claimed_persona_ids": retro_claim_ids(db, retro.id),
+        }
+
+    return await run_db(load)
 
 
 @router.post("/retros/public/{token}/claim")
@@ -2612,68 +2574,74 @@ def obtener_poker_presencia(
 
 
 @router.get("/poker/public/{token}", response_model=PokerPublicOut)
-def obtener_poker_publico(token: str, db: Session = Depends(get_db)):
-    sesion = (
-        db.query(PokerSession)
-        .options(joinedload(PokerSession.celula))
-        .filter(PokerSession.token == token)
-        .first()
-    )
-    if not sesion:
-        raise HTTPException(status_code=404, detail="Sesion no encontrada")
-    personas = (
-        db.query(Persona)
-        .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
-        .filter(persona_celulas.c.celula_id == sesion.celula_id, Persona.activo.is_(True))
-        .order_by(Persona.nombre, Persona.apellido)
-        .all()
-    )
-    return {
-        "id": sesion.id,
-        "celula_id": sesion.celula_id,
-        "celula_nombre": sesion.celula.nombre if sesion.celula else "",
-        "estado": sesion.estado,
-        "fase": sesion.fase,
-        "token": sesion.token,
-        "personas": [
-            {"id": p.id, "nombre": p.nombre, "apellido": p.apellido, "activo": p.activo}
-            for p in personas
-        ],
-        "claimed_persona_ids": poker_claim_ids(db, sesion.id),
-    }
+async def obtener_poker_publico(token: str):
+    def load(db: Session):
+        sesion = (
+            db.query(PokerSession)
+            .options(joinedload(PokerSession.celula))
+            .filter(PokerSession.token == token)
+            .first()
+        )
+        if not sesion:
+            raise HTTPException(status_code=404, detail="Sesion no encontrada")
+        personas = (
+            db.query(Persona)
+            .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
+            .filter(persona_celulas.c.celula_id == sesion.celula_id, Persona.activo.is_(True))
+            .order_by(Persona.nombre, Persona.apellido)
+            .all()
+        )
+        return {
+            "id": sesion.id,
+            "celula_id": sesion.celula_id,
+            "celula_nombre": sesion.celula.nombre if sesion.celula else "",
+            "estado": sesion.estado,
+            "fase": sesion.fase,
+            "token": sesion.token,
+            "personas": [
+                {"id": p.id, "nombre": p.nombre, "apellido": p.apellido, "activo": p.activo}
+                for p in personas
+            ],
+            "claimed_persona_ids": poker_claim_ids(db, sesion.id),
+        }
+
+    return await run_db(load)
 
 
 @router.get("/poker/public", response_model=PokerPublicOut)
-def obtener_poker_publico_por_celula(celula_id: int, db: Session = Depends(get_db)):
-    sesion = (
-        db.query(PokerSession)
-        .options(joinedload(PokerSession.celula))
-        .filter(PokerSession.celula_id == celula_id, PokerSession.estado == "abierta")
-        .order_by(PokerSession.actualizado_en.desc())
-        .first()
-    )
-    if not sesion:
-        raise HTTPException(status_code=404, detail="Sesion no encontrada")
-    personas = (
-        db.query(Persona)
-        .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
-        .filter(persona_celulas.c.celula_id == sesion.celula_id, Persona.activo.is_(True))
-        .order_by(Persona.nombre, Persona.apellido)
-        .all()
-    )
-    return {
-        "id": sesion.id,
-        "celula_id": sesion.celula_id,
-        "celula_nombre": sesion.celula.nombre if sesion.celula else "",
-        "estado": sesion.estado,
-        "fase": sesion.fase,
-        "token": sesion.token,
-        "personas": [
-            {"id": p.id, "nombre": p.nombre, "apellido": p.apellido, "activo": p.activo}
-            for p in personas
-        ],
-        "claimed_persona_ids": poker_claim_ids(db, sesion.id),
-    }
+async def obtener_poker_publico_por_celula(celula_id: int):
+    def load(db: Session):
+        sesion = (
+            db.query(PokerSession)
+            .options(joinedload(PokerSession.celula))
+            .filter(PokerSession.celula_id == celula_id, PokerSession.estado == "abierta")
+            .order_by(PokerSession.actualizado_en.desc())
+            .first()
+        )
+        if not sesion:
+            raise HTTPException(status_code=404, detail="Sesion no encontrada")
+        personas = (
+            db.query(Persona)
+            .join(persona_celulas, persona_celulas.c.persona_id == Persona.id)
+            .filter(persona_celulas.c.celula_id == sesion.celula_id, Persona.activo.is_(True))
+            .order_by(Persona.nombre, Persona.apellido)
+            .all()
+        )
+        return {
+            "id": sesion.id,
+            "celula_id": sesion.celula_id,
+            "celula_nombre": sesion.celula.nombre if sesion.celula else "",
+            "estado": sesion.estado,
+            "fase": sesion.fase,
+            "token": sesion.token,
+            "personas": [
+                {"id": p.id, "nombre": p.nombre, "apellido": p.apellido, "activo": p.activo}
+                for p in personas
+            ],
+            "claimed_persona_ids": poker_claim_ids(db, sesion.id),
+        }
+
+    return await run_db(load)
 
 
 @router.post("/poker/public/{token}/claim")
@@ -2877,17 +2845,21 @@ def eliminar_retro(
 
 
 @router.get("/celulas", response_model=List[CelulaOut])
-def listar_celulas(db: Session = Depends(get_db)):
-    return db.query(Celula).order_by(Celula.id).all()
+async def listar_celulas(request: Request):
+    return await run_db(
+        lambda db: conditional_list(
+            request, db, "celulas", CelulaOut, lambda: db.query(Celula).order_by(Celula.id).all()
+        )
+    )
 
 
 @router.get("/public/celulas", response_model=List[CelulaOut])
-def listar_celulas_publicas(db: Session = Depends(get_db)):
+async def listar_celulas_publicas():
     """
     Public endpoint used by the login page to let the user pick a cell before
     authenticating (selection is stored in localStorage).
     """
-    return db.query(Celula).filter(Celula.activa == True).order_by(Celula.id).all()
+    return await run_db(lambda db: db.query(Celula).filter(Celula.activa == True).order_by(Celula.id).all())
 
 
 @router.post("/celulas", response_model=CelulaOut, status_code=status.HTTP_201_CREATED)
@@ -2907,6 +2879,7 @@ def crear_celula(
         raise HTTPException(status_code=409, detail="Codigo JIRA ya existe")
     celula = Celula(nombre=payload.nombre, jira_codigo=jira_codigo, activa=payload.activa)
     db.add(celula)
+    bump_versions(db, "celulas")
     db.commit()
     db.refresh(celula)
     return celula
@@ -2938,6 +2911,7 @@ def actualizar_celula(
         celula.jira_codigo = jira_codigo
     if payload.activa is not None:
         celula.activa = payload.activa
+    bump_versions(db, "celulas", "personas")
     db.commit()
     db.refresh(celula)
     return celula
@@ -2959,16 +2933,35 @@ def desactivar_celula(
         db.query(Evento).filter(Evento.sprint_id.in_(sprint_ids)).delete(
             synchronize_session=False
         )
+    # Report tables point at the sprints and the celula; clear them first.
+    db.query(SprintMetric).filter(
+        or_(SprintMetric.sprint_id.in_(sprint_ids), SprintMetric.celula_id == celula_id)
+    ).delete(synchronize_session=False)
+    db.query(QuarterRollup).filter(QuarterRollup.celula_id == celula_id).delete(synchronize_session=False)
     db.query(Sprint).filter(Sprint.celula_id == celula_id).delete(synchronize_session=False)
     db.execute(persona_celulas.delete().where(persona_celulas.c.celula_id == celula_id))
     db.delete(celula)
+    bump_versions(db, "celulas", "personas", "sprints")
     db.commit()
     return celula
 
 
 @router.get("/personas", response_model=List[PersonaOut])
-def listar_personas(db: Session = Depends(get_db)):
-    return db.query(Persona).order_by(Persona.id).all()
+async def listar_personas(request: Request, page: PageParams = Depends(page_params)):
+    return await run_db(
+        lambda db: conditional_list(
+            request,
+            db,
+            "personas",
+            PersonaOut,
+            lambda: keyset_page(
+                db.query(Persona).options(selectinload(Persona.celulas)).order_by(Persona.id),
+                Persona,
+                page,
+                PersonaOut,
+            ),
+        )
+    )
 
 
 @router.post("/personas", response_model=PersonaOut, status_code=status.HTTP_201_CREATED)
@@ -2994,6 +2987,7 @@ def crear_persona(
         celulas=celulas,
     )
     db.add(persona)
+    bump_versions(db, "personas")
     db.commit()
     db.refresh(persona)
     return persona
@@ -3031,6 +3025,7 @@ def actualizar_persona(
         persona.jira_usuario = payload.jira_usuario or None
     if payload.activo is not None:
         persona.activo = payload.activo
+    bump_versions(db, "personas")
     db.commit()
     db.refresh(persona)
     return persona
@@ -3050,13 +3045,18 @@ def desactivar_persona(
         persona_celulas.delete().where(persona_celulas.c.persona_id == persona_id)
     )
     db.delete(persona)
+    bump_versions(db, "personas")
     db.commit()
     return persona
 
 
 @router.get("/feriados", response_model=List[FeriadoOut])
-def listar_feriados(db: Session = Depends(get_db)):
-    return db.query(Feriado).order_by(Feriado.fecha).all()
+async def listar_feriados(request: Request):
+    return await run_db(
+        lambda db: conditional_list(
+            request, db, "feriados", FeriadoOut, lambda: db.query(Feriado).order_by(Feriado.fecha).all()
+        )
+    )
 
 
 @router.post("/feriados", response_model=FeriadoOut, status_code=status.HTTP_201_CREATED)
@@ -3080,6 +3080,7 @@ def crear_feriado(
         activo=payload.activo,
     )
     db.add(feriado)
+    bump_versions(db, "feriados")
     db.commit()
     db.refresh(feriado)
     return feriado
@@ -3112,6 +3113,7 @@ def actualizar_feriado(
         raise HTTPException(status_code=400, detail="Feriado interno requiere celula")
     if payload.activo is not None:
         feriado.activo = payload.activo
+    bump_versions(db, "feriados")
     db.commit()
     db.refresh(feriado)
     return feriado
@@ -3127,13 +3129,18 @@ def desactivar_feriado(
     if not feriado:
         raise HTTPException(status_code=404, detail="Feriado no encontrado")
     db.delete(feriado)
+    bump_versions(db, "feriados")
     db.commit()
     return feriado
 
 
 @router.get("/sprints", response_model=List[SprintOut])
-def listar_sprints(db: Session = Depends(get_db)):
-    return db.query(Sprint).order_by(Sprint.fecha_inicio.desc()).all()
+async def listar_sprints(request: Request):
+    return await run_db(
+        lambda db: conditional_list(
+            request, db, "sprints", SprintOut, lambda: db.query(Sprint).order_by(Sprint.fecha_inicio.desc()).all()
+        )
+    )
 
 
 @router.post("/sprints", response_model=SprintOut, status_code=status.HTTP_201_CREATED)
@@ -3154,6 +3161,7 @@ def crear_sprint(
         fecha_fin=payload.fecha_fin,
     )
     db.add(sprint)
+    bump_versions(db, "sprints")
     db.commit()
     db.refresh(sprint)
     return sprint
@@ -3182,6 +3190,9 @@ def actualizar_sprint(
         sprint.fecha_fin = payload.fecha_fin
     if sprint.fecha_inicio > sprint.fecha_fin:
         raise HTTPException(status_code=400, detail="Rango de fechas invalido")
+    if payload.celula_id is not None:
+        refresh_release_reports(db, sprint_ids=[sprint.id])
+    bump_versions(db, "sprints")
     db.commit()
     db.refresh(sprint)
     return sprint
@@ -3205,14 +3216,25 @@ def eliminar_sprint(
         ReleaseImportItem.release_tipo == "tarea",
     ).delete(synchronize_session=False)
     db.query(Evento).filter(Evento.sprint_id == sprint_id).delete(synchronize_session=False)
+    db.query(SprintMetric).filter(SprintMetric.sprint_id == sprint_id).delete(synchronize_session=False)
     db.delete(sprint)
+    refresh_release_reports(db, celula_ids=[sprint.celula_id])
+    bump_versions(db, "sprints")
     db.commit()
     return sprint
 
 
 @router.get("/quarters", response_model=List[QuarterOptionOut])
-def listar_quarters(db: Session = Depends(get_db)):
-    return db.query(QuarterOption).order_by(QuarterOption.label).all()
+async def listar_quarters(request: Request):
+    return await run_db(
+        lambda db: conditional_list(
+            request,
+            db,
+            "quarters",
+            QuarterOptionOut,
+            lambda: db.query(QuarterOption).order_by(QuarterOption.label).all(),
+        )
+    )
 
 
 @router.post("/quarters", response_model=QuarterOptionOut, status_code=status.HTTP_201_CREATED)
@@ -3229,6 +3251,7 @@ def crear_quarter(
         return existente
     item = QuarterOption(label=label)
     db.add(item)
+    bump_versions(db, "quarters")
     db.commit()
     db.refresh(item)
     return item
@@ -3255,6 +3278,7 @@ def actualizar_quarter(
     if existente:
         raise HTTPException(status_code=409, detail="Quarter ya existe")
     item.label = label
+    bump_versions(db, "quarters")
     db.commit()
     db.refresh(item)
     return item
@@ -3270,18 +3294,30 @@ def eliminar_quarter(
     if not item:
         raise HTTPException(status_code=404, detail="Quarter no encontrado")
     db.delete(item)
+    bump_versions(db, "quarters")
     db.commit()
     return item
 
 
 @router.get("/eventos", response_model=List[EventoOut])
-def listar_eventos(db: Session = Depends(get_db)):
-    return db.query(Evento).order_by(Evento.creado_en.desc()).all()
+def listar_eventos(
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    return keyset_page(db.query(Evento).order_by(Evento.creado_en.desc()), Evento, page, EventoOut)
 
 
 @router.get("/eventos-tipo", response_model=List[EventoTipoOut])
-def listar_eventos_tipo(db: Session = Depends(get_db)):
-    return db.query(EventoTipo).order_by(EventoTipo.nombre).all()
+async def listar_eventos_tipo(request: Request):
+    return await run_db(
+        lambda db: conditional_list(
+            request,
+            db,
+            "eventos_tipo",
+            EventoTipoOut,
+            lambda: db.query(EventoTipo).order_by(EventoTipo.nombre).all(),
+        )
+    )
 
 
 @router.post("/eventos-tipo", response_model=EventoTipoOut, status_code=status.HTTP_201_CREATED)
@@ -3302,6 +3338,7 @@ def crear_evento_tipo(
         activo=payload.activo,
     )
     db.add(tipo)
+    bump_versions(db, "eventos_tipo")
     db.commit()
     db.refresh(tipo)
     return tipo
@@ -3335,6 +3372,7 @@ def actualizar_evento_tipo(
         tipo.prioridad = payload.prioridad.strip().lower()
     if payload.activo is not None:
         tipo.activo = payload.activo
+    bump_versions(db, "eventos_tipo")
     db.commit()
     db.refresh(tipo)
     return tipo
@@ -3355,6 +3393,7 @@ def eliminar_evento_tipo(
     if en_uso:
         raise HTTPException(status_code=409, detail="Tipo de evento en uso")
     db.delete(tipo)
+    bump_versions(db, "eventos_tipo")
     db.commit()
     return tipo
 
@@ -3363,6 +3402,7 @@ def eliminar_evento_tipo(
 def listar_sprint_items(
     celula_id: Optional[int] = None,
     sprint_id: Optional[int] = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     # Sprint items are stored in ReleaseItem with release_tipo="tarea".
@@ -3379,12 +3419,13 @@ def listar_sprint_items(
         query = query.filter(ReleaseItem.celula_id == celula_id)
     if sprint_id is not None:
         query = query.filter(ReleaseItem.sprint_id == sprint_id)
-    return query.all()
+    return fast_page(query, ReleaseItem, page, SprintItemOut)
 
 
 @router.get("/import-sprint-items", response_model=List[SprintImportItemOut])
 def listar_import_sprint_items(
     celula_id: Optional[int] = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     query = (
@@ -3397,7 +3438,7 @@ def listar_import_sprint_items(
     )
     if celula_id is not None:
         query = query.filter(ReleaseImportItem.celula_id == celula_id)
-    return query.all()
+    return keyset_page(query, ReleaseImportItem, page, SprintImportItemOut)
 
 
 @router.post("/sprint-items", response_model=SprintItemOut, status_code=status.HTTP_201_CREATED)
@@ -3458,6 +3499,7 @@ def crear_sprint_item(
         story_points=payload.story_points,
     )
     try:
+        refresh_release_reports(db, sprint_ids=[item.sprint_id], release_issue_keys=[item.release_issue_key])
         db.commit()
         db.refresh(item)
     except IntegrityError:
@@ -3476,6 +3518,8 @@ def actualizar_sprint_item(
     item = db.get(ReleaseItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item no encontrado")
+    prev_sprint_id = item.sprint_id
+    prev_release_issue_key = item.release_issue_key
     data = payload.model_dump(exclude_unset=True)
     if "sprint_id" in data and data["sprint_id"] is not None:
         sprint = db.get(Sprint, data["sprint_id"])
@@ -3512,6 +3556,11 @@ def actualizar_sprint_item(
     if "due_date" in data:
         item.due_date = data["due_date"]
     try:
+        refresh_release_reports(
+            db,
+            sprint_ids=[prev_sprint_id, item.sprint_id],
+            release_issue_keys=[prev_release_issue_key, item.release_issue_key],
+        )
         db.commit()
         db.refresh(item)
     except IntegrityError:
@@ -3534,6 +3583,7 @@ def eliminar_sprint_item(
         ReleaseImportItem.celula_id == item.celula_id,
     ).delete(synchronize_session=False)
     db.delete(item)
+    refresh_release_reports(db, sprint_ids=[item.sprint_id], release_issue_keys=[item.release_issue_key])
     db.commit()
     return None
 
@@ -3964,6 +4014,9 @@ async def importar_sprint_items(
     missing_personas: set[str] = set()
     missing_sprints: set[str] = set()
     missing_celulas: set[str] = set()
+    touched_sprint_ids: set[Optional[int]] = set()
+    touched_celula_ids: set[int] = set()
+    touched_release_keys: set[Optional[str]] = set()
     import_item_cache: dict[str, ReleaseImportItem] = {}
     item_cache: dict[str, ReleaseItem] = {}
 
@@ -4042,6 +4095,7 @@ async def importar_sprint_items(
                     )
                     db.add(sprint)
                     db.flush()
+                    bump_versions(db, "sprints")
                     sprint_map[normalize_sprint_name(sprint_name)] = sprint
                     sprint_map_by_celula[row_celula_id] = sprint_map
                 else:
@@ -4142,6 +4196,8 @@ async def importar_sprint_items(
                     item_cache[cache_key] = item
             if item:
                 changed = False
+                prev_item_sprint_id = item.sprint_id
+                prev_item_celula_id = item.celula_id
                 if item.celula_id != row_celula_id:
                     item.celula_id = row_celula_id
                     changed = True
@@ -4193,6 +4249,10 @@ async def importar_sprint_items(
                     changed = True
                 if changed:
                     updated_flag = True
+                    touched_sprint_ids.update((prev_item_sprint_id, sprint.id))
+                    # A move between celulas changes both celulas' rollups.
+                    touched_celula_ids.update((prev_item_celula_id, row_celula_id))
+                    touched_release_keys.add(item.release_issue_key)
             else:
                 item = ReleaseItem(
                     celula_id=row_celula_id,
@@ -4214,6 +4274,8 @@ async def importar_sprint_items(
                 )
                 db.add(item)
                 item_cache[cache_key] = item
+                touched_sprint_ids.add(sprint.id)
+                touched_celula_ids.add(row_celula_id)
                 created_flag = True
 
         if created_flag:
@@ -4221,6 +4283,12 @@ async def importar_sprint_items(
         elif updated_flag:
             updated += 1
 
+    refresh_release_reports(
+        db,
+        celula_ids=touched_celula_ids,
+        sprint_ids=touched_sprint_ids,
+        release_issue_keys=touched_release_keys,
+    )
     db.commit()
 
     return {
@@ -4260,6 +4328,7 @@ def eliminar_sprint_items(
     ).delete(
         synchronize_session=False
     )
+    refresh_release_reports(db, celula_ids=[celula_id], sprint_ids=None)
     db.commit()
     return {"deleted": total}
 
@@ -4267,23 +4336,25 @@ def eliminar_sprint_items(
 @router.get("/release-items", response_model=List[ReleaseItemOut])
 def listar_release_items(
     celula_id: Optional[int] = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     query = db.query(ReleaseItem).order_by(ReleaseItem.creado_en.desc())
     if celula_id is not None:
         query = query.filter(ReleaseItem.celula_id == celula_id)
-    return query.all()
+    return fast_page(query, ReleaseItem, page, ReleaseItemOut)
 
 
 @router.get("/import-release-items", response_model=List[ReleaseImportItemOut])
 def listar_import_release_items(
     celula_id: Optional[int] = None,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ):
     query = db.query(ReleaseImportItem).order_by(ReleaseImportItem.creado_en.desc())
     if celula_id is not None:
         query = query.filter(ReleaseImportItem.celula_id == celula_id)
-    return query.all()
+    return keyset_page(query, ReleaseImportItem, page, ReleaseImportItemOut)
 
 
 @router.post("/release-items", response_model=ReleaseItemOut, status_code=status.HTTP_201_CREATED)
@@ -4335,6 +4406,12 @@ def crear_release_item(
     )
     db.add(item)
     try:
+        refresh_release_reports(
+            db,
+            celula_ids=[item.celula_id],
+            sprint_ids=[item.sprint_id],
+            release_issue_keys=[item.release_issue_key],
+        )
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -4353,6 +4430,9 @@ def actualizar_release_item(
     item = db.get(ReleaseItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Release no encontrado")
+    prev_celula_id = item.celula_id
+    prev_sprint_id = item.sprint_id
+    prev_release_issue_key = item.release_issue_key
     data = payload.model_dump(exclude_unset=True)
     if "celula_id" in data and data["celula_id"] is not None and not db.get(Celula, data["celula_id"]):
         raise HTTPException(status_code=400, detail="Celula no encontrada")
@@ -4371,6 +4451,12 @@ def actualizar_release_item(
     for key, value in data.items():
         setattr(item, key, value)
     try:
+        refresh_release_reports(
+            db,
+            celula_ids=[prev_celula_id, item.celula_id],
+            sprint_ids=[prev_sprint_id, item.sprint_id],
+            release_issue_keys=[prev_release_issue_key, item.release_issue_key],
+        )
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -4601,6 +4687,9 @@ async def importar_release_items(
     missing_personas: set[str] = set()
     missing_sprints: set[str] = set()
     missing_celulas: set[str] = set()
+    touched_sprint_ids: set[Optional[int]] = set()
+    touched_celula_ids: set[int] = set()
+    touched_release_keys: set[Optional[str]] = set()
 
     def get_value(row: dict, key: Optional[str]) -> str:
         if not key:
@@ -4673,6 +4762,7 @@ async def importar_release_items(
             )
             db.add(sprint)
             db.flush()
+            bump_versions(db, "sprints")
             sprint_map[normalize_sprint_name(sprint_nombre)] = sprint
             sprint_map_by_celula[row_celula_id] = sprint_map
 
@@ -4814,6 +4904,10 @@ async def importar_release_items(
                     raw_data=raw_data,
                 )
             )
+            if sprint:
+                touched_sprint_ids.add(sprint.id)
+            touched_celula_ids.add(row_celula_id)
+            touched_release_keys.add(issue_key)
             created_flag = True
 
         if created_flag:
@@ -4821,6 +4915,12 @@ async def importar_release_items(
         elif updated_flag:
             updated += 1
 
+    refresh_release_reports(
+        db,
+        celula_ids=touched_celula_ids,
+        sprint_ids=touched_sprint_ids,
+        release_issue_keys=touched_release_keys,
+    )
     db.commit()
 
     return {
@@ -4847,6 +4947,7 @@ def eliminar_release_items(
     db.query(ReleaseImportItem).filter(ReleaseImportItem.celula_id == celula_id).delete(
         synchronize_session=False
     )
+    refresh_release_reports(db, celula_ids=[celula_id], sprint_ids=None)
     db.commit()
     return {"deleted": total}
 
@@ -4868,6 +4969,12 @@ def eliminar_release_item(
         ReleaseImportItem.celula_id == item.celula_id,
     ).delete(synchronize_session=False)
     db.delete(item)
+    refresh_release_reports(
+        db,
+        celula_ids=[item.celula_id],
+        sprint_ids=[item.sprint_id],
+        release_issue_keys=[item.release_issue_key],
+    )
     db.commit()
     return None
 
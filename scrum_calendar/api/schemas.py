@@ -479,6 +479,20 @@ class TaskUpdate(BaseModel):
     importante: Optional[bool] = None
 
 
+class TaskBatchItem(TaskUpdate):
+    id: int
+
+
+class TaskBatchUpdate(BaseModel):
+    items: List[TaskBatchItem] = Field(min_length=1, max_length=500)
+
+
+class TaskMove(BaseModel):
+    # Neighbours in the target column after the move; None at either end.
+    before_id: Optional[int] = None
+    after_id: Optional[int] = None
+
+
 class TaskOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -502,6 +516,12 @@ class TaskOut(BaseModel):
     puntos: Optional[float] = None
     horas_estimadas: Optional[float] = None
     importante: bool
+    descendientes_total: int = 0
+    descendientes_abiertos: int = 0
+    descendientes_en_curso: int = 0
+    descendientes_min_start_date: Optional[date] = None
+    descendientes_puntos: float = 0.0
+    descendientes_horas: float = 0.0
     orden: float
     creado_en: datetime
     actualizado_en: datetime
@@ -543,6 +563,27 @@ class TaskSegmentOut(BaseModel):
     actualizado_en: datetime
 
 
+class TaskTagCountOut(BaseModel):
+    nombre: str
+    total: int
+
+
+class TaskChangeOut(BaseModel):
+    # Change-log id: the version of this task in the feed.
+    version: int
+    task_id: int
+    op: str
+    # Current state for "upsert"; None for "delete".
+    task: Optional[TaskOut] = None
+
+
+class TaskChangesOut(BaseModel):
+    cursor: int
+    reset: bool = False
+    has_more: bool = False
+    changes: List[TaskChangeOut] = []
+
+
 class CompraCatalogNombreIn(BaseModel):
     nombre: str
 
@@ -904,3 +945,112 @@ class CapacidadSprintOut(BaseModel):
     porcentaje: float
     estado: str
     detalle_por_persona: List[PersonaCapacidadOut]
+
+
+class ReportVelocityOut(BaseModel):
+    celula_id: int
+    sprint_id: int
+    sprint_nombre: str
+    fecha_inicio: date
+    fecha_fin: date
+    items: int
+    items_finalizados: int
+    story_points: float
+    story_points_completados: float
+    cumplimiento: float
+
+
+class ReportThroughputOut(BaseModel):
+    periodo: str
+    desde: date
+    items: int
+    story_points: float
+
+
+class ReportCarryOverOut(BaseModel):
+    celula_id: int
+    sprint_id: int
+    sprint_nombre: str
+    fecha_fin: date
+    items: int
+    story_points: float
+
+
+class ReportBurnupPointOut(BaseModel):
+    fecha: date
+    items_finalizados: int
+    story_points_completados: float
+
+
+class ReportQuarterBurnupOut(BaseModel):
+    quarter: str
+    items: int
+    story_points: float
+    items_finalizados: int
+    serie: List[ReportBurnupPointOut] = Field(default_factory=list)
+
+
+class ReportDataQualityOut(BaseModel):
+    celula_id: int
+    items: int
+    sin_responsable: int
+    sin_story_points: int
+    sin_due_date: int
+    sin_start_date: int
+    finalizados_sin_end_date: int
+    releases: int
+    releases_sin_quarter: int
+
+
+class ReportSprintEstadoOut(BaseModel):
+    items: int
+    story_points: float
+
+
+class ReportSprintPersonaOut(BaseModel):
+    persona_id: Optional[int] = None
+    assignee_nombre: Optional[str] = None
+    items: int
+    items_finalizados: int
+    story_points: float
+    story_points_completados: float
+
+
+class ReportSprintMetricsOut(ReportVelocityOut):
+    por_estado: Dict[str, ReportSprintEstadoOut] = Field(default_factory=dict)
+    por_persona: List[ReportSprintPersonaOut] = Field(default_factory=list)
+    actualizado_en: datetime
+
+
+class ReportRebuildOut(BaseModel):
+    sprints: int
+    celulas: int
+
+
+class ReportQuarterReleaseOut(BaseModel):
+    issue_key: str
+    tareas: int
+    tareas_finalizadas: int
+    story_points: float
+    story_points_completados: float
+
+
+class ReportQuarterRollupOut(BaseModel):
+    celula_id: int
+    quarter: str
+    releases: int
+    releases_finalizados: int
+    comprometidos: int
+    comprometidos_finalizados: int
+    nuevos: int
+    nuevos_finalizados: int
+    story_points: float
+    story_points_completados: float
+    tareas: int
+    tareas_finalizadas: int
+    tareas_story_points: float
+    tareas_story_points_completados: float
+    cumplimiento: float
+    avance_tareas: float
+    por_release: List[ReportQuarterReleaseOut] = Field(default_factory=list)
+    actualizado_en: datetime
@@ -0,0 +1,35 @@
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.modules.reports.infrastructure.quarter_rollups import SqlAlchemyQuarterRollupRepository
+from app.modules.reports.infrastructure.sprint_metrics import SqlAlchemySprintMetricsRepository
+from data.models import Sprint
+
+
+def refresh_release_reports(
+    db: Session,
+    celula_ids: Iterable[Optional[int]] = (),
+    sprint_ids: Optional[Iterable[Optional[int]]] = (),
+    release_issue_keys: Iterable[Optional[str]] = (),
+) -> None:
+    """Refresh the report materializations touched by a release_items write.
+
+    ``sprint_ids=None`` means every sprint of ``celula_ids`` (bulk deletes).
+    ``release_issue_keys`` are parent links of child tasks whose progress moved.
+    """
+    celula_ids = {celula_id for celula_id in celula_ids if celula_id is not None}
+    if sprint_ids is None:
+        sprint_ids = []
+        if celula_ids:
+            sprint_ids = [row[0] for row in db.query(Sprint.id).filter(Sprint.celula_id.in_(celula_ids)).all()]
+    SqlAlchemySprintMetricsRepository(db).refresh(sprint_ids)
+    rollups = SqlAlchemyQuarterRollupRepository(db)
+    rollups.refresh(celula_ids | rollups.celulas_for_release_keys(release_issue_keys))
+
+
+def rebuild_release_reports(db: Session) -> dict:
+    return {
+        "sprints": SqlAlchemySprintMetricsRepository(db).rebuild(),
+        "celulas": SqlAlchemyQuarterRollupRepository(db).rebuild(),
+    }
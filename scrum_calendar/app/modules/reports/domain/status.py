@@ -0,0 +1,52 @@
+import re
+from datetime import date
+from typing import Iterable, Optional
+
+# Same markers used by the UI (isDoneStatus / classifyReleaseStatus) to treat
+# a Jira status as finished: "Finalizada", "Done", "Cerrado", "Released", ...
+DONE_STATUS_MARKERS = ("final", "done", "cerrad", "closed", "resuelt", "released")
+
+SPRINT_ITEM_TIPO = "tarea"
+
+
+def is_done_status(value: Optional[str]) -> bool:
+    normalized = (value or "").strip().lower()
+    return any(marker in normalized for marker in DONE_STATUS_MARKERS)
+
+
+def iso_week_label(value: date) -> str:
+    year, week, _ = value.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def iso_week_start(value: date) -> date:
+    year, week, _ = value.isocalendar()
+    return date.fromisocalendar(year, week, 1)
+
+
+def quarter_sort_key(label: Optional[str]) -> tuple[int, int, str]:
+    match = re.match(r"Q([1-4])\s+(\d{4})", (label or "").strip().upper())
+    if not match:
+        return (9999, 9, label or "")
+    return (int(match.group(2)), int(match.group(1)), label or "")
+
+
+def quarter_label(quarter: Optional[str], start_date: Optional[date], due_date: Optional[date]) -> Optional[str]:
+    # Mirrors getQuarterLabel in the releases pages: explicit quarter first,
+    # then the planning date.
+    label = (quarter or "").strip()
+    if label:
+        return label
+    reference = start_date or due_date
+    if reference is None:
+        return None
+    return f"Q{(reference.month - 1) // 3 + 1} {reference.year}"
+
+
+def cumulative(values: Iterable[float]) -> list[float]:
+    total = 0.0
+    result = []
+    for value in values:
+        total += float(value or 0)
+        result.append(round(total, 2))
+    return result
@@ -0,0 +1,186 @@
+import json
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.modules.reports.domain.status import (
+    SPRINT_ITEM_TIPO,
+    is_done_status,
+    quarter_label,
+    quarter_sort_key,
+)
+from app.modules.reports.infrastructure.repository import done_status_clause
+from data.models import Celula, QuarterRollup, ReleaseItem, now_py
+
+ROLLUP_COUNTERS = (
+    "releases",
+    "releases_finalizados",
+    "comprometidos",
+    "comprometidos_finalizados",
+    "nuevos",
+    "nuevos_finalizados",
+    "tareas",
+    "tareas_finalizadas",
+)
+ROLLUP_POINTS = (
+    "story_points",
+    "story_points_completados",
+    "tareas_story_points",
+    "tareas_story_points_completados",
+)
+
+
+def _as_points(value) -> float:
+    return round(float(value or 0.0), 2)
+
+
+class SqlAlchemyQuarterRollupRepository:
+    """Per célula/quarter release progress, including child tasks linked
+    through ``release_issue_key``.
+
+    The effective quarter falls back to the planning dates, so a célula is the
+    refresh unit: its releases are few and child progress is grouped in SQL.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def celulas_for_release_keys(self, issue_keys: Iterable[Optional[str]]) -> set[int]:
+        keys = {key for key in issue_keys if key}
+        if not keys:
+            return set()
+        rows = self.db.query(ReleaseItem.celula_id).filter(ReleaseItem.issue_key.in_(keys)).distinct().all()
+        return {row[0] for row in rows}
+
+    def refresh(self, celula_ids: Iterable[Optional[int]]) -> int:
+        ids = sorted({int(celula_id) for celula_id in celula_ids if celula_id is not None})
+        if not ids:
+            return 0
+        self.db.flush()
+        self.db.query(QuarterRollup).filter(QuarterRollup.celula_id.in_(ids)).delete()
+        return self._materialize(ids)
+
+    def rebuild(self) -> int:
+        self.db.flush()
+        self.db.query(QuarterRollup).delete()
+        return self._materialize([row[0] for row in self.db.query(Celula.id).all()])
+
+    def rows(self, celula_id: Optional[int] = None, quarter: Optional[str] = None) -> list[dict]:
+        query = self.db.query(QuarterRollup)
+        if celula_id is not None:
+            query = query.filter(QuarterRollup.celula_id == celula_id)
+        if quarter:
+            query = query.filter(QuarterRollup.quarter == quarter)
+        results = []
+        for row in query.all():
+            item = {"celula_id": row.celula_id, "quarter": row.quarter}
+            for name in ROLLUP_COUNTERS:
+                item[name] = getattr(row, name)
+            for name in ROLLUP_POINTS:
+                item[name] = _as_points(getattr(row, name))
+            item["cumplimiento"] = (
+                round(row.comprometidos_finalizados * 100.0 / row.comprometidos, 2) if row.comprometidos else 0.0
+            )
+            item["avance_tareas"] = round(row.tareas_finalizadas * 100.0 / row.tareas, 2) if row.tareas else 0.0
+            item["por_release"] = json.loads(row.por_release) if row.por_release else []
+            item["actualizado_en"] = row.actualizado_en
+            results.append(item)
+        results.sort(key=lambda item: (item["celula_id"], quarter_sort_key(item["quarter"])))
+        return results
+
+    def _materialize(self, celula_ids: list[int]) -> int:
+        if not celula_ids:
+            return 0
+        releases = (
+            self.db.query(
+                ReleaseItem.celula_id,
+                ReleaseItem.issue_key,
+                ReleaseItem.quarter,
+                ReleaseItem.start_date,
+                ReleaseItem.due_date,
+                ReleaseItem.release_tipo,
+                ReleaseItem.status,
+                ReleaseItem.story_points,
+            )
+            .filter(ReleaseItem.celula_id.in_(celula_ids), ReleaseItem.release_tipo != SPRINT_ITEM_TIPO)
+            .order_by(ReleaseItem.issue_key.asc())
+            .all()
+        )
+        parent_keys = select(ReleaseItem.issue_key).where(
+            ReleaseItem.celula_id.in_(celula_ids),
+            ReleaseItem.release_tipo != SPRINT_ITEM_TIPO,
+        )
+        is_done = done_status_clause(ReleaseItem.status)
+        points = func.coalesce(ReleaseItem.story_points, 0.0)
+        children = {
+            row[0]: row[1:]
+            for row in self.db.query(
+                ReleaseItem.release_issue_key,
+                func.count(ReleaseItem.id),
+                func.sum(case((is_done, 1), else_=0)),
+                func.sum(points),
+                func.sum(case((is_done, points), else_=0.0)),
+            )
+            .filter(
+                ReleaseItem.release_tipo == SPRINT_ITEM_TIPO,
+                ReleaseItem.release_issue_key.in_(parent_keys),
+            )
+            .group_by(ReleaseItem.release_issue_key)
+            .all()
+        }
+
+        rollups: dict[tuple[int, str], dict] = {}
+        for celula_id, issue_key, quarter, start_date, due_date, release_tipo, status, story_points in releases:
+            label = quarter_label(quarter, start_date, due_date)
+            if not label:
+                continue
+            entry = rollups.get((celula_id, label))
+            if entry is None:
+                entry = {name: 0 for name in ROLLUP_COUNTERS}
+                entry.update({name: 0.0 for name in ROLLUP_POINTS})
+                entry["por_release"] = []
+                rollups[(celula_id, label)] = entry
+            done = is_done_status(status)
+            tipo = (release_tipo or "").strip().lower()
+            entry["releases"] += 1
+            entry["releases_finalizados"] += int(done)
+            if tipo == "comprometido":
+                entry["comprometidos"] += 1
+                entry["comprometidos_finalizados"] += int(done)
+            elif tipo == "nuevo":
+                entry["nuevos"] += 1
+                entry["nuevos_finalizados"] += int(done)
+            entry["story_points"] += float(story_points or 0.0)
+            if done:
+                entry["story_points_completados"] += float(story_points or 0.0)
+            child_items, child_done, child_points, child_done_points = children.get(issue_key, (0, 0, 0.0, 0.0))
+            entry["tareas"] += int(child_items or 0)
+            entry["tareas_finalizadas"] += int(child_done or 0)
+            entry["tareas_story_points"] += float(child_points or 0.0)
+            entry["tareas_story_points_completados"] += float(child_done_points or 0.0)
+            entry["por_release"].append(
+                {
+                    "issue_key": issue_key,
+                    "tareas": int(child_items or 0),
+                    "tareas_finalizadas": int(child_done or 0),
+                    "story_points": _as_points(child_points),
+                    "story_points_completados": _as_points(child_done_points),
+                }
+            )
+
+        stamp = now_py()
+        for (celula_id, label), entry in rollups.items():
+            por_release = entry.pop("por_release")
+            for name in ROLLUP_POINTS:
+                entry[name] = _as_points(entry[name])
+            self.db.add(
+                QuarterRollup(
+                    celula_id=celula_id,
+                    quarter=label,
+                    por_release=json.dumps(por_release, ensure_ascii=False),
+                    actualizado_en=stamp,
+                    **entry,
+                )
+            )
+        return len(celula_ids)
@@ -0,0 +1,260 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Session
+
+from app.modules.reports.domain.status import (
+    DONE_STATUS_MARKERS,
+    SPRINT_ITEM_TIPO,
+    cumulative,
+    iso_week_label,
+    iso_week_start,
+    quarter_sort_key,
+)
+from data.models import ReleaseItem, Sprint, SprintMetric
+
+
+def done_status_clause(column):
+    lowered = func.lower(func.coalesce(column, ""))
+    return or_(*[lowered.like(f"%{marker}%") for marker in DONE_STATUS_MARKERS])
+
+
+def _points():
+    return func.coalesce(ReleaseItem.story_points, 0.0)
+
+
+def _as_int(value) -> int:
+    return int(value or 0)
+
+
+def _as_points(value) -> float:
+    return round(float(value or 0.0), 2)
+
+
+class SqlAlchemyReportsRepository:
+    """Aggregated read models for the Reportes module.
+
+    Every method pushes the heavy lifting to SQL (``GROUP BY``) so the
+    response size depends on the number of series points, not on the total
+    item history stored in ``release_items``.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def velocity(self, celula_id: Optional[int] = None, sprints: Optional[int] = None) -> list[dict]:
+        # Reads the sprint_metrics materialization kept fresh by item writers.
+        query = self.db.query(
+            SprintMetric.celula_id,
+            SprintMetric.sprint_id,
+            Sprint.nombre,
+            Sprint.fecha_inicio,
+            Sprint.fecha_fin,
+            SprintMetric.items,
+            SprintMetric.items_finalizados,
+            SprintMetric.story_points,
+            SprintMetric.story_points_completados,
+        ).join(Sprint, Sprint.id == SprintMetric.sprint_id)
+        if celula_id is not None:
+            query = query.filter(SprintMetric.celula_id == celula_id)
+        rows = (
+            query.filter(SprintMetric.items > 0)
+            .order_by(SprintMetric.celula_id.asc(), Sprint.fecha_inicio.desc(), SprintMetric.sprint_id.desc())
+            .all()
+        )
+        per_celula: dict[int, int] = {}
+        results = []
+        for row in rows:
+            row_celula_id = int(row[0])
+            seen = per_celula.get(row_celula_id, 0)
+            if sprints is not None and seen >= sprints:
+                continue
+            per_celula[row_celula_id] = seen + 1
+            total_items = _as_int(row[5])
+            done_items = _as_int(row[6])
+            results.append(
+                {
+                    "celula_id": row_celula_id,
+                    "sprint_id": int(row[1]),
+                    "sprint_nombre": row[2],
+                    "fecha_inicio": row[3],
+                    "fecha_fin": row[4],
+                    "items": total_items,
+                    "items_finalizados": done_items,
+                    "story_points": _as_points(row[7]),
+                    "story_points_completados": _as_points(row[8]),
+                    "cumplimiento": round(done_items * 100.0 / total_items, 2) if total_items else 0.0,
+                }
+            )
+        results.sort(key=lambda item: (item["celula_id"], item["fecha_inicio"], item["sprint_id"]))
+        return results
+
+    def throughput(
+        self,
+        celula_id: Optional[int] = None,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+    ) -> list[dict]:
+        query = self.db.query(
+            ReleaseItem.end_date,
+            func.count(ReleaseItem.id),
+            func.sum(_points()),
+        ).filter(
+            ReleaseItem.release_tipo == SPRINT_ITEM_TIPO,
+            ReleaseItem.end_date.isnot(None),
+            done_status_clause(ReleaseItem.status),
+        )
+        if celula_id is not None:
+            query = query.filter(ReleaseItem.celula_id == celula_id)
+        if desde is not None:
+            query = query.filter(ReleaseItem.end_date >= desde)
+        if hasta is not None:
+            query = query.filter(ReleaseItem.end_date <= hasta)
+        # One row per distinct end date; weekly buckets are folded here to stay
+        # dialect-agnostic (SQLite has no date_trunc).
+        buckets: dict[str, dict] = {}
+        for end_date, items, points in query.group_by(ReleaseItem.end_date).all():
+            label = iso_week_label(end_date)
+            bucket = buckets.setdefault(
+                label,
+                {"periodo": label, "desde": iso_week_start(end_date), "items": 0, "story_points": 0.0},
+            )
+            bucket["items"] += _as_int(items)
+            bucket["story_points"] = _as_points(bucket["story_points"] + float(points or 0.0))
+        return sorted(buckets.values(), key=lambda item: item["desde"])
+
+    def carry_over(self, today: date, celula_id: Optional[int] = None) -> list[dict]:
+        is_open = ~done_status_clause(ReleaseItem.status)
+        query = (
+            self.db.query(
+                ReleaseItem.celula_id,
+                ReleaseItem.sprint_id,
+                Sprint.nombre,
+                Sprint.fecha_fin,
+                func.count(ReleaseItem.id),
+                func.sum(_points()),
+            )
+            .join(Sprint, Sprint.id == ReleaseItem.sprint_id)
+            .filter(
+                ReleaseItem.release_tipo == SPRINT_ITEM_TIPO,
+                Sprint.fecha_fin < today,
+                is_open,
+            )
+        )
+        if celula_id is not None:
+            query = query.filter(ReleaseItem.celula_id == celula_id)
+        rows = (
+            query.group_by(ReleaseItem.celula_id, ReleaseItem.sprint_id, Sprint.nombre, Sprint.fecha_fin)
+            .order_by(ReleaseItem.celula_id.asc(), Sprint.fecha_fin.asc())
+            .all()
+        )
+        return [
+            {
+                "celula_id": int(row[0]),
+                "sprint_id": int(row[1]),
+                "sprint_nombre": row[2],
+                "fecha_fin": row[3],
+                "items": _as_int(row[4]),
+                "story_points": _as_points(row[5]),
+            }
+            for row in rows
+        ]
+
+    def quarter_burnup(self, quarter: Optional[str] = None, celula_id: Optional[int] = None) -> list[dict]:
+        is_done = done_status_clause(ReleaseItem.status)
+        base_filters = [
+            ReleaseItem.release_tipo != SPRINT_ITEM_TIPO,
+            ReleaseItem.quarter.isnot(None),
+        ]
+        if quarter:
+            base_filters.append(ReleaseItem.quarter == quarter)
+        if celula_id is not None:
+            base_filters.append(ReleaseItem.celula_id == celula_id)
+
+        scope_rows = (
+            self.db.query(
+                ReleaseItem.quarter,
+                func.count(ReleaseItem.id),
+                func.sum(_points()),
+                func.sum(case((is_done, 1), else_=0)),
+            )
+            .filter(*base_filters)
+            .group_by(ReleaseItem.quarter)
+            .all()
+        )
+        progress_rows = (
+            self.db.query(
+                ReleaseItem.quarter,
+                ReleaseItem.end_date,
+                func.count(ReleaseItem.id),
+                func.sum(_points()),
+            )
+            .filter(*base_filters, is_done, ReleaseItem.end_date.isnot(None))
+            .group_by(ReleaseItem.quarter, ReleaseItem.end_date)
+            .order_by(ReleaseItem.quarter.asc(), ReleaseItem.end_date.asc())
+            .all()
+        )
+        progress: dict[str, list] = {}
+        for row_quarter, end_date, items, points in progress_rows:
+            progress.setdefault(row_quarter, []).append((end_date, _as_int(items), float(points or 0.0)))
+
+        results = []
+        for row_quarter, total_items, total_points, done_items in scope_rows:
+            points_by_day = progress.get(row_quarter, [])
+            items_acc = cumulative(entry[1] for entry in points_by_day)
+            points_acc = cumulative(entry[2] for entry in points_by_day)
+            results.append(
+                {
+                    "quarter": row_quarter,
+                    "items": _as_int(total_items),
+                    "story_points": _as_points(total_points),
+                    "items_finalizados": _as_int(done_items),
+                    "serie": [
+                        {
+                            "fecha": entry[0],
+                            "items_finalizados": int(items_acc[idx]),
+                            "story_points_completados": points_acc[idx],
+                        }
+                        for idx, entry in enumerate(points_by_day)
+                    ],
+                }
+            )
+        results.sort(key=lambda item: quarter_sort_key(item["quarter"]))
+        return results
+
+    def data_quality(self, celula_id: Optional[int] = None) -> list[dict]:
+        is_task = ReleaseItem.release_tipo == SPRINT_ITEM_TIPO
+        is_done = done_status_clause(ReleaseItem.status)
+
+        def count_if(*conditions):
+            return func.sum(case((and_(*conditions), 1), else_=0))
+
+        query = self.db.query(
+            ReleaseItem.celula_id,
+            count_if(is_task),
+            count_if(is_task, ReleaseItem.persona_id.is_(None)),
+            count_if(is_task, ReleaseItem.story_points.is_(None)),
+            count_if(is_task, ReleaseItem.due_date.is_(None)),
+            count_if(is_task, ReleaseItem.start_date.is_(None)),
+            count_if(is_task, is_done, ReleaseItem.end_date.is_(None)),
+            count_if(~is_task),
+            count_if(~is_task, ReleaseItem.quarter.is_(None)),
+        )
+        if celula_id is not None:
+            query = query.filter(ReleaseItem.celula_id == celula_id)
+        rows = query.group_by(ReleaseItem.celula_id).order_by(ReleaseItem.celula_id.asc()).all()
+        return [
+            {
+                "celula_id": int(row[0]),
+                "items": _as_int(row[1]),
+                "sin_responsable": _as_int(row[2]),
+                "sin_story_points": _as_int(row[3]),
+                "sin_due_date": _as_int(row[4]),
+                "sin_start_date": _as_int(row[5]),
+                "finalizados_sin_end_date": _as_int(row[6]),
+                "releases": _as_int(row[7]),
+                "releases_sin_quarter": _as_int(row[8]),
+            }
+            for row in rows
+        ]
@@ -0,0 +1,153 @@
+import json
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.modules.reports.domain.status import SPRINT_ITEM_TIPO
+from app.modules.reports.infrastructure.repository import done_status_clause
+from data.models import ReleaseItem, Sprint, SprintMetric, now_py
+
+
+def _as_points(value) -> float:
+    return round(float(value or 0.0), 2)
+
+
+def _loads(value: Optional[str], default):
+    if not value:
+        return default
+    try:
+        return json.loads(value)
+    except ValueError:
+        return default
+
+
+class SqlAlchemySprintMetricsRepository:
+    """Materialized per-sprint aggregates over sprint items (``release_items``).
+
+    Writers call ``refresh`` with the sprints they touched inside their own
+    transaction; ``rebuild`` recomputes every sprint from scratch.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh(self, sprint_ids: Iterable[Optional[int]]) -> int:
+        ids = sorted({int(sprint_id) for sprint_id in sprint_ids if sprint_id is not None})
+        if not ids:
+            return 0
+        self.db.flush()
+        self.db.query(SprintMetric).filter(SprintMetric.sprint_id.in_(ids)).delete()
+        sprints = self.db.query(Sprint.id, Sprint.celula_id).filter(Sprint.id.in_(ids)).all()
+        self._materialize(sprints)
+        return len(sprints)
+
+    def refresh_celula(self, celula_id: int) -> int:
+        sprint_ids = [row[0] for row in self.db.query(Sprint.id).filter(Sprint.celula_id == celula_id).all()]
+        return self.refresh(sprint_ids)
+
+    def rebuild(self) -> int:
+        self.db.flush()
+        self.db.query(SprintMetric).delete()
+        sprints = self.db.query(Sprint.id, Sprint.celula_id).all()
+        self._materialize(sprints)
+        return len(sprints)
+
+    def rows(self, celula_id: Optional[int] = None) -> list[dict]:
+        query = (
+            self.db.query(SprintMetric, Sprint.nombre, Sprint.fecha_inicio, Sprint.fecha_fin)
+            .join(Sprint, Sprint.id == SprintMetric.sprint_id)
+        )
+        if celula_id is not None:
+            query = query.filter(SprintMetric.celula_id == celula_id)
+        rows = query.order_by(SprintMetric.celula_id.asc(), Sprint.fecha_inicio.asc(), Sprint.id.asc()).all()
+        return [
+            {
+                "celula_id": metric.celula_id,
+                "sprint_id": metric.sprint_id,
+                "sprint_nombre": nombre,
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin,
+                "items": metric.items,
+                "items_finalizados": metric.items_finalizados,
+                "story_points": _as_points(metric.story_points),
+                "story_points_completados": _as_points(metric.story_points_completados),
+                "cumplimiento": (
+                    round(metric.items_finalizados * 100.0 / metric.items, 2) if metric.items else 0.0
+                ),
+                "por_estado": _loads(metric.por_estado, {}),
+                "por_persona": _loads(metric.por_persona, []),
+                "actualizado_en": metric.actualizado_en,
+            }
+            for metric, nombre, fecha_inicio, fecha_fin in rows
+        ]
+
+    def _materialize(self, sprints: list) -> None:
+        if not sprints:
+            return
+        ids = [row[0] for row in sprints]
+        is_done = done_status_clause(ReleaseItem.status)
+        points = func.coalesce(ReleaseItem.story_points, 0.0)
+        base_filters = (ReleaseItem.release_tipo == SPRINT_ITEM_TIPO, ReleaseItem.sprint_id.in_(ids))
+
+        by_status = (
+            self.db.query(ReleaseItem.sprint_id, ReleaseItem.status, func.count(ReleaseItem.id), func.sum(points))
+            .filter(*base_filters)
+            .group_by(ReleaseItem.sprint_id, ReleaseItem.status)
+            .all()
+        )
+        by_persona = (
+            self.db.query(
+                ReleaseItem.sprint_id,
+                ReleaseItem.persona_id,
+                ReleaseItem.assignee_nombre,
+                func.count(ReleaseItem.id),
+                func.sum(case((is_done, 1), else_=0)),
+                func.sum(points),
+                func.sum(case((is_done, points), else_=0.0)),
+            )
+            .filter(*base_filters)
+            .group_by(ReleaseItem.sprint_id, ReleaseItem.persona_id, ReleaseItem.assignee_nombre)
+            .all()
+        )
+
+        estados: dict[int, dict] = {}
+        for sprint_id, status, items, total_points in by_status:
+            estados.setdefault(sprint_id, {})[status or ""] = {
+                "items": int(items or 0),
+                "story_points": _as_points(total_points),
+            }
+        personas: dict[int, list] = {}
+        for sprint_id, persona_id, assignee, items, done_items, total_points, done_points in by_persona:
+            personas.setdefault(sprint_id, []).append(
+                {
+                    "persona_id": persona_id,
+                    "assignee_nombre": assignee,
+                    "items": int(items or 0),
+                    "items_finalizados": int(done_items or 0),
+                    "story_points": _as_points(total_points),
+                    "story_points_completados": _as_points(done_points),
+                }
+            )
+
+        stamp = now_py()
+        for sprint_id, celula_id in sprints:
+            persona_rows = sorted(
+                personas.get(sprint_id, []),
+                key=lambda row: (row["persona_id"] is None, row["persona_id"] or 0, row["assignee_nombre"] or ""),
+            )
+            self.db.add(
+                SprintMetric(
+                    sprint_id=sprint_id,
+                    celula_id=celula_id,
+                    items=sum(row["items"] for row in persona_rows),
+                    items_finalizados=sum(row["items_finalizados"] for row in persona_rows),
+                    story_points=_as_points(sum(row["story_points"] for row in persona_rows)),
+                    story_points_completados=_as_points(
+                        sum(row["story_points_completados"] for row in persona_rows)
+                    ),
+                    por_estado=json.dumps(estados.get(sprint_id, {}), ensure_ascii=False, sort_keys=True),
+                    por_persona=json.dumps(persona_rows, ensure_ascii=False),
+                    actualizado_en=stamp,
+                )
+            )
@@ -0,0 +1,119 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from api.schemas import (
+    ReportCarryOverOut,
+    ReportDataQualityOut,
+    ReportQuarterBurnupOut,
+    ReportQuarterRollupOut,
+    ReportRebuildOut,
+    ReportSprintMetricsOut,
+    ReportThroughputOut,
+    ReportVelocityOut,
+)
+from app.modules.reports.application.use_cases import rebuild_release_reports
+from app.modules.reports.infrastructure.quarter_rollups import SqlAlchemyQuarterRollupRepository
+from app.modules.reports.infrastructure.repository import SqlAlchemyReportsRepository
+from app.modules.reports.infrastructure.sprint_metrics import SqlAlchemySprintMetricsRepository
+from app.shared.interface.dependencies import require_user
+from data.db import get_db
+from data.models import now_py
+
+router = APIRouter()
+
+
+@router.get("/reports/velocity", response_model=List[ReportVelocityOut])
+def reporte_velocidad(
+    celula_id: Optional[int] = None,
+    sprints: Optional[int] = Query(default=None, ge=1, le=200),
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    return SqlAlchemyReportsRepository(db).velocity(celula_id=celula_id, sprints=sprints)
+
+
+@router.get("/reports/throughput", response_model=List[ReportThroughputOut])
+def reporte_throughput(
+    celula_id: Optional[int] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    return SqlAlchemyReportsRepository(db).throughput(celula_id=celula_id, desde=desde, hasta=hasta)
+
+
+@router.get("/reports/carry-over", response_model=List[ReportCarryOverOut])
+def reporte_carry_over(
+    celula_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    return SqlAlchemyReportsRepository(db).carry_over(now_py().date(), celula_id=celula_id)
+
+
+@router.get("/reports/quarter-burnup", response_model=List[ReportQuarterBurnupOut])
+def reporte_quarter_burnup(
+    quarter: Optional[str] = None,
+    celula_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    return SqlAlchemyReportsRepository(db).quarter_burnup(
+        quarter=(quarter or "").strip() or None,
+        celula_id=celula_id,
+    )
+
+
+@router.get("/reports/data-quality", response_model=List[ReportDataQualityOut])
+def reporte_calidad_datos(
+    celula_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    return SqlAlchemyReportsRepository(db).data_quality(celula_id=celula_id)
+
+
+@router.get("/reports/sprint-metrics", response_model=List[ReportSprintMetricsOut])
+def reporte_sprint_metrics(
+    celula_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    return SqlAlchemySprintMetricsRepository(db).rows(celula_id=celula_id)
+
+
+@router.get("/reports/quarter-rollup", response_model=List[ReportQuarterRollupOut])
+def reporte_quarter_rollup(
+    celula_id: Optional[int] = None,
+    quarter: Optional[str] = None,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    return SqlAlchemyQuarterRollupRepository(db).rows(
+        celula_id=celula_id,
+        quarter=(quarter or "").strip() or None,
+    )
+
+
+@router.post("/reports/rebuild", response_model=ReportRebuildOut)
+def reconstruir_reportes(
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    user = require_user(db, scrum_session)
+    if user.rol != "admin":
+        raise HTTPException(status_code=403, detail="Sin permisos")
+    totals = rebuild_release_reports(db)
+    db.commit()
+    return totals
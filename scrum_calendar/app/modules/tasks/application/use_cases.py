@@ -1,9 +1,16 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional, Set
+from typing import Iterable, Optional, Set
 
 from app.modules.tasks.domain.rules import apply_status_date_transition, normalize_task_status
-from app.modules.tasks.domain.hierarchy import descendants_rollup
+from app.modules.tasks.domain.hierarchy import (
+    SubtreeRollup,
+    TaskSummary,
+    TreeTask,
+    cascade_parent_updates,
+    consolidated_parent_updates,
+)
+from app.shared.domain.text import label_key
 
 
 @dataclass(frozen=True)
@@ -29,6 +36,7 @@ def apply_task_update(task, payload, fields_set: Set[str], business_today: date)
         task.prioridad = payload.prioridad
     if payload.segmento is not None:
         task.segmento = payload.segmento
+        task.segmento_key = label_key(payload.segmento)
     if payload.tipo is not None:
         task.tipo = payload.tipo
     if payload.etiquetas is not None:
@@ -78,25 +86,86 @@ def apply_task_update(task, payload, fields_set: Set[str], business_today: date)
     )
 
 
+def task_summary(task) -> TaskSummary:
+    return TaskSummary(
+        status=getattr(task, "estado", "") or "",
+        start_date=getattr(task, "start_date", None),
+        points=float(getattr(task, "puntos", None) or 0.0),
+        hours=float(getattr(task, "horas_estimadas", None) or 0.0),
+        descendants=SubtreeRollup(
+            count=int(getattr(task, "descendientes_total", None) or 0),
+            open_count=int(getattr(task, "descendientes_abiertos", None) or 0),
+            in_progress_count=int(getattr(task, "descendientes_en_curso", None) or 0),
+            min_start_date=getattr(task, "descendientes_min_start_date", None),
+            points=float(getattr(task, "descendientes_puntos", None) or 0.0),
+            hours=float(getattr(task, "descendientes_horas", None) or 0.0),
+        ),
+    )
+
+
+def refresh_task_ancestors(repo, parent_id: Optional[int], task=None, propagate_status: bool = False) -> None:
+    """Refresh roll-ups from ``parent_id`` up to the root. ``task`` is the
+    child now under ``parent_id``; pass None after it moved away or was deleted."""
+    if not parent_id:
+        return
+    ancestors = repo.ancestor_rollups(int(parent_id), int(task.id) if task is not None else None)
+    child = task_summary(task) if task is not None else None
+    repo.apply_parent_updates(cascade_parent_updates(child, ancestors, propagate_status))
+
+
 def cascade_task_parents_for_inprogress(repo, task) -> None:
     if not task or not task.parent_id:
         return
-    by_id, model_by_id, children = repo.tree_by_celula(task.celula_id)
-    memo = {}
-    visiting = set()
-
-    current_id = int(task.parent_id)
-    safety = 0
-    while current_id and safety < 200:
-        safety += 1
-        parent = model_by_id.get(current_id)
-        if not parent:
-            break
-
-        rollup = descendants_rollup(by_id, children, current_id, memo, visiting)
-        if getattr(parent, "start_date", None) != rollup.min_start_date:
-            parent.start_date = rollup.min_start_date
-        if rollup.any_doing and (getattr(parent, "estado", "") or "") != "doing":
-            parent.estado = "doing"
-
-        current_id = int(parent.parent_id) if parent.parent_id else 0
+    refresh_task_ancestors(repo, task.parent_id, task, propagate_status=True)
+
+
+def refresh_ancestors_batch(repo, parent_ids: Iterable[int], propagate_parent_ids: Iterable[int] = ()) -> None:
+    """``refresh_task_ancestors`` for many changed tasks at once: one load of
+    the affected chains, one recompute, one bulk update. ``parent_ids`` are the
+    old and new parents of every changed task; chains above
+    ``propagate_parent_ids`` also get start_date/status propagation."""
+    ancestor_ids, rows = repo.ancestors_with_children(parent_ids)
+    if not ancestor_ids:
+        return
+    ancestors: dict[int, TreeTask] = {}
+    children: dict[int, list[TreeTask]] = {}
+    for task in rows:
+        item = TreeTask(int(task.id), int(task.parent_id) if task.parent_id else None, task_summary(task))
+        if item.id in ancestor_ids:
+            ancestors[item.id] = item
+        if item.parent_id in ancestor_ids:
+            children.setdefault(item.parent_id, []).append(item)
+    propagate: set[int] = set()
+    for task_id in propagate_parent_ids:
+        current = ancestors.get(int(task_id)) if task_id else None
+        while current is not None and current.id not in propagate:
+            propagate.add(current.id)
+            current = ancestors.get(current.parent_id) if current.parent_id else None
+    repo.apply_parent_updates(consolidated_parent_updates(ancestors, children, propagate))
+
+
+@dataclass(frozen=True)
+class TaskChangePage:
+    cursor: int
+    reset: bool
+    has_more: bool
+    changes: list
+
+
+def read_task_changes(repo, since: Optional[int], limit: int) -> TaskChangePage:
+    """Page of the change feed after cursor ``since``. Without ``since`` it
+    only returns the current cursor (read it before the initial full load).
+    ``reset`` asks the client to reload everything: its cursor is older than
+    the retained log or comes from another database."""
+    first, last = repo.change_bounds()
+    last = int(last or 0)
+    if since is None:
+        return TaskChangePage(cursor=last, reset=False, has_more=False, changes=[])
+    if since > last or (first is not None and since < first - 1):
+        return TaskChangePage(cursor=last, reset=True, has_more=False, changes=[])
+    changes, has_more = repo.changes_since(since, limit)
+    cursor = int(changes[-1].id) if changes else since
+    if not has_more:
+        # Everything up to ``last`` was returned or superseded.
+        cursor = max(cursor, last)
+    return TaskChangePage(cursor=cursor, reset=False, has_more=has_more, changes=changes)
@@ -1,2 +1,6 @@
 TASK_STATUSES = {"backlog", "todo", "doing", "done", "archived"}
 TASK_PRIORITIES = {"baja", "media", "alta", "urgente"}
+TASK_TAG_MAX_LENGTH = 80
+# Operations recorded in the task change feed.
+TASK_CHANGE_UPSERT = "upsert"
+TASK_CHANGE_DELETE = "delete"
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Callable, Mapping, Optional
+from typing import Callable, Iterable, Mapping, Optional
 
 
 @dataclass(frozen=True)
@@ -17,6 +17,74 @@ class SubtreeInfo:
     any_doing: bool
 
 
+CLOSED_STATUSES = {"done", "archived"}
+
+
+@dataclass(frozen=True)
+class SubtreeRollup:
+    """Persisted summary of a task's descendants (the task itself excluded)."""
+
+    count: int = 0
+    open_count: int = 0
+    in_progress_count: int = 0
+    min_start_date: Optional[date] = None
+    points: float = 0.0
+    hours: float = 0.0
+
+    def plus(self, other: "SubtreeRollup") -> "SubtreeRollup":
+        return SubtreeRollup(
+            count=self.count + other.count,
+            open_count=self.open_count + other.open_count,
+            in_progress_count=self.in_progress_count + other.in_progress_count,
+            min_start_date=_min_date(self.min_start_date, other.min_start_date),
+            points=self.points + other.points,
+            hours=self.hours + other.hours,
+        )
+
+
+@dataclass(frozen=True)
+class TaskSummary:
+    status: str
+    start_date: Optional[date]
+    points: float
+    hours: float
+    descendants: SubtreeRollup
+
+    def as_child(self) -> SubtreeRollup:
+        """What this task and its subtree add to its parent's roll-up."""
+        own = SubtreeRollup(
+            count=1,
+            open_count=0 if (self.status or "").strip().lower() in CLOSED_STATUSES else 1,
+            in_progress_count=1 if is_in_progress_family(self.status) else 0,
+            min_start_date=self.start_date,
+            points=float(self.points or 0.0),
+            hours=float(self.hours or 0.0),
+        )
+        return own.plus(self.descendants)
+
+
+@dataclass(frozen=True)
+class AncestorRollup:
+    """One ancestor of a changed task, nearest first, with aggregates over its
+    direct children other than the one on the path to the changed task."""
+
+    id: int
+    status: str
+    start_date: Optional[date]
+    points: float
+    hours: float
+    descendants: SubtreeRollup
+    other_children: SubtreeRollup
+
+
+@dataclass(frozen=True)
+class ParentUpdate:
+    id: int
+    status: str
+    start_date: Optional[date]
+    descendants: SubtreeRollup
+
+
 def is_in_progress_family(status: str) -> bool:
     normalized = (status or "").strip().lower()
     return normalized in {"todo", "doing"}
@@ -110,3 +178,133 @@ def descendants_rollup(
         if info.any_doing:
             any_doing = True
     return SubtreeInfo(min_date, any_doing)
+
+
+def cascade_parent_updates(
+    child: Optional[TaskSummary],
+    ancestors: Iterable[AncestorRollup],
+    propagate_status: bool = True,
+) -> list[ParentUpdate]:
+    """Walk up from a changed task, refreshing each ancestor's roll-up from
+    its direct children. With ``propagate_status`` a parent also takes the
+    earliest start_date below it and becomes "doing" when any descendant is
+    in progress.
+
+    ``child`` is the changed task, or None when it left the first ancestor
+    (move, delete). Children already summarise their own subtree, so each
+    level costs O(1).
+    """
+    updates: list[ParentUpdate] = []
+    for ancestor in ancestors:
+        descendants = ancestor.other_children if child is None else ancestor.other_children.plus(child.as_child())
+        status, start_date = ancestor.status, ancestor.start_date
+        if propagate_status:
+            if descendants.in_progress_count > 0 and (status or "") != "doing":
+                status = "doing"
+            start_date = descendants.min_start_date
+        if (status, start_date, descendants) != (ancestor.status, ancestor.start_date, ancestor.descendants):
+            updates.append(ParentUpdate(ancestor.id, status, start_date, descendants))
+        child = TaskSummary(status, start_date, ancestor.points, ancestor.hours, descendants)
+    return updates
+
+
+@dataclass(frozen=True)
+class TreeTask:
+    id: int
+    parent_id: Optional[int]
+    summary: TaskSummary
+
+
+def consolidated_parent_updates(
+    ancestors: Mapping[int, TreeTask],
+    children: Mapping[int, list[TreeTask]],
+    propagate_status_ids: set[int],
+) -> list[ParentUpdate]:
+    """One pass over every ancestor touched by a batch of changes.
+
+    ``ancestors`` is closed upwards (each one's parent is in it or is None);
+    ``children`` holds their direct children as stored. Ancestors are
+    recomputed children-first from those children, so several changed tasks
+    under one parent cost a single update. Ancestors in
+    ``propagate_status_ids`` also take the earliest start_date below them and
+    become "doing" when any descendant is in progress, as in
+    ``cascade_parent_updates``.
+    """
+    fresh: dict[int, TaskSummary] = {}
+    updates: list[ParentUpdate] = []
+
+    def recompute(task_id: int) -> None:
+        ancestor = ancestors[task_id]
+        descendants = SubtreeRollup()
+        for child in children.get(task_id, []):
+            descendants = descendants.plus(fresh.get(child.id, child.summary).as_child())
+        own = ancestor.summary
+        status, start_date = own.status, own.start_date
+        if task_id in propagate_status_ids:
+            if descendants.in_progress_count > 0 and (status or "") != "doing":
+                status = "doing"
+            start_date = descendants.min_start_date
+        if (status, start_date, descendants) != (own.status, own.start_date, own.descendants):
+            updates.append(ParentUpdate(task_id, status, start_date, descendants))
+        fresh[task_id] = TaskSummary(status, start_date, own.points, own.hours, descendants)
+
+    pending = set(ancestors)
+    for root in [task_id for task_id, item in ancestors.items() if item.parent_id not in ancestors]:
+        stack = [(root, False)]
+        while stack:
+            task_id, expanded = stack.pop()
+            if expanded:
+                recompute(task_id)
+                continue
+            if task_id not in pending:
+                continue
+            pending.discard(task_id)
+            stack.append((task_id, True))
+            stack.extend((child.id, False) for child in children.get(task_id, []) if child.id in pending)
+    return updates
+
+
+def _min_date(a: Optional[date], b: Optional[date]) -> Optional[date]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def build_subtree_rollups(nodes: Iterable[tuple]) -> dict[int, SubtreeRollup]:
+    """Full recomputation from ``(id, parent_id, status, start_date, points,
+    hours)`` rows, for backfills. Cycles are cut where first detected."""
+    rows = {int(row[0]): row for row in nodes}
+    children: dict[int, list[int]] = {}
+    for task_id, row in rows.items():
+        if row[1] is not None and int(row[1]) in rows:
+            children.setdefault(int(row[1]), []).append(task_id)
+    result: dict[int, SubtreeRollup] = {}
+    for root in rows:
+        if root in result:
+            continue
+        stack = [(root, False)]
+        visiting = set()
+        while stack:
+            task_id, expanded = stack.pop()
+            if task_id in result:
+                continue
+            if expanded:
+                rollup = SubtreeRollup()
+                for child_id in children.get(task_id, []):
+                    if child_id in result:
+                        _, _, status, start_date, points, hours = rows[child_id]
+                        summary = TaskSummary(
+                            status or "", start_date, points or 0.0, hours or 0.0, result[child_id]
+                        )
+                        rollup = rollup.plus(summary.as_child())
+                result[task_id] = rollup
+                visiting.discard(task_id)
+                continue
+            if task_id in visiting:
+                continue
+            visiting.add(task_id)
+            stack.append((task_id, True))
+            stack.extend((child_id, False) for child_id in children.get(task_id, []) if child_id not in visiting)
+    return result
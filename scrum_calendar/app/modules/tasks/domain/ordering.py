@@ -0,0 +1,33 @@
+from typing import Optional
+
+# Gap between neighbours after a rebalance; a column can absorb ~40 halvings
+# between the same two cards before it needs another one.
+ORDER_GAP = 1024.0
+# Below this gap the background job respaces the column, many halvings before
+# float precision runs out and a move would have to respace it inline.
+MIN_ORDER_GAP = 1e-3
+
+
+def order_between(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    """An ``orden`` strictly between two neighbours (either may be None for
+    the column's ends), or None when they are too close to split."""
+    if before is None and after is None:
+        return ORDER_GAP
+    if before is None:
+        return float(after) - ORDER_GAP
+    if after is None:
+        return float(before) + ORDER_GAP
+    low, high = sorted((float(before), float(after)))
+    middle = low + (high - low) / 2
+    return middle if low < middle < high else None
+
+
+def is_crowded(before: Optional[float], after: Optional[float]) -> bool:
+    if before is None or after is None:
+        return False
+    return abs(float(after) - float(before)) < MIN_ORDER_GAP
+
+
+def spaced_orders(count: int) -> list[float]:
+    """Evenly spaced ``orden`` values for a rebalanced column."""
+    return [ORDER_GAP * (idx + 1) for idx in range(count)]
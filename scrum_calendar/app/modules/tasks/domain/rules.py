@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Optional
 
+from app.shared.domain.text import clean_label, label_key
+
 
 @dataclass(frozen=True)
 class TaskDates:
@@ -41,3 +43,14 @@ def apply_status_date_transition(
         )
 
     return TaskDates(start_date=current_start_date, end_date=current_end_date)
+
+
+def parse_task_tags(etiquetas: Optional[str]) -> dict[str, str]:
+    """Tags of a comma-separated ``etiquetas`` value, by normalized key; the
+    first spelling of a repeated tag wins."""
+    tags: dict[str, str] = {}
+    for raw in (etiquetas or "").split(","):
+        key = label_key(raw)
+        if key and key not in tags:
+            tags[key] = clean_label(raw)
+    return tags
@@ -1,9 +1,136 @@
-from typing import Optional
+from datetime import date, datetime
+from typing import Iterable, Optional
 
+from sqlalchemy import (
+    Integer,
+    and_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from app.modules.tasks.domain.hierarchy import TaskNode, would_create_parent_cycle
-from data.models import Task
+from app.modules.tasks.domain.constants import TASK_CHANGE_DELETE, TASK_CHANGE_UPSERT, TASK_TAG_MAX_LENGTH
+from app.modules.tasks.domain.hierarchy import (
+    CLOSED_STATUSES,
+    AncestorRollup,
+    ParentUpdate,
+    SubtreeRollup,
+    TaskNode,
+    build_subtree_rollups,
+    would_create_parent_cycle,
+)
+from app.modules.tasks.domain.ordering import MIN_ORDER_GAP, spaced_orders
+from app.modules.tasks.domain.rules import parse_task_tags
+from app.shared.domain.text import label_key
+from config.settings import settings
+from data.models import Task, TaskChange, TaskClosure, TaskComment, TaskTag, now_py, task_tag_links
+
+IN_PROGRESS_STATUSES = ("todo", "doing")
+MAX_ANCESTOR_DEPTH = 200
+CYCLE_CHECK_DEPTH = 400
+# pg_advisory_xact_lock key serializing change-log commits (any constant works).
+TASK_CHANGES_LOCK_KEY = 50_501
+PENDING_CHANGES_KEY = "task_changes_pending"
+ROLLUP_GROUP_COLUMNS = (
+    "estado",
+    "start_date",
+    "puntos",
+    "horas_estimadas",
+    "descendientes_total",
+    "descendientes_abiertos",
+    "descendientes_en_curso",
+    "descendientes_min_start_date",
+    "descendientes_puntos",
+    "descendientes_horas",
+)
+
+
+def rollup_values(rollup: SubtreeRollup) -> dict:
+    return {
+        "descendientes_total": rollup.count,
+        "descendientes_abiertos": rollup.open_count,
+        "descendientes_en_curso": rollup.in_progress_count,
+        "descendientes_min_start_date": rollup.min_start_date,
+        "descendientes_puntos": rollup.points,
+        "descendientes_horas": rollup.hours,
+    }
+
+
+def ancestor_chain(start_id: int, child_id: Optional[int] = None, max_depth: int = MAX_ANCESTOR_DEPTH):
+    """Recursive CTE ``(id, child_id, depth)`` from ``start_id`` (depth 1) up
+    to the root; ``child_id`` is the task below each row on the path. A
+    corrupt cycle repeats ids until ``max_depth``."""
+    tasks = Task.__table__
+    chain = (
+        select(
+            tasks.c.id.label("id"),
+            cast(literal(child_id, Integer), Integer).label("child_id"),
+            cast(literal(1, Integer), Integer).label("depth"),
+        )
+        .where(tasks.c.id == start_id)
+        .cte("ancestor_chain", recursive=True)
+    )
+    step = tasks.alias("step")
+    return chain.union_all(
+        select(step.c.parent_id, chain.c.id, chain.c.depth + 1).where(
+            step.c.id == chain.c.id,
+            step.c.parent_id.isnot(None),
+            chain.c.depth < max_depth,
+        )
+    )
+
+
+def descendant_chain(start_id: int, max_depth: int = MAX_ANCESTOR_DEPTH):
+    """Recursive CTE ``(id, depth)`` over ``start_id`` (depth 0) and every task below it."""
+    tasks = Task.__table__
+    chain = (
+        select(tasks.c.id.label("id"), cast(literal(0, Integer), Integer).label("depth"))
+        .where(tasks.c.id == start_id)
+        .cte("descendant_chain", recursive=True)
+    )
+    step = tasks.alias("step")
+    return chain.union_all(
+        select(step.c.id, chain.c.depth + 1).where(step.c.parent_id == chain.c.id, chain.c.depth < max_depth)
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _write_pending_changes(session: Session) -> None:
+    """Write the queued feed rows as the very last statements of the
+    transaction. On Postgres the advisory lock makes change ids commit in
+    order (a reader never sees id N+1 while N may still appear); it is taken
+    after every row lock and held only through this insert and the commit,
+    so it cannot deadlock with task writes."""
+    pending = session.info.pop(PENDING_CHANGES_KEY, None)
+    if not pending:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(select(func.pg_advisory_xact_lock(TASK_CHANGES_LOCK_KEY)))
+    creado_en = now_py()
+    session.execute(
+        insert(TaskChange.__table__),
+        [{"task_id": task_id, "operacion": op, "creado_en": creado_en} for task_id, op in pending.items()],
+    )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending_changes(session: Session, transaction) -> None:
+    # Rolled back or closed without commit: its changes never happened.
+    if transaction.parent is None:
+        session.info.pop(PENDING_CHANGES_KEY, None)
 
 
 class SqlAlchemyTaskRepository:
@@ -38,10 +165,455 @@ class SqlAlchemyTaskRepository:
             children.setdefault(int(task.parent_id), []).append(int(task.id))
         return by_id, model_by_id, children
 
+    def ancestor_rollups(
+        self, parent_id: int, child_id: Optional[int] = None, max_depth: int = MAX_ANCESTOR_DEPTH
+    ) -> list[AncestorRollup]:
+        """``parent_id`` and its ancestors (nearest first) with aggregates of
+        their direct children, minus the child on the path (``child_id`` at
+        the first level), in one recursive CTE round trip."""
+        self.db.flush()
+        tasks = Task.__table__
+        chain = ancestor_chain(parent_id, child_id, max_depth)
+        ancestor = tasks.alias("ancestor")
+        kid = tasks.alias("kid")
+        stmt = (
+            select(
+                chain.c.id,
+                ancestor.c.estado,
+                ancestor.c.start_date,
+                ancestor.c.puntos,
+                ancestor.c.horas_estimadas,
+                ancestor.c.descendientes_total,
+                ancestor.c.descendientes_abiertos,
+                ancestor.c.descendientes_en_curso,
+                ancestor.c.descendientes_min_start_date,
+                ancestor.c.descendientes_puntos,
+                ancestor.c.descendientes_horas,
+                func.sum(1 + kid.c.descendientes_total).label("kid_count"),
+                func.sum(
+                    case((kid.c.estado.in_(CLOSED_STATUSES), 0), else_=1) + kid.c.descendientes_abiertos
+                ).label("kid_open"),
+                func.sum(
+                    case((kid.c.estado.in_(IN_PROGRESS_STATUSES), 1), else_=0) + kid.c.descendientes_en_curso
+                ).label("kid_in_progress"),
+                func.min(kid.c.start_date).label("kid_min_start"),
+                func.min(kid.c.descendientes_min_start_date).label("kid_min_descendant_start"),
+                func.sum(func.coalesce(kid.c.puntos, 0.0) + kid.c.descendientes_puntos).label("kid_points"),
+                func.sum(func.coalesce(kid.c.horas_estimadas, 0.0) + kid.c.descendientes_horas).label("kid_hours"),
+            )
+            .select_from(
+                chain.join(ancestor, ancestor.c.id == chain.c.id).outerjoin(
+                    kid,
+                    and_(
+                        kid.c.parent_id == chain.c.id,
+                        or_(chain.c.child_id.is_(None), kid.c.id != chain.c.child_id),
+                    ),
+                )
+            )
+            .group_by(
+                chain.c.id,
+                chain.c.depth,
+                *[column for column in ancestor.c if column.key in ROLLUP_GROUP_COLUMNS],
+            )
+            .order_by(chain.c.depth)
+        )
+        rollups: list[AncestorRollup] = []
+        seen = set()
+        for row in self.db.execute(stmt):
+            if row.id in seen:
+                # Corrupt data with a parent cycle: stop at the first repeat.
+                break
+            seen.add(row.id)
+            kid_min_start = row.kid_min_start
+            if row.kid_min_descendant_start is not None and (
+                kid_min_start is None or row.kid_min_descendant_start < kid_min_start
+            ):
+                kid_min_start = row.kid_min_descendant_start
+            rollups.append(
+                AncestorRollup(
+                    id=int(row.id),
+                    status=row.estado or "",
+                    start_date=row.start_date,
+                    points=float(row.puntos or 0.0),
+                    hours=float(row.horas_estimadas or 0.0),
+                    descendants=SubtreeRollup(
+                        count=int(row.descendientes_total or 0),
+                        open_count=int(row.descendientes_abiertos or 0),
+                        in_progress_count=int(row.descendientes_en_curso or 0),
+                        min_start_date=row.descendientes_min_start_date,
+                        points=float(row.descendientes_puntos or 0.0),
+                        hours=float(row.descendientes_horas or 0.0),
+                    ),
+                    other_children=SubtreeRollup(
+                        count=int(row.kid_count or 0),
+                        open_count=int(row.kid_open or 0),
+                        in_progress_count=int(row.kid_in_progress or 0),
+                        min_start_date=kid_min_start,
+                        points=float(row.kid_points or 0.0),
+                        hours=float(row.kid_hours or 0.0),
+                    ),
+                )
+            )
+        return rollups
+
+    def ancestors_with_children(self, start_ids: Iterable[int]) -> tuple[set[int], list[Task]]:
+        """Every ancestor of ``start_ids`` (inclusive) plus all their direct
+        children, in two queries whatever the number of starting points."""
+        start_ids = {int(item) for item in start_ids if item}
+        if not start_ids:
+            return set(), []
+        self.db.flush()
+        tasks = Task.__table__
+        # UNION (not ALL) dedupes shared ancestors and stops on corrupt cycles.
+        chain = (
+            select(tasks.c.id, tasks.c.parent_id)
+            .where(tasks.c.id.in_(start_ids))
+            .cte("ancestor_set", recursive=True)
+        )
+        step = tasks.alias("step")
+        chain = chain.union(select(step.c.id, step.c.parent_id).where(step.c.id == chain.c.parent_id))
+        ancestor_ids = {int(row.id) for row in self.db.execute(select(chain.c.id))}
+        rows = self.db.query(Task).filter(or_(Task.id.in_(ancestor_ids), Task.parent_id.in_(ancestor_ids))).all()
+        return ancestor_ids, rows
+
+    def apply_parent_updates(self, updates: Iterable[ParentUpdate]) -> None:
+        rows = [
+            {"id": item.id, "estado": item.status, "start_date": item.start_date, **rollup_values(item.descendants)}
+            for item in updates
+        ]
+        self._update_rows(rows)
+        self.log_changes(row["id"] for row in rows)
+
+    def rebuild_rollups(self) -> int:
+        """Recompute every task's roll-up (backfill after adding the columns)."""
+        self.db.flush()
+        nodes = self.db.execute(
+            select(Task.id, Task.parent_id, Task.estado, Task.start_date, Task.puntos, Task.horas_estimadas)
+        ).all()
+        rollups = build_subtree_rollups(nodes)
+        self._update_rows([{"id": task_id, **rollup_values(rollup)} for task_id, rollup in rollups.items()])
+        return len(rollups)
+
+    def _update_rows(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        self.db.execute(update(Task), rows)
+        for row in rows:
+            loaded = self.db.identity_map.get(self.db.identity_key(Task, row["id"]))
+            if loaded is not None:
+                self.db.expire(loaded, [key for key in row if key != "id"] + ["actualizado_en"])
+
+    @property
+    def closure_enabled(self) -> bool:
+        return settings.task_closure_enabled
+
+    def ancestor_ids(self, task_id: int, max_depth: int = MAX_ANCESTOR_DEPTH) -> list[int]:
+        """``task_id`` followed by its ancestors up to the root, in one query."""
+        if self.closure_enabled:
+            stmt = (
+                select(TaskClosure.ancestro_id)
+                .where(TaskClosure.descendiente_id == task_id, TaskClosure.profundidad < max_depth)
+                .order_by(TaskClosure.profundidad)
+            )
+            return [int(item) for item in self.db.scalars(stmt)]
+        chain = ancestor_chain(task_id, max_depth=max_depth)
+        return [int(row.id) for row in self.db.execute(select(chain.c.id).order_by(chain.c.depth))]
+
+    def descendant_ids(self, task_id: int) -> list[int]:
+        """``task_id`` and every task below it, in one query."""
+        if self.closure_enabled:
+            stmt = select(TaskClosure.descendiente_id).where(TaskClosure.ancestro_id == task_id)
+            return [int(item) for item in self.db.scalars(stmt)]
+        chain = descendant_chain(task_id)
+        return sorted({int(row.id) for row in self.db.execute(select(chain.c.id))})
+
+    def add_to_hierarchy(self, task: Task) -> None:
+        """Closure rows for a new (flushed) task: itself plus its parent's ancestors."""
+        if not self.closure_enabled:
+            return
+        closure = TaskClosure.__table__
+        rows = [select(literal(task.id, Integer), literal(task.id, Integer), literal(0, Integer))]
+        if task.parent_id is not None:
+            rows.append(
+                select(closure.c.ancestro_id, literal(task.id, Integer), closure.c.profundidad + 1).where(
+                    closure.c.descendiente_id == task.parent_id
+                )
+            )
+        self.db.execute(
+            insert(closure).from_select(
+                ["ancestro_id", "descendiente_id", "profundidad"], union_all(*rows) if len(rows) > 1 else rows[0]
+            )
+        )
+
+    def move_subtree(self, task_id: int, new_parent_id: Optional[int]) -> None:
+        """Re-link a subtree in two set-based statements: drop the paths from
+        its old ancestors, then cross the new parent's ancestors with it."""
+        if not self.closure_enabled:
+            return
+        closure = TaskClosure.__table__
+        subtree = select(closure.c.descendiente_id).where(closure.c.ancestro_id == task_id)
+        old_ancestors = select(closure.c.ancestro_id).where(
+            closure.c.descendiente_id == task_id, closure.c.ancestro_id != task_id
+        )
+        self.db.execute(
+            delete(closure).where(
+                closure.c.descendiente_id.in_(subtree.scalar_subquery()),
+                closure.c.ancestro_id.in_(old_ancestors.scalar_subquery()),
+            )
+        )
+        if new_parent_id is None:
+            return
+        above = closure.alias("above")
+        below = closure.alias("below")
+        self.db.execute(
+            insert(closure).from_select(
+                ["ancestro_id", "descendiente_id", "profundidad"],
+                select(above.c.ancestro_id, below.c.descendiente_id, above.c.profundidad + below.c.profundidad + 1)
+                .select_from(above.join(below, true()))
+                .where(above.c.descendiente_id == new_parent_id, below.c.ancestro_id == task_id),
+            )
+        )
+
+    def delete_subtree(self, task_id: int) -> int:
+        """Delete a task with all its subtasks and their comments, set-based."""
+        ids = self.descendant_ids(task_id)
+        if not ids:
+            return 0
+        self.db.execute(delete(TaskClosure).where(TaskClosure.descendiente_id.in_(ids)))
+        self.db.execute(delete(task_tag_links).where(task_tag_links.c.task_id.in_(ids)))
+        self.db.execute(delete(TaskComment).where(TaskComment.task_id.in_(ids)))
+        self.db.execute(delete(Task).where(Task.id.in_(ids)))
+        self.log_changes(ids, TASK_CHANGE_DELETE)
+        return len(ids)
+
+    def rebuild_closure(self) -> int:
+        """Repopulate ``task_closure`` from ``parent_id`` (backfill/repair)."""
+        self.db.flush()
+        tasks = Task.__table__
+        paths = (
+            select(
+                tasks.c.id.label("ancestro_id"),
+                tasks.c.id.label("descendiente_id"),
+                cast(literal(0, Integer), Integer).label("profundidad"),
+            ).cte("task_paths", recursive=True)
+        )
+        step = tasks.alias("step")
+        paths = paths.union_all(
+            select(paths.c.ancestro_id, step.c.id, paths.c.profundidad + 1).where(
+                step.c.parent_id == paths.c.descendiente_id, paths.c.profundidad < MAX_ANCESTOR_DEPTH
+            )
+        )
+        self.db.execute(delete(TaskClosure))
+        self.db.execute(
+            insert(TaskClosure.__table__).from_select(
+                ["ancestro_id", "descendiente_id", "profundidad"],
+                # A corrupt parent cycle yields repeated pairs; keep the shortest.
+                select(paths.c.ancestro_id, paths.c.descendiente_id, func.min(paths.c.profundidad)).group_by(
+                    paths.c.ancestro_id, paths.c.descendiente_id
+                ),
+            )
+        )
+        return int(self.db.scalar(select(func.count()).select_from(TaskClosure)) or 0)
+
+    def closure_in_sync(self) -> bool:
+        """Cheap check used at startup: one self-row per task."""
+        tasks_total = self.db.scalar(select(func.count()).select_from(Task))
+        self_rows = self.db.scalar(select(func.count()).select_from(TaskClosure).where(TaskClosure.profundidad == 0))
+        return int(tasks_total or 0) == int(self_rows or 0)
+
+    def ancestor_path(self, task_id: int) -> list[Task]:
+        """Breadcrumb from the root down to ``task_id`` (inclusive)."""
+        ids = []
+        for node_id in self.ancestor_ids(task_id):
+            if node_id in ids:
+                break
+            ids.append(node_id)
+        if not ids:
+            return []
+        by_id = {task.id: task for task in self.db.query(Task).filter(Task.id.in_(ids))}
+        return [by_id[item] for item in reversed(ids) if item in by_id]
+
+    def reset_overdue(self, business_today: date, owner_id: Optional[int] = None) -> list[dict]:
+        """Daily reset in two ``UPDATE ... RETURNING`` statements: overdue due
+        dates move to today and "doing" goes back to "todo". Returns the final
+        column values of every changed task. Parents are not cascaded; both
+        statuses are open, so roll-ups are unchanged."""
+        tasks = Task.__table__
+        scope = [~tasks.c.estado.in_(CLOSED_STATUSES)]
+        if owner_id is not None:
+            scope.append(tasks.c.creado_por_usuario_id == owner_id)
+        statements = (
+            update(tasks)
+            .where(*scope, tasks.c.fecha_vencimiento.isnot(None), tasks.c.fecha_vencimiento < business_today)
+            .values(fecha_vencimiento=business_today),
+            update(tasks).where(*scope, tasks.c.estado == "doing").values(estado="todo", end_date=None),
+        )
+        by_id: dict[int, dict] = {}
+        for stmt in statements:
+            for row in self.db.execute(stmt.returning(*tasks.c)).mappings():
+                by_id[int(row["id"])] = dict(row)
+        loaded = [self.db.identity_map.get(self.db.identity_key(Task, task_id)) for task_id in by_id]
+        for task in loaded:
+            if task is not None:
+                self.db.expire(task)
+        self.log_changes(by_id)
+        return sorted(by_id.values(), key=lambda row: (row["parent_id"] or 0, row["id"]), reverse=True)
+
+    def set_segment(self, owner_id: int, segment_key: str, nombre: Optional[str]) -> int:
+        """Rename (or clear, with ``nombre=None``) a segment on every task of
+        ``owner_id`` in one indexed UPDATE."""
+        ids = self.db.scalars(
+            update(Task)
+            .where(Task.creado_por_usuario_id == owner_id, Task.segmento_key == segment_key)
+            .values(segmento=nombre, segmento_key=label_key(nombre))
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        self.log_changes(ids)
+        return len(ids)
+
+    def backfill_segment_keys(self) -> int:
+        """Fill ``segmento_key`` for tasks that predate the column."""
+        rows = self.db.execute(
+            select(Task.id, Task.segmento).where(Task.segmento.isnot(None), Task.segmento_key.is_(None))
+        ).all()
+        self._update_rows([{"id": row.id, "segmento_key": label_key(row.segmento)} for row in rows])
+        return len(rows)
+
+    def sync_tags(self, task_id: int, etiquetas: Optional[str]) -> None:
+        """Rewrite the tag links of one task from its ``etiquetas`` text."""
+        tags = parse_task_tags(etiquetas)
+        self.db.execute(delete(task_tag_links).where(task_tag_links.c.task_id == task_id))
+        if not tags:
+            return
+        tag_ids = self._tag_ids(tags)
+        self.db.execute(
+            insert(task_tag_links),
+            [{"task_id": task_id, "tag_id": tag_id} for tag_id in tag_ids.values()],
+        )
+
+    def rebuild_tags(self) -> int:
+        """Backfill: parse every task's ``etiquetas`` and relink them all."""
+        self.db.flush()
+        rows = self.db.execute(select(Task.id, Task.etiquetas).where(Task.etiquetas.isnot(None))).all()
+        parsed = {int(row.id): parse_task_tags(row.etiquetas) for row in rows}
+        names: dict[str, str] = {}
+        for tags in parsed.values():
+            for key, nombre in tags.items():
+                names.setdefault(key[:TASK_TAG_MAX_LENGTH], nombre[:TASK_TAG_MAX_LENGTH])
+        self.db.execute(delete(task_tag_links))
+        tag_ids = self._tag_ids(names) if names else {}
+        links = {
+            (task_id, tag_ids[key[:TASK_TAG_MAX_LENGTH]]) for task_id, tags in parsed.items() for key in tags
+        }
+        if links:
+            self.db.execute(
+                insert(task_tag_links), [{"task_id": task_id, "tag_id": tag_id} for task_id, tag_id in sorted(links)]
+            )
+        return len(links)
+
+    def tag_counts(self, criteria: Iterable = ()) -> list[tuple[str, int]]:
+        """Tasks per tag among the tasks matching ``criteria``, most used first."""
+        total = func.count(task_tag_links.c.task_id)
+        stmt = (
+            select(TaskTag.nombre, total.label("total"))
+            .join(task_tag_links, task_tag_links.c.tag_id == TaskTag.id)
+            .join(Task, Task.id == task_tag_links.c.task_id)
+            .where(*criteria)
+            .group_by(TaskTag.id, TaskTag.nombre)
+            .order_by(total.desc(), func.lower(TaskTag.nombre))
+        )
+        return [(row.nombre, int(row.total)) for row in self.db.execute(stmt)]
+
+    def _tag_ids(self, tags: dict[str, str]) -> dict[str, int]:
+        upsert = pg_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        self.db.execute(
+            upsert(TaskTag.__table__).on_conflict_do_nothing(index_elements=["nombre_key"]),
+            [{"nombre": nombre, "nombre_key": key, "creado_en": now_py()} for key, nombre in tags.items()],
+        )
+        rows = self.db.execute(select(TaskTag.nombre_key, TaskTag.id).where(TaskTag.nombre_key.in_(list(tags))))
+        return {row.nombre_key: int(row.id) for row in rows}
+
+    def crowded_columns(self, min_gap: float = MIN_ORDER_GAP) -> list[tuple[Optional[int], str]]:
+        """Board columns (celula, estado) with neighbours closer than ``min_gap``."""
+        previous = func.lag(Task.orden).over(
+            partition_by=(Task.celula_id, Task.estado),
+            order_by=(Task.orden, Task.id),
+        )
+        gaps = select(Task.celula_id, Task.estado, (Task.orden - previous).label("gap")).subquery()
+        stmt = select(gaps.c.celula_id, gaps.c.estado).where(gaps.c.gap < min_gap).distinct()
+        return [(row.celula_id, row.estado) for row in self.db.execute(stmt)]
+
+    def rebalance_column(self, celula_id: Optional[int], estado: str) -> int:
+        """Respace one column's ``orden`` keeping its order; one bulk write."""
+        column = Task.celula_id.is_(None) if celula_id is None else Task.celula_id == celula_id
+        ids = self.db.scalars(
+            select(Task.id).where(column, Task.estado == estado).order_by(Task.orden, Task.id)
+        ).all()
+        if not ids:
+            return 0
+        tasks = Task.__table__
+        # Core executemany that keeps actualizado_en: respacing is not an edit.
+        self.db.execute(
+            update(tasks)
+            .where(tasks.c.id == bindparam("task_id"))
+            .values(orden=bindparam("new_orden"), actualizado_en=tasks.c.actualizado_en),
+            [{"task_id": task_id, "new_orden": orden} for task_id, orden in zip(ids, spaced_orders(len(ids)))],
+        )
+        for task_id in ids:
+            loaded = self.db.identity_map.get(self.db.identity_key(Task, task_id))
+            if loaded is not None:
+                self.db.expire(loaded, ["orden"])
+        self.log_changes(ids)
+        return len(ids)
+
     def would_create_parent_cycle(self, child_id: int, new_parent_id: int) -> bool:
-        def get_parent_id(task_id: int) -> Optional[int]:
-            current = self.get(task_id)
-            return int(current.parent_id) if current and current.parent_id else None
+        if self.closure_enabled:
+            return int(child_id) == int(new_parent_id) or self.db.scalar(
+                select(TaskClosure.profundidad).where(
+                    TaskClosure.ancestro_id == child_id, TaskClosure.descendiente_id == new_parent_id
+                )
+            ) is not None
+        path = self.ancestor_ids(int(new_parent_id), max_depth=CYCLE_CHECK_DEPTH)
+        parents = dict(zip(path, path[1:]))
+        return would_create_parent_cycle(child_id, new_parent_id, parents.get, max_depth=CYCLE_CHECK_DEPTH)
+
+    def log_changes(self, task_ids: Iterable[int], op: str = TASK_CHANGE_UPSERT) -> None:
+        """Queue ``op`` for each task; the feed rows are written at commit."""
+        self.db.connection()  # tie the queue to the open transaction
+        pending = self.db.info.setdefault(PENDING_CHANGES_KEY, {})
+        for task_id in task_ids:
+            if task_id:
+                # Re-queue at the end: a task's last change wins its slot.
+                pending.pop(int(task_id), None)
+                pending[int(task_id)] = op
+
+    def change_bounds(self) -> tuple[Optional[int], Optional[int]]:
+        """Oldest and newest change ids still in the log."""
+        row = self.db.execute(select(func.min(TaskChange.id), func.max(TaskChange.id))).one()
+        return row[0], row[1]
 
-        return would_create_parent_cycle(child_id, new_parent_id, get_parent_id)
+    def changes_since(self, since: int, limit: int) -> tuple[list[TaskChange], bool]:
+        """Latest change per task after ``since``, oldest first, at most
+        ``limit`` of them; the flag tells whether more remain."""
+        latest = (
+            select(func.max(TaskChange.id).label("id"))
+            .where(TaskChange.id > since)
+            .group_by(TaskChange.task_id)
+            .subquery()
+        )
+        rows = (
+            self.db.query(TaskChange)
+            .join(latest, latest.c.id == TaskChange.id)
+            .order_by(TaskChange.id)
+            .limit(limit + 1)
+            .all()
+        )
+        return rows[:limit], len(rows) > limit
 
+    def prune_changes(self, before: datetime) -> int:
+        """Drop change entries older than ``before``; the newest one always
+        stays so an idle log still tells clients where it stands."""
+        newest = select(func.max(TaskChange.id)).scalar_subquery()
+        result = self.db.execute(delete(TaskChange).where(TaskChange.creado_en < before, TaskChange.id < newest))
+        return int(result.rowcount or 0)
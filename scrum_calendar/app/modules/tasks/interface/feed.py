@@ -0,0 +1,102 @@
+import asyncio
+from typing import Optional
+
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from api.schemas import TaskChangeOut, TaskChangesOut, TaskOut
+from app.modules.tasks.application.use_cases import read_task_changes
+from app.modules.tasks.domain.constants import TASK_CHANGE_DELETE, TASK_CHANGE_UPSERT
+from app.modules.tasks.infrastructure.repository import SqlAlchemyTaskRepository
+from config.settings import settings
+from core.instrumentation import log_scheduled_job
+from data.db import run_ws_db
+from data.models import Task
+
+TASK_FEED_JOB = "tasks_change_feed"
+
+
+def task_change_feed(db: Session, since: Optional[int], limit: int) -> TaskChangesOut:
+    """Change feed page with the current state of every upserted task."""
+    page = read_task_changes(SqlAlchemyTaskRepository(db), since, limit)
+    upserted = [change.task_id for change in page.changes if change.operacion == TASK_CHANGE_UPSERT]
+    tasks = {task.id: task for task in db.query(Task).filter(Task.id.in_(upserted))} if upserted else {}
+    changes = []
+    for change in page.changes:
+        task = tasks.get(change.task_id) if change.operacion == TASK_CHANGE_UPSERT else None
+        # Deleted after this entry was logged; its own "delete" comes later.
+        op = TASK_CHANGE_UPSERT if task is not None else TASK_CHANGE_DELETE
+        changes.append(
+            TaskChangeOut(
+                version=change.id,
+                task_id=change.task_id,
+                op=op,
+                task=TaskOut.model_validate(task) if task is not None else None,
+            )
+        )
+    return TaskChangesOut(cursor=page.cursor, reset=page.reset, has_more=page.has_more, changes=changes)
+
+
+class TaskFeedHub:
+    """Pushes the change feed to board clients connected to this worker.
+
+    One poller per process reads the log while anyone is connected, so edits
+    made by other workers, jobs and scripts reach every client too. Each push
+    carries ``since``: a client whose cursor differs (or that gets
+    ``has_more``) catches up through ``GET /tasks/changes``.
+    """
+
+    def __init__(self) -> None:
+        self.active: set[WebSocket] = set()
+        self.cursor: Optional[int] = None
+        self._send_locks: dict[WebSocket, asyncio.Lock] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+
+    async def connect(self, websocket: WebSocket) -> None:
+        await websocket.accept()
+        self.active.add(websocket)
+        self._send_locks.setdefault(websocket, asyncio.Lock())
+        async with self._start_lock:
+            poller = self._poller
+            if poller is None or poller.done() or poller.get_loop() is not asyncio.get_running_loop():
+                # Idle hub: start from the log's current end, not a stale cursor.
+                self.cursor = (await run_ws_db(lambda db: task_change_feed(db, None, 1))).cursor
+                self._poller = asyncio.create_task(self._poll())
+        await self._send(websocket, {"type": "cursor", "cursor": self.cursor})
+
+    def disconnect(self, websocket: WebSocket) -> None:
+        self.active.discard(websocket)
+        self._send_locks.pop(websocket, None)
+
+    async def poll_once(self) -> bool:
+        """Push whatever was logged since the last push; True if anything was."""
+        since = self.cursor
+        limit = settings.list_page_size_max
+        feed = await run_ws_db(lambda db: task_change_feed(db, since, limit))
+        if feed.cursor == since and not feed.reset:
+            return False
+        self.cursor = feed.cursor
+        payload = {"type": "task_changes", "since": since, **jsonable_encoder(feed)}
+        await asyncio.gather(*(self._send(ws, payload) for ws in list(self.active)), return_exceptions=True)
+        return True
+
+    async def _poll(self) -> None:
+        while self.active:
+            await asyncio.sleep(max(0.1, settings.task_changes_poll_seconds))
+            try:
+                await self.poll_once()
+            except Exception as err:  # keep pushing once the database is back
+                log_scheduled_job(TASK_FEED_JOB, "ERROR", error=str(err))
+
+    async def _send(self, websocket: WebSocket, payload: dict) -> None:
+        try:
+            lock = self._send_locks.setdefault(websocket, asyncio.Lock())
+            async with lock:
+                await asyncio.wait_for(websocket.send_json(payload), timeout=2.0)
+        except Exception:
+            self.disconnect(websocket)
+
+
+task_feed_hub = TaskFeedHub()
@@ -0,0 +1,130 @@
+import asyncio
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+import data.db as db_module
+from app.modules.tasks.infrastructure.repository import SqlAlchemyTaskRepository
+from app.shared.infrastructure.job_runs import claim_daily_run
+from config.settings import settings
+from core.calendar_engine import dias_habiles
+from core.instrumentation import log_scheduled_job
+from data.models import Feriado, now_py
+
+OVERDUE_RESET_JOB = "tasks_overdue_reset"
+ORDER_REBALANCE_JOB = "tasks_order_rebalance"
+CHANGES_PRUNE_JOB = "tasks_changes_prune"
+CHANGES_PRUNE_INTERVAL_SECONDS = 3600
+
+
+def is_business_day(db, day: date) -> bool:
+    """Weekday that is not a company-wide holiday (célula holidays don't count)."""
+    feriados = {
+        row[0]
+        for row in db.query(Feriado.fecha).filter(
+            Feriado.fecha == day, Feriado.activo.is_(True), Feriado.celula_id.is_(None)
+        )
+    }
+    return bool(dias_habiles(day, day, feriados))
+
+
+def run_daily_overdue_reset(business_today: Optional[date] = None) -> Optional[int]:
+    """Company-wide overdue-to-today reset, at most once per business day.
+
+    Returns how many tasks changed, or None on weekends and holidays and when
+    another worker or a cron run already did it today.
+    """
+    business_today = business_today or now_py().date()
+    db = db_module.SessionLocal()
+    try:
+        if not is_business_day(db, business_today) or not claim_daily_run(db, OVERDUE_RESET_JOB, business_today):
+            db.rollback()
+            return None
+        changed = len(SqlAlchemyTaskRepository(db).reset_overdue(business_today))
+        db.commit()
+        return changed
+    finally:
+        db.close()
+
+
+def scheduled_time() -> time:
+    hours, _, minutes = (settings.overdue_reset_job_time or "05:30").partition(":")
+    return time(int(hours), int(minutes or 0))
+
+
+def seconds_until_next_run(now: datetime) -> float:
+    run_at = datetime.combine(now.date(), scheduled_time())
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return (run_at - now).total_seconds()
+
+
+async def overdue_reset_loop() -> None:
+    # Catch up at startup when today's slot already passed; the daily claim
+    # keeps restarts and extra workers from resetting twice.
+    if now_py().time() >= scheduled_time():
+        await _run_overdue_reset()
+    while True:
+        await asyncio.sleep(seconds_until_next_run(now_py()))
+        await _run_overdue_reset()
+
+
+def rebalance_crowded_columns() -> int:
+    """Respace every board column whose cards got too close; returns how many."""
+    db = db_module.SessionLocal()
+    try:
+        repo = SqlAlchemyTaskRepository(db)
+        columns = repo.crowded_columns()
+        for celula_id, estado in columns:
+            repo.rebalance_column(celula_id, estado)
+        db.commit()
+        return len(columns)
+    finally:
+        db.close()
+
+
+async def order_rebalance_loop() -> None:
+    while True:
+        await asyncio.sleep(settings.task_order_rebalance_interval_seconds)
+        try:
+            columns = await run_in_threadpool(rebalance_crowded_columns)
+        except Exception as err:  # try again next interval
+            log_scheduled_job(ORDER_REBALANCE_JOB, "ERROR", error=str(err))
+            continue
+        if columns:
+            log_scheduled_job(ORDER_REBALANCE_JOB, "INFO", columns=columns)
+
+
+def prune_task_changes(now: Optional[datetime] = None) -> int:
+    """Drop change-feed entries past the retention window; returns how many."""
+    cutoff = (now or now_py()) - timedelta(hours=settings.task_changes_retention_hours)
+    db = db_module.SessionLocal()
+    try:
+        removed = SqlAlchemyTaskRepository(db).prune_changes(cutoff)
+        db.commit()
+        return removed
+    finally:
+        db.close()
+
+
+async def changes_prune_loop() -> None:
+    while True:
+        await asyncio.sleep(CHANGES_PRUNE_INTERVAL_SECONDS)
+        try:
+            removed = await run_in_threadpool(prune_task_changes)
+        except Exception as err:  # try again next interval
+            log_scheduled_job(CHANGES_PRUNE_JOB, "ERROR", error=str(err))
+            continue
+        if removed:
+            log_scheduled_job(CHANGES_PRUNE_JOB, "INFO", changes_removed=removed)
+
+
+async def _run_overdue_reset() -> None:
+    try:
+        changed = await run_in_threadpool(run_daily_overdue_reset)
+    except Exception as err:  # keep the loop alive for tomorrow
+        log_scheduled_job(OVERDUE_RESET_JOB, "ERROR", error=str(err))
+        return
+    if changed is not None:
+        log_scheduled_job(OVERDUE_RESET_JOB, "INFO", tasks_changed=changed)
@@ -1,28 +1,52 @@
-from typing import List, Optional
-
-from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status
-from sqlalchemy import and_, func, or_
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+from fastapi import (
+    APIRouter,
+    Cookie,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session, joinedload
 
 from api.schemas import (
+    TaskBatchUpdate,
+    TaskChangesOut,
     TaskCommentCreate,
     TaskCommentOut,
     TaskCommentUpdate,
     TaskCreate,
+    TaskMove,
     TaskOut,
     TaskSegmentCreate,
     TaskSegmentOut,
     TaskSegmentUpdate,
+    TaskTagCountOut,
     TaskUpdate,
 )
-from app.modules.tasks.application.use_cases import apply_task_update, cascade_task_parents_for_inprogress
-from app.modules.tasks.domain.constants import TASK_PRIORITIES, TASK_STATUSES
+from app.modules.tasks.application.use_cases import (
+    apply_task_update,
+    refresh_ancestors_batch,
+    refresh_task_ancestors,
+)
+from app.modules.tasks.domain.constants import TASK_PRIORITIES, TASK_STATUSES, TASK_TAG_MAX_LENGTH
 from app.modules.tasks.domain.hierarchy import same_optional_int
+from app.modules.tasks.domain.ordering import order_between
+from app.modules.tasks.domain.rules import parse_task_tags
 from app.modules.tasks.infrastructure.repository import SqlAlchemyTaskRepository
-from app.shared.domain.text import clean_label, normalize_text
-from app.shared.interface.dependencies import require_task_write_access, require_user
-from data.db import get_db
-from data.models import Celula, Persona, Sprint, Task, TaskComment, TaskSegment, now_py
+from app.modules.tasks.interface.feed import task_change_feed, task_feed_hub
+from app.shared.domain.text import clean_label, label_key, normalize_text
+from app.shared.interface.dependencies import get_user_from_token, require_task_write_access, require_user
+from app.shared.interface.pagination import PageParams, fast_page, page_params
+from config.settings import settings
+from data.db import get_db, run_ws_db
+from data.models import Celula, Persona, Sprint, Task, TaskComment, TaskSegment, TaskTag, now_py, task_tag_links
 
 router = APIRouter()
 
@@ -60,23 +84,99 @@ def _upsert_task_segment_name(db: Session, usuario_id: int, nombre: str) -> str:
     db.flush()
     return row.nombre
 
+def _task_list_criteria(
+    celula_id: Optional[int],
+    sprint_id: Optional[int],
+    estado: Optional[str],
+    etiquetas: Optional[List[str]],
+) -> list:
+    criteria = []
+    if celula_id is not None:
+        criteria.append(Task.celula_id == celula_id)
+    if sprint_id is not None:
+        criteria.append(Task.sprint_id == sprint_id)
+    if estado is not None:
+        criteria.append(Task.estado == estado)
+    # Every requested tag must be present (board filters narrow down).
+    for key in dict.fromkeys(filter(None, (label_key(tag) for tag in etiquetas or []))):
+        criteria.append(
+            Task.id.in_(
+                select(task_tag_links.c.task_id)
+                .join(TaskTag, TaskTag.id == task_tag_links.c.tag_id)
+                .where(TaskTag.nombre_key == key)
+            )
+        )
+    return criteria
+
+
+def _validated_etiquetas(value: Optional[str]) -> Optional[str]:
+    etiquetas = (value or "").strip() or None
+    if etiquetas and len(etiquetas) > 2000:
+        raise HTTPException(status_code=400, detail="Etiquetas demasiado largas")
+    if any(len(nombre) > TASK_TAG_MAX_LENGTH for nombre in parse_task_tags(etiquetas).values()):
+        raise HTTPException(status_code=400, detail="Etiqueta demasiado larga")
+    return etiquetas
+
+
 @router.get("/tasks", response_model=List[TaskOut])
 def listar_tasks(
     celula_id: Optional[int] = None,
     sprint_id: Optional[int] = None,
     estado: Optional[str] = None,
+    etiqueta: Optional[List[str]] = Query(default=None),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     scrum_session: Optional[str] = Cookie(default=None),
 ):
     require_user(db, scrum_session)
-    q = db.query(Task)
-    if celula_id is not None:
-        q = q.filter(Task.celula_id == celula_id)
-    if sprint_id is not None:
-        q = q.filter(Task.sprint_id == sprint_id)
-    if estado is not None:
-        q = q.filter(Task.estado == estado)
-    return q.order_by(Task.orden.asc(), Task.actualizado_en.desc(), Task.id.desc()).all()
+    q = db.query(Task).filter(*_task_list_criteria(celula_id, sprint_id, estado, etiqueta))
+    q = q.order_by(Task.orden.asc(), Task.actualizado_en.desc(), Task.id.desc())
+    return fast_page(q, Task, page, TaskOut)
+
+
+@router.get("/tasks/tags", response_model=List[TaskTagCountOut])
+def listar_task_tags(
+    celula_id: Optional[int] = None,
+    sprint_id: Optional[int] = None,
+    estado: Optional[str] = None,
+    etiqueta: Optional[List[str]] = Query(default=None),
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    counts = SqlAlchemyTaskRepository(db).tag_counts(_task_list_criteria(celula_id, sprint_id, estado, etiqueta))
+    return [TaskTagCountOut(nombre=nombre, total=total) for nombre, total in counts]
+
+
+@router.get("/tasks/changes", response_model=TaskChangesOut)
+def listar_task_changes(
+    since: Optional[int] = Query(default=None, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1),
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    """Tasks changed after cursor ``since`` (latest state per task), so
+    boards apply deltas instead of reloading ``/tasks``."""
+    require_user(db, scrum_session)
+    size = min(limit or settings.list_page_size_default, settings.list_page_size_max)
+    return task_change_feed(db, since, size)
+
+
+@router.websocket("/ws/tasks")
+async def tasks_ws(websocket: WebSocket) -> None:
+    token = websocket.cookies.get("scrum_session")
+    if await run_ws_db(lambda db: get_user_from_token(db, token)) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await task_feed_hub.connect(websocket)
+    try:
+        while True:
+            # Only keep-alive pings are expected from clients.
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        task_feed_hub.disconnect(websocket)
 
 
 @router.post("/tasks", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
@@ -115,9 +215,7 @@ def crear_task(
     tipo = (payload.tipo or "").strip() or None
     if tipo and len(tipo) > 30:
         raise HTTPException(status_code=400, detail="Tipo demasiado largo")
-    etiquetas = (payload.etiquetas or "").strip() or None
-    if etiquetas and len(etiquetas) > 2000:
-        raise HTTPException(status_code=400, detail="Etiquetas demasiado largas")
+    etiquetas = _validated_etiquetas(payload.etiquetas)
     orden = payload.orden if payload.orden is not None else now_py().timestamp()
     task = Task(
         titulo=titulo,
@@ -134,6 +232,7 @@ def crear_task(
         end_date=payload.end_date,
         fecha_vencimiento=payload.fecha_vencimiento,
         segmento=segmento,
+        segmento_key=label_key(segmento),
         tipo=tipo,
         etiquetas=etiquetas,
         puntos=payload.puntos,
@@ -142,6 +241,13 @@ def crear_task(
         orden=float(orden),
     )
     db.add(task)
+    db.flush()
+    repo = SqlAlchemyTaskRepository(db)
+    repo.add_to_hierarchy(task)
+    if task.etiquetas:
+        repo.sync_tags(int(task.id), task.etiquetas)
+    refresh_task_ancestors(repo, task.parent_id, task)
+    repo.log_changes([task.id])
     db.commit()
     db.refresh(task)
     return task
@@ -215,10 +321,7 @@ def actualizar_task_segment(
     segment.nombre = new_name
     segment.nombre_key = new_key
     if old_key != new_key:
-        user_tasks = db.query(Task).filter(Task.creado_por_usuario_id == user.id).all()
-        for task in user_tasks:
-            if normalize_text(clean_label(task.segmento or "")) == old_key:
-                task.segmento = new_name
+        SqlAlchemyTaskRepository(db).set_segment(user.id, old_key, new_name)
     db.commit()
     db.refresh(segment)
     return segment
@@ -238,11 +341,7 @@ def eliminar_task_segment(
     )
     if not segment:
         raise HTTPException(status_code=404, detail="Segmento no encontrado")
-    segment_key = normalize_text(clean_label(segment.nombre))
-    user_tasks = db.query(Task).filter(Task.creado_por_usuario_id == user.id).all()
-    for task in user_tasks:
-        if normalize_text(clean_label(task.segmento or "")) == segment_key:
-            task.segmento = None
+    SqlAlchemyTaskRepository(db).set_segment(user.id, label_key(segment.nombre), None)
     db.delete(segment)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -254,57 +353,57 @@ def actualizar_tareas_vencidas_a_hoy(
     scrum_session: Optional[str] = Cookie(default=None),
 ):
     user = require_user(db, scrum_session)
-    business_today = now_py().date()
-    query = db.query(Task).filter(
-        ~Task.estado.in_({"done", "archived"}),
-        or_(
-            Task.estado == "doing",
-            and_(Task.fecha_vencimiento.isnot(None), Task.fecha_vencimiento < business_today),
-        ),
-    )
-    if user.rol != "admin":
-        query = query.filter(Task.creado_por_usuario_id == user.id)
-    tasks = query.order_by(Task.parent_id.desc(), Task.id.desc()).all()
-
-    # This daily reset must be atomic. Cascading every individual update can
-    # otherwise reapply "doing" to a parent before its overdue children reset.
-    for task in tasks:
-        if task.fecha_vencimiento and task.fecha_vencimiento < business_today:
-            task.fecha_vencimiento = business_today
-        if task.estado == "doing":
-            task.estado = "todo"
-            task.end_date = None
-
+    owner_id = None if user.rol == "admin" else user.id
+    # One transaction, so a parent is never left "doing" over reset children.
+    rows = SqlAlchemyTaskRepository(db).reset_overdue(now_py().date(), owner_id)
     db.commit()
-    for task in tasks:
-        db.refresh(task)
-    return tasks
-
+    return [TaskOut.model_validate(row) for row in rows]
+
+
+@dataclass
+class _TaskRefs:
+    """Entities referenced by a set of updates, loaded with one query per type."""
+
+    celula_ids: set[int]
+    sprint_ids: set[int]
+    persona_ids: set[int]
+    tasks: dict[int, Task]
+    segments: dict[str, str] = field(default_factory=dict)
+
+
+def _load_task_refs(db: Session, payloads: List[TaskUpdate], task_ids: Iterable[int] = ()) -> _TaskRefs:
+    def existing(model, ids: set[int]) -> set[int]:
+        if not ids:
+            return set()
+        return {row[0] for row in db.query(model.id).filter(model.id.in_(ids)).all()}
+
+    parent_ids = {int(item.parent_id) for item in payloads if item.parent_id is not None}
+    wanted = parent_ids | {int(task_id) for task_id in task_ids}
+    tasks = {int(task.id): task for task in db.query(Task).filter(Task.id.in_(wanted)).all()} if wanted else {}
+    return _TaskRefs(
+        celula_ids=existing(Celula, {item.celula_id for item in payloads if item.celula_id}),
+        sprint_ids=existing(Sprint, {item.sprint_id for item in payloads if item.sprint_id}),
+        persona_ids=existing(Persona, {item.assignee_persona_id for item in payloads if item.assignee_persona_id}),
+        tasks=tasks,
+    )
 
-@router.put("/tasks/{task_id}", response_model=TaskOut)
-def actualizar_task(
-    task_id: int,
-    payload: TaskUpdate,
-    db: Session = Depends(get_db),
-    scrum_session: Optional[str] = Cookie(default=None),
-):
-    user = require_user(db, scrum_session)
-    task = db.get(Task, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task no encontrada")
-    require_task_write_access(user, task)
 
+def _fields_set(payload: TaskUpdate) -> set[str]:
     fields_set = getattr(payload, "model_fields_set", None)
     if fields_set is None:
         fields_set = getattr(payload, "__fields_set__", set())
+    return set(fields_set) - {"id"}
+
 
+def _validate_task_update(
+    db: Session, user, task: Task, payload: TaskUpdate, fields_set: set[str], refs: _TaskRefs
+) -> None:
+    """Normalize ``payload`` in place and reject invalid values or references."""
     if payload.titulo is not None:
         titulo = (payload.titulo or "").strip()
         if not titulo:
             raise HTTPException(status_code=400, detail="Titulo requerido")
         payload.titulo = titulo
-    if payload.descripcion is not None:
-        pass
     if "release_issue_key" in fields_set:
         payload.release_issue_key = _normalize_release_issue_key(payload.release_issue_key)
     if payload.estado is not None:
@@ -322,7 +421,9 @@ def actualizar_task(
         if segmento and len(segmento) > 80:
             raise HTTPException(status_code=400, detail="Segmento demasiado largo")
         if segmento:
-            segmento = _upsert_task_segment_name(db, user.id, segmento)
+            if segmento not in refs.segments:
+                refs.segments[segmento] = _upsert_task_segment_name(db, user.id, segmento)
+            segmento = refs.segments[segmento]
         payload.segmento = segmento
     if payload.tipo is not None:
         tipo = (payload.tipo or "").strip() or None
@@ -330,24 +431,21 @@ def actualizar_task(
             raise HTTPException(status_code=400, detail="Tipo demasiado largo")
         payload.tipo = tipo
     if payload.etiquetas is not None:
-        etiquetas = (payload.etiquetas or "").strip() or None
-        if etiquetas and len(etiquetas) > 2000:
-            raise HTTPException(status_code=400, detail="Etiquetas demasiado largas")
-        payload.etiquetas = etiquetas
+        payload.etiquetas = _validated_etiquetas(payload.etiquetas)
     if "celula_id" in fields_set:
-        if payload.celula_id and not db.get(Celula, payload.celula_id):
+        if payload.celula_id and payload.celula_id not in refs.celula_ids:
             raise HTTPException(status_code=404, detail="Celula no encontrada")
     if payload.sprint_id is not None:
-        if payload.sprint_id and not db.get(Sprint, payload.sprint_id):
+        if payload.sprint_id and payload.sprint_id not in refs.sprint_ids:
             raise HTTPException(status_code=404, detail="Sprint no encontrado")
     if payload.assignee_persona_id is not None:
-        if payload.assignee_persona_id and not db.get(Persona, payload.assignee_persona_id):
+        if payload.assignee_persona_id and payload.assignee_persona_id not in refs.persona_ids:
             raise HTTPException(status_code=404, detail="Persona no encontrada")
     if "parent_id" in fields_set:
         if payload.parent_id == task.id:
             raise HTTPException(status_code=400, detail="Task padre invalido")
         if payload.parent_id is not None:
-            parent = db.get(Task, payload.parent_id)
+            parent = refs.tasks.get(int(payload.parent_id))
             if not parent:
                 raise HTTPException(status_code=404, detail="Task padre no encontrado")
             if _would_create_parent_cycle(db, int(task.id), int(payload.parent_id)):
@@ -357,21 +455,144 @@ def actualizar_task(
     next_parent_id = payload.parent_id if "parent_id" in fields_set else task.parent_id
     if ("celula_id" in fields_set or "parent_id" in fields_set) and next_parent_id is not None:
         next_celula_id = payload.celula_id if "celula_id" in fields_set else task.celula_id
-        parent = db.get(Task, next_parent_id)
+        parent = refs.tasks.get(int(next_parent_id)) or db.get(Task, next_parent_id)
         if parent and not _same_optional_int(next_celula_id, parent.celula_id):
             raise HTTPException(status_code=400, detail="La subtarea debe pertenecer a la misma celula del padre")
 
+
+@router.put("/tasks/{task_id}", response_model=TaskOut)
+def actualizar_task(
+    task_id: int,
+    payload: TaskUpdate,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    user = require_user(db, scrum_session)
+    task = db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task no encontrada")
+    require_task_write_access(user, task)
+
+    fields_set = _fields_set(payload)
+    _validate_task_update(db, user, task, payload, fields_set, _load_task_refs(db, [payload]))
+
+    prev_parent_id = task.parent_id
     result = apply_task_update(task, payload, fields_set, now_py().date())
 
-    # Cascade: propagate earliest start_date + in-progress status to all ancestors.
-    if result.prev_status != task.estado or result.prev_start_date != getattr(task, "start_date", None):
-        cascade_task_parents_for_inprogress(SqlAlchemyTaskRepository(db), task)
+    repo = SqlAlchemyTaskRepository(db)
+    if "etiquetas" in fields_set:
+        repo.sync_tags(int(task.id), task.etiquetas)
+    if not _same_optional_int(prev_parent_id, task.parent_id):
+        repo.move_subtree(int(task.id), task.parent_id)
+        refresh_task_ancestors(repo, prev_parent_id)
+    # Cascade: refresh roll-ups up the chain; a status/start change also
+    # propagates earliest start_date + in-progress status to all ancestors.
+    propagate_status = (
+        result.prev_status != task.estado or result.prev_start_date != getattr(task, "start_date", None)
+    )
+    refresh_task_ancestors(repo, task.parent_id, task, propagate_status=propagate_status)
+    repo.log_changes([task.id])
 
     db.commit()
     db.refresh(task)
     return task
 
 
+@router.patch("/tasks:batch", response_model=List[TaskOut])
+def actualizar_tasks_batch(
+    payload: TaskBatchUpdate,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    """Apply many task updates (board drag-and-drop, multi-select edits) in
+    one transaction: all of them or none."""
+    user = require_user(db, scrum_session)
+    task_ids = [item.id for item in payload.items]
+    if len(set(task_ids)) != len(task_ids):
+        raise HTTPException(status_code=400, detail="Task repetida en el lote")
+    refs = _load_task_refs(db, payload.items, task_ids)
+    for task_id in task_ids:
+        task = refs.tasks.get(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task no encontrada")
+        require_task_write_access(user, task)
+
+    repo = SqlAlchemyTaskRepository(db)
+    business_today = now_py().date()
+    parent_ids: set[int] = set()
+    propagate_parent_ids: set[int] = set()
+    for item in payload.items:
+        task = refs.tasks[item.id]
+        fields_set = _fields_set(item)
+        _validate_task_update(db, user, task, item, fields_set, refs)
+        prev_parent_id = task.parent_id
+        result = apply_task_update(task, item, fields_set, business_today)
+        if "etiquetas" in fields_set:
+            repo.sync_tags(int(task.id), task.etiquetas)
+        if not _same_optional_int(prev_parent_id, task.parent_id):
+            # Later items' cycle checks read parent_id from the database.
+            db.flush()
+            repo.move_subtree(int(task.id), task.parent_id)
+            if prev_parent_id:
+                parent_ids.add(int(prev_parent_id))
+        if task.parent_id:
+            parent_ids.add(int(task.parent_id))
+            if result.prev_status != task.estado or result.prev_start_date != getattr(task, "start_date", None):
+                propagate_parent_ids.add(int(task.parent_id))
+    # One consolidated cascade pass for every touched chain.
+    refresh_ancestors_batch(repo, parent_ids, propagate_parent_ids)
+    repo.log_changes(task_ids)
+
+    db.commit()
+    by_id = {int(task.id): task for task in db.query(Task).filter(Task.id.in_(task_ids)).all()}
+    return [by_id[task_id] for task_id in task_ids]
+
+
+@router.post("/tasks/{task_id}/move", response_model=TaskOut)
+def mover_task(
+    task_id: int,
+    payload: TaskMove,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    """Place a card between two neighbours by writing only its own ``orden``."""
+    user = require_user(db, scrum_session)
+    task = db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task no encontrada")
+    require_task_write_access(user, task)
+    neighbor_ids = {item for item in (payload.before_id, payload.after_id) if item is not None}
+    if task_id in neighbor_ids:
+        raise HTTPException(status_code=400, detail="Task vecina invalida")
+    neighbors = {int(item.id): item for item in db.query(Task).filter(Task.id.in_(neighbor_ids)).all()}
+    if len(neighbors) != len(neighbor_ids):
+        raise HTTPException(status_code=404, detail="Task vecina no encontrada")
+    # Only ``orden`` changes: both neighbours must share the card's column.
+    column = (task.celula_id, task.estado)
+    if any((item.celula_id, item.estado) != column for item in neighbors.values()):
+        raise HTTPException(status_code=409, detail="La task vecina esta en otra columna")
+    before = neighbors.get(payload.before_id)
+    after = neighbors.get(payload.after_id)
+
+    def neighbor_orders():
+        return (before.orden if before else None, after.orden if after else None)
+
+    repo = SqlAlchemyTaskRepository(db)
+    orden = order_between(*neighbor_orders())
+    if orden is None:
+        # Out of room between these two: respace the card's column now (rare;
+        # the background job normally gets there first) and retry.
+        repo.rebalance_column(*column)
+        orden = order_between(*neighbor_orders())
+        if orden is None:
+            raise HTTPException(status_code=409, detail="No se pudo ubicar la task entre sus vecinas")
+    task.orden = orden
+    repo.log_changes([task.id])
+    db.commit()
+    db.refresh(task)
+    return task
+
+
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def eliminar_task(
     task_id: int,
@@ -383,11 +604,27 @@ def eliminar_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task no encontrada")
     require_task_write_access(user, task)
-    db.delete(task)
+    parent_id = task.parent_id
+    repo = SqlAlchemyTaskRepository(db)
+    repo.delete_subtree(int(task.id))
+    refresh_task_ancestors(repo, parent_id)
     db.commit()
     return None
 
 
+@router.get("/tasks/{task_id}/path", response_model=List[TaskOut])
+def obtener_task_path(
+    task_id: int,
+    db: Session = Depends(get_db),
+    scrum_session: Optional[str] = Cookie(default=None),
+):
+    require_user(db, scrum_session)
+    path = SqlAlchemyTaskRepository(db).ancestor_path(task_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Task no encontrada")
+    return path
+
+
 @router.get("/tasks/{task_id}/comments", response_model=List[TaskCommentOut])
 def listar_task_comments(
     task_id: int,
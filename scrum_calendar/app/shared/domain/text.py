@@ -1,5 +1,6 @@
 import re
 import unicodedata
+from typing import Optional
 
 
 def normalize_text(value: str) -> str:
@@ -12,3 +13,7 @@ def normalize_text(value: str) -> str:
 def clean_label(value: str) -> str:
     return re.sub(r"\s+", " ", (value or "").strip())
 
+
+def label_key(value: Optional[str]) -> Optional[str]:
+    """Lookup key for a free-text label (segments): None when blank."""
+    return normalize_text(clean_label(value or "")) or None
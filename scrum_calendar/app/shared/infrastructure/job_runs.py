@@ -0,0 +1,28 @@
+from datetime import date
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from data.models import JobRun, now_py
+
+
+def claim_daily_run(db: Session, name: str, business_day: date) -> bool:
+    """Mark job ``name`` as run for ``business_day`` inside the caller's
+    transaction. Only one worker (or cron run) wins per day; the others get
+    False."""
+    upsert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    inserted = db.execute(
+        upsert(JobRun)
+        .values(job=name, ultimo_dia=business_day, ejecutado_en=now_py())
+        .on_conflict_do_nothing(index_elements=["job"])
+    )
+    if inserted.rowcount:
+        return True
+    result = db.execute(
+        update(JobRun)
+        .where(JobRun.job == name, JobRun.ultimo_dia < business_day)
+        .values(ultimo_dia=business_day, ejecutado_en=now_py())
+    )
+    return bool(result.rowcount)
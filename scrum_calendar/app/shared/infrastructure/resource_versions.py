@@ -0,0 +1,45 @@
+from typing import Iterable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from data.models import ResourceVersion, now_py
+
+# Reference data the UI re-fetches on every page; writers bump these so GETs
+# can answer conditionally from a single-row lookup.
+CATALOG_RESOURCES = ("celulas", "personas", "sprints", "feriados", "eventos_tipo", "quarters")
+
+
+def ensure_versions(db: Session, names: Iterable[str] = CATALOG_RESOURCES) -> None:
+    existing = {row[0] for row in db.query(ResourceVersion.nombre).all()}
+    for name in names:
+        if name not in existing:
+            db.add(ResourceVersion(nombre=name, version=1))
+
+
+def bump_versions(db: Session, *names: str) -> None:
+    """Increment the version of ``names`` inside the caller's transaction."""
+    for name in dict.fromkeys(names):
+        result = db.execute(
+            update(ResourceVersion)
+            .where(ResourceVersion.nombre == name)
+            .values(version=ResourceVersion.version + 1, actualizado_en=now_py())
+        )
+        if not result.rowcount:
+            db.add(ResourceVersion(nombre=name, version=2))
+
+
+def get_version_tag(db: Session, name: str) -> str:
+    """Opaque tag for ``name``; includes the bump time so a recreated
+    database never reuses a tag from a previous one."""
+    row = (
+        db.query(ResourceVersion.version, ResourceVersion.actualizado_en)
+        .filter(ResourceVersion.nombre == name)
+        .first()
+    )
+    if row is None:
+        return "0"
+    version, actualizado_en = row
+    stamp = int(actualizado_en.timestamp() * 1_000_000) if actualizado_en else 0
+    return f"{version}.{stamp:x}"
+
@@ -0,0 +1,87 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.shared.infrastructure.resource_versions import get_version_tag
+from config.settings import settings
+
+_CACHE_LIMIT = 256
+_cache: "OrderedDict[tuple, tuple[bytes, dict]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_adapters: dict = {}
+
+
+def _cache_control() -> str:
+    max_age = max(0, int(settings.catalog_cache_max_age_seconds or 0))
+    if max_age:
+        return f"private, max-age={max_age}"
+    return "private, no-cache"
+
+
+def _variant(request: Request) -> str:
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    if not query:
+        return "all"
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = {value.strip() for value in header.split(",") if value.strip()}
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+def _render(schema, result: Any) -> tuple[bytes, dict]:
+    if isinstance(result, Response):
+        headers = {key: value for key, value in result.headers.items() if key.lower().startswith("x-")}
+        return bytes(result.body), headers
+    adapter = _adapters.get(schema)
+    if adapter is None:
+        adapter = _adapters[schema] = TypeAdapter(List[schema])
+    return adapter.dump_json(adapter.validate_python(result, from_attributes=True)), {}
+
+
+def clear_catalog_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def conditional_list(
+    request: Request,
+    db: Session,
+    resource: str,
+    schema,
+    load: Callable[[], Any],
+) -> Response:
+    """Serve a catalog list with ETag/If-None-Match.
+
+    The ETag is derived from the resource version tag and the query string,
+    so a 304 costs one single-row lookup and no list query. With
+    ``catalog_cache_enabled`` the rendered body is shared across requests
+    until the version moves.
+    """
+    version = get_version_tag(db, resource)
+    variant = _variant(request)
+    etag = f'W/"{resource}-{version}-{variant}"'
+    headers = {"ETag": etag, "Cache-Control": _cache_control()}
+    if _etag_matches(request.headers.get("if-none-match") or "", etag):
+        return Response(status_code=304, headers=headers)
+
+    key = (resource, version, variant)
+    cached = None
+    if settings.catalog_cache_enabled:
+        with _cache_lock:
+            cached = _cache.get(key)
+    if cached is None:
+        cached = _render(schema, load())
+        if settings.catalog_cache_enabled:
+            with _cache_lock:
+                _cache[key] = cached
+                while len(_cache) > _CACHE_LIMIT:
+                    _cache.popitem(last=False)
+    body, extra_headers = cached
+    return Response(content=body, media_type="application/json", headers={**extra_headers, **headers})
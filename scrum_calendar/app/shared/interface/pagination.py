@@ -0,0 +1,150 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy import and_, or_
+
+from app.shared.interface.responses import FastJSONResponse
+from config.settings import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    fields: tuple[str, ...] = ()
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+    @property
+    def size(self) -> int:
+        return min(self.limit or settings.list_page_size_default, settings.list_page_size_max)
+
+
+def page_params(
+    limit: Optional[int] = Query(default=None, ge=1),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> PageParams:
+    selected = tuple(dict.fromkeys(name.strip() for name in (fields or "").split(",") if name.strip()))
+    return PageParams(limit=limit, cursor=(cursor or "").strip() or None, fields=selected)
+
+
+def encode_cursor(creado_en: Optional[datetime], item_id: int) -> str:
+    raw = json.dumps([creado_en.isoformat() if creado_en else None, int(item_id)])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        creado_en, item_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(creado_en) if creado_en else None, int(item_id))
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Cursor invalido")
+
+
+def _keyset_columns(model) -> tuple:
+    creado_en = getattr(model, "creado_en", None)
+    return (creado_en, model.id) if creado_en is not None else (model.id,)
+
+
+def _validate_fields(page: PageParams, schema) -> None:
+    allowed = set(schema.model_fields)
+    unknown = [name for name in page.fields if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Campo invalido: {', '.join(unknown)}")
+
+
+def _page_response(rows: list[dict], next_cursor: Optional[str]) -> FastJSONResponse:
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(content=rows, headers=headers)
+
+
+def _column_rows(query, model, names: list[str]) -> list[dict]:
+    # Core select of plain columns: no ORM identity map, no relationship loads.
+    statement = query.with_entities(*[getattr(model, name) for name in names]).statement
+    return [dict(zip(names, row)) for row in query.session.execute(statement)]
+
+
+def _projected_page(query, model, page: PageParams, names: list[str]) -> FastJSONResponse:
+    columns = model.__table__.columns
+    missing = [name for name in names if name not in columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Campo invalido: {', '.join(missing)}")
+    if page.paginated:
+        query = apply_keyset(query, model, page)
+    extra = [column.key for column in _keyset_columns(model) if column.key not in names] if page.paginated else []
+    rows, next_cursor = split_page(_column_rows(query, model, [*names, *extra]), page)
+    for row in rows:
+        for name in extra:
+            row.pop(name, None)
+    return _page_response(rows, next_cursor)
+
+
+def apply_keyset(query, model, page: PageParams):
+    """Order by (creado_en, id) descending, resume after ``page.cursor`` and
+    fetch one extra row to know whether a next page exists."""
+    keys = _keyset_columns(model)
+    query = query.order_by(None).order_by(*[column.desc() for column in keys])
+    if page.cursor:
+        creado_en, item_id = decode_cursor(page.cursor)
+        if len(keys) == 1:
+            query = query.filter(model.id < item_id)
+        elif creado_en is None:
+            # creado_en is NOT NULL, so a cursor from this model always has it.
+            raise HTTPException(status_code=400, detail="Cursor invalido")
+        else:
+            query = query.filter(or_(keys[0] < creado_en, and_(keys[0] == creado_en, model.id < item_id)))
+    return query.limit(page.size + 1)
+
+
+def split_page(items: list, page: PageParams) -> tuple[list, Optional[str]]:
+    if not page.paginated or len(items) <= page.size:
+        return items, None
+    items = items[: page.size]
+    last = items[-1]
+    if isinstance(last, dict):
+        return items, encode_cursor(last.get("creado_en"), last["id"])
+    return items, encode_cursor(getattr(last, "creado_en", None), last.id)
+
+
+def keyset_page(query, model, page: PageParams, schema) -> Any:
+    """Apply keyset pagination and ``fields=`` projection to a list query.
+
+    Without page params the query runs untouched so existing callers keep the
+    full list. Models without ``creado_en`` page by ``id``.
+    """
+    if not page.paginated and not page.fields:
+        return query.all()
+    if page.fields:
+        _validate_fields(page, schema)
+        return _projected_page(query, model, page, list(page.fields))
+    items, next_cursor = split_page(apply_keyset(query, model, page).all(), page)
+    return _page_response([schema.model_validate(item).model_dump() for item in items], next_cursor)
+
+
+def fast_page(query, model, page: PageParams, schema) -> FastJSONResponse:
+    """Read path for hot lists: selects only the ``schema`` columns into
+    dicts and skips per-row model validation. Every ``schema`` field must be
+    a column of ``model``."""
+    if page.fields:
+        _validate_fields(page, schema)
+    return _projected_page(query, model, page, list(page.fields or schema.model_fields))
+
+
+def page_dicts(rows: list[dict], page: PageParams, schema, next_cursor: Optional[str] = None) -> Any:
+    """Projection for endpoints that build their rows by hand."""
+    if page.fields:
+        _validate_fields(page, schema)
+        rows = [{name: row.get(name) for name in page.fields} for row in rows]
+    if page.fields or next_cursor:
+        return _page_response(rows, next_cursor)
+    return rows
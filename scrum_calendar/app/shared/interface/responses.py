@@ -0,0 +1,33 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for plain dict/list payloads (no Pydantic pass).
+
+    Uses orjson when installed; dates and datetimes are rendered as ISO
+    strings either way, matching the response_model output.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,164 @@
+import hashlib
+import os
+import re
+from mimetypes import guess_type
+from typing import Optional
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+from config.settings import settings
+
+STATIC_EXTENSIONS = (
+    ".css",
+    ".js",
+    ".map",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".svg",
+    ".ico",
+    ".gif",
+    ".webp",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".eot",
+)
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".map", ".svg", ".json", ".ttf", ".eot")
+# Preference order when the client accepts several encodings.
+PRECOMPRESSED_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+HTML_NO_STORE = "no-store"
+REVALIDATE = "no-cache"
+
+_ASSET_REF = re.compile(r'(\b(?:src|href)=")([^"]+)(")')
+
+
+def _accepted_encodings(headers: Headers) -> set[str]:
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+    return accepted
+
+
+class UIStaticFiles(StaticFiles):
+    """``/ui`` mount with real HTTP caching.
+
+    HTML is served ``no-store`` with every local asset reference rewritten to
+    ``?v=<content hash>``; assets requested with their current hash are
+    ``immutable`` and anything else revalidates through ETag. Precompressed
+    ``.br``/``.gz`` siblings (``scripts.build_ui_assets``) are served when the
+    client accepts them and they are not older than the source file.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+
+    def content_hash(self, full_path: str, stat_result: Optional[os.stat_result] = None) -> str:
+        stat_result = stat_result or os.stat(full_path)
+        cached = self._hashes.get(full_path)
+        if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(full_path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(65536), b""):
+                digest.update(chunk)
+        value = digest.hexdigest()[:12]
+        self._hashes[full_path] = (stat_result.st_mtime_ns, stat_result.st_size, value)
+        return value
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        if full_path.endswith((".html", ".htm")):
+            return self._html_response(full_path, status_code)
+        request_headers = Headers(scope=scope)
+        response = self._asset_response(full_path, stat_result, request_headers, status_code)
+        requested = QueryParams(scope.get("query_string", b"")).get("v")
+        if requested and requested == self.content_hash(full_path, stat_result):
+            response.headers["Cache-Control"] = (
+                f"public, max-age={settings.ui_asset_max_age_seconds}, immutable"
+            )
+        else:
+            response.headers["Cache-Control"] = REVALIDATE
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _asset_response(self, full_path: str, stat_result, request_headers: Headers, status_code: int):
+        if not full_path.endswith(COMPRESSIBLE_EXTENSIONS):
+            return FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        accepted = _accepted_encodings(request_headers)
+        media_type = guess_type(full_path)[0] or "text/plain"
+        for encoding, suffix in PRECOMPRESSED_VARIANTS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if variant_stat.st_mtime < stat_result.st_mtime:
+                continue
+            response = FileResponse(
+                full_path + suffix,
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=media_type,
+            )
+            response.headers["Content-Encoding"] = encoding
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, media_type=media_type)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def _html_response(self, full_path: str, status_code: int) -> Response:
+        with open(full_path, "r", encoding="utf-8") as handle:
+            html = handle.read()
+        base_dir = os.path.dirname(full_path)
+        html = _ASSET_REF.sub(lambda match: self._versioned_ref(match, base_dir), html)
+        return Response(
+            html,
+            status_code=status_code,
+            media_type="text/html",
+            headers={"Cache-Control": HTML_NO_STORE},
+        )
+
+    def _versioned_ref(self, match: re.Match, base_dir: str) -> str:
+        prefix, value, suffix = match.groups()
+        if value.startswith(("#", "//", "data:")) or ":" in value.split("?", 1)[0]:
+            return match.group(0)
+        ref, _, fragment = value.partition("#")
+        ref_path, _, query = ref.partition("?")
+        if not ref_path.endswith(STATIC_EXTENSIONS):
+            return match.group(0)
+        if ref_path.startswith("/ui/"):
+            candidate = self.lookup_path(ref_path[len("/ui/"):])
+        elif ref_path.startswith("/"):
+            return match.group(0)
+        else:
+            root = os.path.realpath(str(self.directory))
+            resolved = os.path.realpath(os.path.join(base_dir, ref_path))
+            if os.path.commonpath([resolved, root]) != root:
+                return match.group(0)
+            candidate = self.lookup_path(os.path.relpath(resolved, root))
+        full_path, stat_result = candidate
+        if stat_result is None:
+            return match.group(0)
+        params = [pair for pair in query.split("&") if pair and not pair.startswith("v=")]
+        params.append(f"v={self.content_hash(full_path, stat_result)}")
+        rewritten = f"{ref_path}?{'&'.join(params)}" + (f"#{fragment}" if fragment else "")
+        return f"{prefix}{rewritten}{suffix}"
@@ -6,6 +6,20 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     # Keep non-sensitive default in code; real credentials must come from env.
     database_url: str = "postgresql+psycopg2://localhost:5432/scrum_calendar"
+    # Connection pool; SQLite keeps SQLAlchemy's own pool and only honours pre-ping.
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: int = 30
+    # Recycle before server/proxy idle timeouts; with it set, pre-ping can often be off.
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # Worker threads (and so pooled connections) WebSocket persistence may hold at once.
+    ws_db_workers: int = 4
+    # Hot read paths use the asyncio driver (asyncpg) when it is installed. Its
+    # pool is separate from the sync one, so it is sized on its own.
+    async_db_enabled: bool = True
+    async_db_pool_size: int = 5
+    async_db_max_overflow: int = 5
     app_env: str = "development"
     cors_origins_raw: str = "http://localhost:8000"
     cors_allow_credentials: bool = False
@@ -16,7 +30,35 @@ class Settings(BaseSettings):
     login_rate_limit_max_attempts: int = 8
     login_rate_limit_window_seconds: int = 900
     login_rate_limit_block_seconds: int = 900
+    # "memory" (per process) or "database" (shared by every worker).
+    login_rate_limit_backend: str = "memory"
+    # Maintain the task_closure table so subtree/ancestor queries are one indexed lookup.
+    task_closure_enabled: bool = False
+    # Company-wide overdue-to-today reset once per business day (America/Asuncion
+    # time, HH:MM). Off by default; scripts/reset_overdue_tasks.py serves cron.
+    overdue_reset_job_enabled: bool = False
+    overdue_reset_job_time: str = "05:30"
+    # How often each worker respaces board columns whose cards got too close (0 = off).
+    task_order_rebalance_interval_seconds: int = 300
+    # Task change feed (GET /tasks/changes, /ws/tasks): hours of history kept and
+    # how often each worker polls it for connected WebSocket clients (0 hours = keep all).
+    task_changes_retention_hours: int = 72
+    task_changes_poll_seconds: float = 1.0
     security_audit_log_enabled: bool = True
+    list_page_size_default: int = 200
+    list_page_size_max: int = 1000
+    catalog_cache_enabled: bool = True
+    catalog_cache_max_age_seconds: int = 0
+    ui_asset_max_age_seconds: int = 31_536_000
+    # Signed /ui routing hint; set a shared secret when running several workers.
+    ui_hint_enabled: bool = True
+    ui_hint_secret: str = ""
+    ui_hint_ttl_seconds: int = 300
+    metrics_enabled: bool = True
+    slow_request_ms: int = 500
+    slow_request_top_queries: int = 5
+    # Outside production, flag requests repeating one statement this often (0 disables).
+    n_plus_one_threshold: int = 10
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -45,6 +87,11 @@ class Settings(BaseSettings):
         is_production = self.app_env.strip().lower() == "production"
         return not (is_production and self.disable_docs_in_production)
 
+    @property
+    def n_plus_one_detection_enabled(self) -> bool:
+        is_production = self.app_env.strip().lower() == "production"
+        return not is_production and self.n_plus_one_threshold > 0
+
     @property
     def cookie_secure(self) -> bool:
         return bool(self.session_cookie_secure)
@@ -0,0 +1,375 @@
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config.settings import settings
+
+_LOGGER = logging.getLogger("scrum.perf")
+if not _LOGGER.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _LOGGER.addHandler(_handler)
+_LOGGER.setLevel(logging.INFO)
+_LOGGER.propagate = False
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+STATEMENT_PREVIEW_CHARS = 240
+
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|:\w+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with whitespace and expanded ``IN (...)`` lists folded,
+    so the same query issued per row maps to one shape."""
+    return _IN_LIST.sub("(?)", " ".join(statement.split()))[:STATEMENT_PREVIEW_CHARS]
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    statements: dict[str, list] = field(default_factory=dict)
+
+    def record(self, statement: str, elapsed: float, rows: int) -> None:
+        self.queries += 1
+        self.db_seconds += elapsed
+        self.rows += rows
+        entry = self.statements.setdefault(statement_shape(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def top_queries(self, limit: int) -> list[dict]:
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {"statement": statement, "count": count, "ms": round(seconds * 1000, 2)}
+            for statement, (count, seconds) in ranked
+        ]
+
+    def repeated(self, threshold: int) -> list[dict]:
+        """Statement shapes executed at least ``threshold`` times (N+1 suspects)."""
+        if threshold <= 0:
+            return []
+        return [
+            {"statement": statement, "count": count, "ms": round(seconds * 1000, 2)}
+            for statement, (count, seconds) in sorted(self.statements.items(), key=lambda item: -item[1][0])
+            if count >= threshold
+        ]
+
+
+_CURRENT: ContextVar[Optional[RequestStats]] = ContextVar("scrum_request_stats", default=None)
+
+
+def start_request() -> tuple[RequestStats, object]:
+    stats = RequestStats()
+    return stats, _CURRENT.set(stats)
+
+
+def finish_request(reset_token) -> None:
+    _CURRENT.reset(reset_token)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _CURRENT.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _CURRENT.get() is not None:
+        conn.info.setdefault("scrum_query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _CURRENT.get()
+    started = conn.info.get("scrum_query_started")
+    if stats is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    # DBAPI row counts: psycopg2 reports SELECT rows, SQLite reports -1.
+    rowcount = getattr(cursor, "rowcount", -1)
+    stats.record(statement, elapsed, rowcount if rowcount and rowcount > 0 else 0)
+
+
+@contextmanager
+def capture_queries() -> Iterator[RequestStats]:
+    """Count every statement on any engine while the block runs, regardless
+    of the thread that issues it (``TestClient`` serves from a portal)."""
+    stats = RequestStats()
+    lock = threading.Lock()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("scrum_capture_started", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("scrum_capture_started")
+        elapsed = time.perf_counter() - started.pop() if started else 0.0
+        rowcount = getattr(cursor, "rowcount", -1)
+        with lock:
+            stats.record(statement, elapsed, rowcount if rowcount and rowcount > 0 else 0)
+
+    event.listen(Engine, "before_cursor_execute", before)
+    event.listen(Engine, "after_cursor_execute", after)
+    try:
+        yield stats
+    finally:
+        event.remove(Engine, "before_cursor_execute", before)
+        event.remove(Engine, "after_cursor_execute", after)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.total += 1
+        self.sum += value
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+
+
+class MetricsRegistry:
+    """In-process per-route request/DB metrics rendered as Prometheus text."""
+
+    ROUTE_LABELS = ("method", "route")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latency: dict[tuple, _Histogram] = {}
+        self._query_counts: dict[tuple, _Histogram] = {}
+        self._responses: dict[tuple, int] = {}
+        self._db_seconds: dict[tuple, float] = {}
+        self._db_rows: dict[tuple, int] = {}
+
+    def observe(self, method: str, route: str, status_code: int, duration: float, stats: RequestStats) -> None:
+        key = (method, route)
+        with self._lock:
+            self._latency.setdefault(key, _Histogram(LATENCY_BUCKETS)).observe(duration)
+            self._query_counts.setdefault(key, _Histogram(QUERY_COUNT_BUCKETS)).observe(stats.queries)
+            status_key = (method, route, str(status_code))
+            self._responses[status_key] = self._responses.get(status_key, 0) + 1
+            self._db_seconds[key] = self._db_seconds.get(key, 0.0) + stats.db_seconds
+            self._db_rows[key] = self._db_rows.get(key, 0) + stats.rows
+
+    def reset(self) -> None:
+        with self._lock:
+            for series in (self._latency, self._query_counts, self._responses, self._db_seconds, self._db_rows):
+                series.clear()
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            self._render_histogram(
+                lines,
+                "scrum_http_request_duration_seconds",
+                "Request latency per route.",
+                self._latency,
+            )
+            lines.append("# HELP scrum_http_responses_total Responses per route and status code.")
+            lines.append("# TYPE scrum_http_responses_total counter")
+            for key, value in sorted(self._responses.items()):
+                lines.append(f"scrum_http_responses_total{_labels((*self.ROUTE_LABELS, 'status'), key)} {value}")
+            self._render_histogram(
+                lines,
+                "scrum_db_queries_per_request",
+                "SQL statements executed per request.",
+                self._query_counts,
+            )
+            lines.append("# HELP scrum_db_query_seconds_total Time spent in SQL per route.")
+            lines.append("# TYPE scrum_db_query_seconds_total counter")
+            for key, value in sorted(self._db_seconds.items()):
+                lines.append(f"scrum_db_query_seconds_total{_labels(self.ROUTE_LABELS, key)} {value:.6f}")
+            lines.append("# HELP scrum_db_rows_total Rows reported by the DB driver per route.")
+            lines.append("# TYPE scrum_db_rows_total counter")
+            for key, value in sorted(self._db_rows.items()):
+                lines.append(f"scrum_db_rows_total{_labels(self.ROUTE_LABELS, key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _render_histogram(self, lines: list[str], name: str, help_text: str, series: dict) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in sorted(series.items()):
+            for bound, count in [*zip(histogram.buckets, histogram.counts), ("+Inf", histogram.total)]:
+                bucket = 'le="%s"' % bound
+                lines.append(f"{name}_bucket{_labels(self.ROUTE_LABELS, key, bucket)} {count}")
+            lines.append(f"{name}_sum{_labels(self.ROUTE_LABELS, key)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{_labels(self.ROUTE_LABELS, key)} {histogram.total}")
+
+
+METRICS = MetricsRegistry()
+
+
+class PoolMetrics:
+    """Checkout wait and saturation of the SQLAlchemy connection pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wait = _Histogram(POOL_WAIT_BUCKETS)
+        self._timeouts = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._wait.observe(seconds)
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._wait = _Histogram(POOL_WAIT_BUCKETS)
+            self._timeouts = 0
+
+    def render(self, engine: Optional[Engine]) -> str:
+        lines: list[str] = []
+        pool = getattr(engine, "pool", None)
+        if isinstance(pool, QueuePool):
+            for name, help_text, value in (
+                ("scrum_db_pool_size", "Configured pool size.", pool.size()),
+                ("scrum_db_pool_checked_out", "Connections currently in use.", pool.checkedout()),
+                ("scrum_db_pool_overflow", "Connections open beyond pool_size.", max(0, pool.overflow())),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        with self._lock:
+            name = "scrum_db_pool_checkout_wait_seconds"
+            lines.append(f"# HELP {name} Time spent waiting for a pooled connection.")
+            lines.append(f"# TYPE {name} histogram")
+            for bound, count in [*zip(self._wait.buckets, self._wait.counts), ("+Inf", self._wait.total)]:
+                lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+            lines.append(f"{name}_sum {self._wait.sum:.6f}")
+            lines.append(f"{name}_count {self._wait.total}")
+            lines.append("# HELP scrum_db_pool_timeouts_total Checkouts that gave up after pool_timeout.")
+            lines.append("# TYPE scrum_db_pool_timeouts_total counter")
+            lines.append(f"scrum_db_pool_timeouts_total {self._timeouts}")
+        return "\n".join(lines) + "\n"
+
+
+POOL_METRICS = PoolMetrics()
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout waited, including opening
+    a new connection when the pool has room to grow."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            POOL_METRICS.observe_timeout()
+            raise
+        POOL_METRICS.observe_wait(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def log_async_db_unavailable(dialect: str, error: Exception) -> None:
+    payload = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "event": "async_db_unavailable",
+        "severity": "WARNING",
+        "dialect": dialect,
+        "error": str(error),
+    }
+    _LOGGER.warning(json.dumps(payload, ensure_ascii=True, default=str))
+
+
+def log_scheduled_job(job: str, severity: str, **fields) -> None:
+    payload = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "event": "scheduled_job",
+        "severity": severity,
+        "job": job,
+        **fields,
+    }
+    _LOGGER.log(logging.getLevelName(severity), json.dumps(payload, ensure_ascii=True, default=str))
+
+
+def route_label(scope: dict) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template:
+        return template
+    path = scope.get("path") or ""
+    if path.startswith("/ui/") or path == "/ui":
+        return "/ui"
+    return "unmatched"
+
+
+def log_slow_request(
+    method: str,
+    path: str,
+    route: str,
+    status_code: int,
+    duration: float,
+    stats: RequestStats,
+) -> None:
+    payload = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "event": "slow_request",
+        "severity": "WARNING",
+        "method": method,
+        "path": path,
+        "route": route,
+        "status_code": status_code,
+        "duration_ms": round(duration * 1000, 2),
+        "db_queries": stats.queries,
+        "db_ms": round(stats.db_seconds * 1000, 2),
+        "db_rows": stats.rows,
+        "top_queries": stats.top_queries(settings.slow_request_top_queries),
+    }
+    _LOGGER.warning(json.dumps(payload, ensure_ascii=True, default=str))
+
+
+def log_repeated_statements(method: str, path: str, route: str, stats: RequestStats, repeated: list[dict]) -> None:
+    payload = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "event": "n_plus_one_suspected",
+        "severity": "WARNING",
+        "method": method,
+        "path": path,
+        "route": route,
+        "db_queries": stats.queries,
+        "threshold": settings.n_plus_one_threshold,
+        "repeated": repeated,
+    }
+    _LOGGER.warning(json.dumps(payload, ensure_ascii=True, default=str))
@@ -0,0 +1,223 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from typing import Callable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+import data.db as db_module
+from config.settings import settings
+from data.models import LoginRateLimit
+
+
+@dataclass(frozen=True)
+class RateLimitState:
+    window: int = 0
+    attempts: int = 0
+    previous_attempts: int = 0
+    blocked_until: float = 0.0
+
+
+class LoginRateLimiter(ABC):
+    """Sliding-window counter per key: failures in the current fixed window
+    plus the previous window's failures weighted by how much of it still
+    overlaps. Subclasses only store ``RateLimitState`` rows.
+    """
+
+    def __init__(self, max_attempts: int, window_seconds: int, block_seconds: int) -> None:
+        self.max_attempts = max(1, int(max_attempts or 1))
+        self.window_seconds = max(1, int(window_seconds or 1))
+        self.block_seconds = max(1, int(block_seconds or 1))
+        self._prune_lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def _window(self, now_ts: float) -> int:
+        return int(now_ts // self.window_seconds)
+
+    def estimate(self, state: RateLimitState, now_ts: float) -> float:
+        window = self._window(now_ts)
+        if state.window == window:
+            current, previous = state.attempts, state.previous_attempts
+        elif state.window == window - 1:
+            current, previous = 0, state.attempts
+        else:
+            return 0.0
+        overlap = 1.0 - (now_ts - window * self.window_seconds) / self.window_seconds
+        return current + previous * overlap
+
+    def record_failure(self, state: Optional[RateLimitState], now_ts: float) -> RateLimitState:
+        window = self._window(now_ts)
+        state = state or RateLimitState(window=window)
+        if state.window == window:
+            state = replace(state, attempts=state.attempts + 1)
+        elif state.window == window - 1:
+            state = RateLimitState(window=window, attempts=1, previous_attempts=state.attempts)
+        else:
+            state = RateLimitState(window=window, attempts=1)
+        if self.estimate(state, now_ts) >= self.max_attempts:
+            return RateLimitState(window=window, blocked_until=now_ts + self.block_seconds)
+        return state
+
+    def check(self, key: str) -> tuple[bool, int]:
+        now_ts = time.time()
+        state = self._load(key)
+        if state and state.blocked_until > now_ts:
+            return False, max(1, int(state.blocked_until - now_ts))
+        return True, 0
+
+    def fail(self, key: str) -> None:
+        now_ts = time.time()
+        self._update(key, lambda state: self.record_failure(state, now_ts))
+        self._maybe_prune(now_ts)
+
+    def success(self, key: str) -> None:
+        self._delete(key)
+
+    def _maybe_prune(self, now_ts: float) -> None:
+        # At most once per window per process: rows older than the previous
+        # window no longer count, unless they still carry an active block.
+        with self._prune_lock:
+            if now_ts < self._next_prune:
+                return
+            self._next_prune = now_ts + self.window_seconds
+        self._prune(self._window(now_ts) - 1, now_ts)
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[RateLimitState]:
+        ...
+
+    @abstractmethod
+    def _update(self, key: str, change: Callable[[Optional[RateLimitState]], RateLimitState]) -> None:
+        ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def _prune(self, oldest_window: int, now_ts: float) -> None:
+        ...
+
+
+class MemoryLoginRateLimiter(LoginRateLimiter):
+    """Per-process counters; each uvicorn worker limits on its own."""
+
+    def __init__(self, max_attempts: int, window_seconds: int, block_seconds: int) -> None:
+        super().__init__(max_attempts, window_seconds, block_seconds)
+        self._lock = threading.Lock()
+        self._state: dict[str, RateLimitState] = {}
+
+    def _load(self, key: str) -> Optional[RateLimitState]:
+        with self._lock:
+            return self._state.get(key)
+
+    def _update(self, key: str, change: Callable[[Optional[RateLimitState]], RateLimitState]) -> None:
+        with self._lock:
+            self._state[key] = change(self._state.get(key))
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._state.pop(key, None)
+
+    def _prune(self, oldest_window: int, now_ts: float) -> None:
+        with self._lock:
+            stale = [
+                key
+                for key, state in self._state.items()
+                if state.window < oldest_window and state.blocked_until <= now_ts
+            ]
+            for key in stale:
+                self._state.pop(key, None)
+
+
+class DatabaseLoginRateLimiter(LoginRateLimiter):
+    """Counters in ``login_rate_limits`` so every worker shares them.
+
+    ``fail`` locks the key's row (``SELECT ... FOR UPDATE`` on Postgres) so
+    concurrent failures from different workers are all counted.
+    """
+
+    def _session(self):
+        return db_module.SessionLocal()
+
+    def _load(self, key: str) -> Optional[RateLimitState]:
+        db = self._session()
+        try:
+            row = db.get(LoginRateLimit, key)
+            return self._to_state(row) if row else None
+        finally:
+            db.close()
+
+    def _update(self, key: str, change: Callable[[Optional[RateLimitState]], RateLimitState]) -> None:
+        db = self._session()
+        try:
+            self._ensure_row(db, key)
+            row = db.execute(
+                select(LoginRateLimit).where(LoginRateLimit.clave == key).with_for_update()
+            ).scalar_one()
+            state = change(self._to_state(row))
+            row.ventana = state.window
+            row.intentos = state.attempts
+            row.intentos_previos = state.previous_attempts
+            row.bloqueado_hasta = state.blocked_until
+            db.commit()
+        finally:
+            db.close()
+
+    def _ensure_row(self, db, key: str) -> None:
+        upsert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        db.execute(
+            upsert(LoginRateLimit)
+            .values(clave=key, ventana=0, intentos=0, intentos_previos=0, bloqueado_hasta=0.0)
+            .on_conflict_do_nothing(index_elements=["clave"])
+        )
+
+    def _delete(self, key: str) -> None:
+        db = self._session()
+        try:
+            db.execute(delete(LoginRateLimit).where(LoginRateLimit.clave == key))
+            db.commit()
+        finally:
+            db.close()
+
+    def _prune(self, oldest_window: int, now_ts: float) -> None:
+        db = self._session()
+        try:
+            db.execute(
+                delete(LoginRateLimit).where(
+                    LoginRateLimit.ventana < oldest_window,
+                    LoginRateLimit.bloqueado_hasta <= now_ts,
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_state(row: LoginRateLimit) -> RateLimitState:
+        return RateLimitState(
+            window=int(row.ventana or 0),
+            attempts=int(row.intentos or 0),
+            previous_attempts=int(row.intentos_previos or 0),
+            blocked_until=float(row.bloqueado_hasta or 0.0),
+        )
+
+
+RATE_LIMIT_BACKENDS = {
+    "memory": MemoryLoginRateLimiter,
+    "database": DatabaseLoginRateLimiter,
+}
+
+
+def build_login_rate_limiter() -> LoginRateLimiter:
+    backend = (settings.login_rate_limit_backend or "memory").strip().lower()
+    if backend not in RATE_LIMIT_BACKENDS:
+        raise ValueError(f"login_rate_limit_backend desconocido: {backend}")
+    return RATE_LIMIT_BACKENDS[backend](
+        settings.login_rate_limit_max_attempts,
+        settings.login_rate_limit_window_seconds,
+        settings.login_rate_limit_block_seconds,
+    )
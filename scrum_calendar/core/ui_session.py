@@ -0,0 +1,121 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from typing import Optional
+
+from config.settings import settings
+
+UI_HINT_COOKIE = "scrum_ui"
+UI_HINT_PATH = "/ui"
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode((value + "=" * (-len(value) % 4)).encode("ascii"))
+
+
+def session_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+class UiSessionHints:
+    """Signed, short-lived proof that a ``scrum_session`` was valid recently.
+
+    The hint is ``payload.signature`` (HMAC-SHA256) bound to the session
+    cookie through a fingerprint, so it only routes /ui HTML; API calls keep
+    validating against ``sesiones``. Revocations live in a per-process
+    deny-list that only needs to outlive the hint TTL.
+    """
+
+    def __init__(self, secret: str, ttl_seconds: int) -> None:
+        # Without a configured secret each worker signs with its own key; hints
+        # from another worker just fail verification and fall back to the DB.
+        self._key = (secret or secrets.token_hex(32)).encode("utf-8")
+        self.ttl_seconds = max(1, int(ttl_seconds or 1))
+        self._lock = threading.Lock()
+        self._revoked_sessions: dict[str, float] = {}
+        self._revoked_users: dict[int, float] = {}
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._key, payload.encode("ascii"), hashlib.sha256).digest())
+
+    def issue(self, token: str, user_id: int) -> str:
+        now_ts = time.time()
+        claims = {
+            "s": session_fingerprint(token),
+            "u": int(user_id),
+            "i": now_ts,
+            "e": int(now_ts) + self.ttl_seconds,
+        }
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, value: Optional[str], token: Optional[str]) -> Optional[int]:
+        """Return the user id carried by a valid hint for ``token``."""
+        if not value or not token or "." not in value:
+            return None
+        payload, signature = value.rsplit(".", 1)
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+        try:
+            claims = json.loads(_b64decode(payload))
+            fingerprint, user_id = str(claims["s"]), int(claims["u"])
+            issued_at, expires_at = float(claims["i"]), float(claims["e"])
+        except (ValueError, TypeError, KeyError, UnicodeError):
+            return None
+        now_ts = time.time()
+        if expires_at < now_ts or not hmac.compare_digest(fingerprint, session_fingerprint(token)):
+            return None
+        with self._lock:
+            self._prune(now_ts)
+            if fingerprint in self._revoked_sessions:
+                return None
+            revoked_at = self._revoked_users.get(user_id)
+            if revoked_at is not None and issued_at <= revoked_at:
+                return None
+        return user_id
+
+    def revoke_session(self, token: Optional[str]) -> None:
+        if not token:
+            return
+        with self._lock:
+            self._revoked_sessions[session_fingerprint(token)] = time.time()
+
+    def revoke_user(self, user_id: int) -> None:
+        """Reject every hint issued so far for ``user_id`` (role, password or
+        activo changes)."""
+        with self._lock:
+            self._revoked_users[int(user_id)] = time.time()
+
+    def _prune(self, now_ts: float) -> None:
+        floor = now_ts - self.ttl_seconds
+        for entries in (self._revoked_sessions, self._revoked_users):
+            stale = [key for key, revoked_at in entries.items() if revoked_at < floor]
+            for key in stale:
+                entries.pop(key, None)
+
+
+UI_SESSION_HINTS = UiSessionHints(settings.ui_hint_secret, settings.ui_hint_ttl_seconds)
+
+
+def set_ui_hint_cookie(response, token: str, user_id: int) -> None:
+    response.set_cookie(
+        UI_HINT_COOKIE,
+        UI_SESSION_HINTS.issue(token, user_id),
+        httponly=True,
+        samesite="lax",
+        secure=settings.cookie_secure,
+        max_age=UI_SESSION_HINTS.ttl_seconds,
+        path=UI_HINT_PATH,
+    )
+
+
+def clear_ui_hint_cookie(response) -> None:
+    response.delete_cookie(UI_HINT_COOKIE, path=UI_HINT_PATH)
@@ -1,11 +1,50 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import NoSuchModuleError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from config.settings import settings
+from core.instrumentation import TimedAsyncQueuePool, TimedQueuePool, log_async_db_unavailable
+
+T = TypeVar("T")
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+def engine_options(database_url: str, use_async: bool = False) -> dict:
+    if database_url.startswith("sqlite"):
+        return {"pool_pre_ping": settings.db_pool_pre_ping}
+    return {
+        "poolclass": TimedAsyncQueuePool if use_async else TimedQueuePool,
+        "pool_size": settings.async_db_pool_size if use_async else settings.db_pool_size,
+        "max_overflow": settings.async_db_max_overflow if use_async else settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# WebSocket handlers persist through this executor instead of the default one,
+# so a burst of submits can hold at most ``ws_db_workers`` pooled connections.
+_WS_DB_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, settings.ws_db_workers), thread_name_prefix="ws-db")
+
+_async_lock = threading.Lock()
+_async_factory: tuple[Optional[str], Optional[async_sessionmaker]] = (None, None)
+
 
 def get_db():
     db = SessionLocal()
@@ -13,3 +52,69 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def async_database_url(database_url: str) -> Optional[str]:
+    """Same database through its asyncio driver, or None if there is none."""
+    scheme, sep, rest = database_url.partition("://")
+    driver = ASYNC_DRIVERS.get(scheme)
+    return f"{driver}{sep}{rest}" if driver and sep else None
+
+
+def async_session_factory() -> Optional[async_sessionmaker]:
+    """Async sessions on the database the sync ``engine`` points at.
+
+    Built lazily and rebuilt when ``engine`` is swapped (tests, scripts).
+    Returns None when disabled or when the async driver is not installed,
+    and callers fall back to a thread with a sync session.
+    """
+    global _async_factory
+    if not settings.async_db_enabled:
+        return None
+    database_url = engine.url.render_as_string(hide_password=False)
+    with _async_lock:
+        cached_url, factory = _async_factory
+        if cached_url == database_url:
+            return factory
+        async_url = async_database_url(database_url)
+        factory = None
+        if async_url:
+            try:
+                async_engine = create_async_engine(async_url, **engine_options(async_url, use_async=True))
+                factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+            except (ImportError, NoSuchModuleError) as err:
+                # aiosqlite is optional for local SQLite; a missing asyncpg is worth a warning.
+                if not async_url.startswith("sqlite"):
+                    log_async_db_unavailable(async_url.split("://", 1)[0], err)
+        _async_factory = (database_url, factory)
+        return factory
+
+
+def _with_session(work: Callable[[Session], T]) -> T:
+    db = SessionLocal()
+    try:
+        return work(db)
+    finally:
+        db.close()
+
+
+async def _run_async(factory: async_sessionmaker, work: Callable[[Session], T]) -> T:
+    async with factory() as session:
+        return await session.run_sync(work)
+
+
+async def run_db(work: Callable[[Session], T]) -> T:
+    """Run ``work(db)`` without holding a threadpool slot when the async
+    driver is available; otherwise on AnyIO's threadpool as sync handlers do."""
+    factory = async_session_factory()
+    if factory is not None:
+        return await _run_async(factory, work)
+    return await run_in_threadpool(_with_session, work)
+
+
+async def run_ws_db(work: Callable[[Session], T]) -> T:
+    """``run_db`` for WebSocket handlers; the fallback uses the WS executor."""
+    factory = async_session_factory()
+    if factory is not None:
+        return await _run_async(factory, work)
+    return await asyncio.get_running_loop().run_in_executor(_WS_DB_EXECUTOR, _with_session, work)
@@ -8,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -273,6 +274,7 @@ class ReleaseItem(Base):
     __tablename__ = "release_items"
     __table_args__ = (
         UniqueConstraint("issue_key", name="uq_release_items_issue_key"),
+        Index("ix_release_items_celula_sprint", "celula_id", "sprint_id"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -305,6 +307,41 @@ class ReleaseItem(Base):
     persona = relationship("Persona", back_populates="release_items")
 
 
+class SprintMetric(Base):
+    __tablename__ = "sprint_metrics"
+
+    sprint_id = Column(Integer, ForeignKey("sprints.id"), primary_key=True)
+    celula_id = Column(Integer, ForeignKey("celulas.id"), nullable=False, index=True)
+    items = Column(Integer, nullable=False, default=0)
+    items_finalizados = Column(Integer, nullable=False, default=0)
+    story_points = Column(Float, nullable=False, default=0.0)
+    story_points_completados = Column(Float, nullable=False, default=0.0)
+    por_estado = Column(Text, nullable=True)
+    por_persona = Column(Text, nullable=True)
+    actualizado_en = Column(DateTime, nullable=False, default=now_py)
+
+
+class QuarterRollup(Base):
+    __tablename__ = "quarter_rollups"
+
+    celula_id = Column(Integer, ForeignKey("celulas.id"), primary_key=True)
+    quarter = Column(String(20), primary_key=True)
+    releases = Column(Integer, nullable=False, default=0)
+    releases_finalizados = Column(Integer, nullable=False, default=0)
+    comprometidos = Column(Integer, nullable=False, default=0)
+    comprometidos_finalizados = Column(Integer, nullable=False, default=0)
+    nuevos = Column(Integer, nullable=False, default=0)
+    nuevos_finalizados = Column(Integer, nullable=False, default=0)
+    story_points = Column(Float, nullable=False, default=0.0)
+    story_points_completados = Column(Float, nullable=False, default=0.0)
+    tareas = Column(Integer, nullable=False, default=0)
+    tareas_finalizadas = Column(Integer, nullable=False, default=0)
+    tareas_story_points = Column(Float, nullable=False, default=0.0)
+    tareas_story_points_completados = Column(Float, nullable=False, default=0.0)
+    por_release = Column(Text, nullable=True)
+    actualizado_en = Column(DateTime, nullable=False, default=now_py)
+
+
 class DailyItemComment(Base):
     __tablename__ = "daily_item_comments"
 
@@ -335,6 +372,11 @@ class ReleaseItemComment(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_creador_segmento_key", "creado_por_usuario_id", "segmento_key"),
+        # Board columns: ordered cards per celula and status.
+        Index("ix_tasks_celula_estado_orden", "celula_id", "estado", "orden"),
+    )
 
     id = Column(Integer, primary_key=True)
     celula_id = Column(Integer, ForeignKey("celulas.id"), nullable=True)
@@ -354,11 +396,20 @@ class Task(Base):
     end_date = Column(Date, nullable=True)
     fecha_vencimiento = Column(Date, nullable=True)
     segmento = Column(String(80), nullable=True)
+    # label_key(segmento); matches TaskSegment.nombre_key for bulk rename/delete.
+    segmento_key = Column(String(80), nullable=True)
     tipo = Column(String(30), nullable=True)
     etiquetas = Column(Text, nullable=True)  # Comma-separated for now: "ui, backend"
     puntos = Column(Float, nullable=True)
     horas_estimadas = Column(Float, nullable=True)
     importante = Column(Boolean, nullable=False, default=False)
+    # Roll-up of every descendant, kept by SqlAlchemyTaskRepository on each write.
+    descendientes_total = Column(Integer, nullable=False, default=0)
+    descendientes_abiertos = Column(Integer, nullable=False, default=0)
+    descendientes_en_curso = Column(Integer, nullable=False, default=0)
+    descendientes_min_start_date = Column(Date, nullable=True)
+    descendientes_puntos = Column(Float, nullable=False, default=0.0)
+    descendientes_horas = Column(Float, nullable=False, default=0.0)
 
     orden = Column(Float, nullable=False, default=0.0)
     creado_en = Column(DateTime, nullable=False, default=now_py)
@@ -374,6 +425,27 @@ class Task(Base):
     comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan")
 
 
+task_tag_links = Table(
+    "task_tag_links",
+    Base.metadata,
+    Column("task_id", ForeignKey("tasks.id"), primary_key=True),
+    Column("tag_id", ForeignKey("task_tags.id"), primary_key=True),
+    Index("ix_task_tag_links_tag", "tag_id"),
+)
+
+
+class TaskTag(Base):
+    """Normalized tags parsed from ``Task.etiquetas``, which stays the
+    editable source; links are rewritten whenever it changes."""
+
+    __tablename__ = "task_tags"
+
+    id = Column(Integer, primary_key=True)
+    nombre = Column(String(80), nullable=False)
+    nombre_key = Column(String(80), nullable=False, unique=True)
+    creado_en = Column(DateTime, nullable=False, default=now_py)
+
+
 class TaskSegment(Base):
     __tablename__ = "task_segments"
     __table_args__ = (
@@ -403,6 +475,33 @@ class TaskComment(Base):
     usuario = relationship("Usuario")
 
 
+class TaskClosure(Base):
+    """Closure table of the task tree: one row per (ancestor, descendant)
+    pair, including (task, task, 0). Kept by SqlAlchemyTaskRepository when
+    ``task_closure_enabled`` is on."""
+
+    __tablename__ = "task_closure"
+    __table_args__ = (Index("ix_task_closure_descendiente", "descendiente_id", "profundidad"),)
+
+    ancestro_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
+    descendiente_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
+    profundidad = Column(Integer, nullable=False)
+
+
+class TaskChange(Base):
+    """Append-only change log of tasks for incremental board sync. ``id`` is
+    the cursor clients resume from and the version of that task change."""
+
+    __tablename__ = "task_changes"
+    __table_args__ = (Index("ix_task_changes_creado_en", "creado_en"),)
+
+    id = Column(Integer, primary_key=True)
+    # No foreign key: "delete" rows outlive their task.
+    task_id = Column(Integer, nullable=False)
+    operacion = Column(String(10), nullable=False)  # "upsert" | "delete"
+    creado_en = Column(DateTime, nullable=False, default=now_py)
+
+
 class CompraCatalogProducto(Base):
     __tablename__ = "compras_catalogo_productos"
     __table_args__ = (
@@ -660,6 +759,36 @@ class PokerClaim(Base):
     persona = relationship("Persona")
 
 
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+
+    nombre = Column(String(40), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    actualizado_en = Column(DateTime, nullable=False, default=now_py, onupdate=now_py)
+
+
+class JobRun(Base):
+    """Last business day each scheduled job ran; the claim row for workers and cron."""
+
+    __tablename__ = "job_runs"
+
+    job = Column(String(60), primary_key=True)
+    ultimo_dia = Column(Date, nullable=False)
+    ejecutado_en = Column(DateTime, nullable=False, default=now_py)
+
+
+class LoginRateLimit(Base):
+    __tablename__ = "login_rate_limits"
+    __table_args__ = (Index("ix_login_rate_limits_ventana", "ventana"),)
+
+    clave = Column(String(255), primary_key=True)
+    # Sliding-window counter: failures in the current and previous fixed windows.
+    ventana = Column(Integer, nullable=False, default=0)
+    intentos = Column(Integer, nullable=False, default=0)
+    intentos_previos = Column(Integer, nullable=False, default=0)
+    bloqueado_hasta = Column(Float, nullable=False, default=0.0)
+
+
 class Usuario(Base):
     __tablename__ = "usuarios"
 
@@ -1,17 +1,36 @@
-from fastapi import FastAPI, HTTPException, Request
+import asyncio
+import time
+
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from pathlib import Path
-from sqlalchemy.orm import joinedload
 from sqlalchemy import text
 
-from api.routes import router
+from api.routes import get_current_admin, router
 from config.settings import settings
 from core.audit import log_security_event
-from data.db import SessionLocal, engine
-from data.models import Base, Sesion, now_py
+from core.instrumentation import (
+    METRICS,
+    POOL_METRICS,
+    PROMETHEUS_CONTENT_TYPE,
+    finish_request,
+    log_repeated_statements,
+    log_slow_request,
+    route_label,
+    start_request,
+)
+from core.ui_session import UI_HINT_COOKIE, UI_SESSION_HINTS, clear_ui_hint_cookie, set_ui_hint_cookie
+from data.db import SessionLocal, engine, run_db
+from data.models import Base, QuarterRollup, ReleaseItem, SprintMetric, Task, TaskClosure, Usuario, task_tag_links
+from app.modules.tasks.interface.jobs import changes_prune_loop, order_rebalance_loop, overdue_reset_loop
 from app.modules.tasks.interface.routes import router as tasks_router
+from app.modules.tasks.infrastructure.repository import SqlAlchemyTaskRepository
+from app.modules.reports.interface.routes import router as reports_router
+from app.modules.reports.application.use_cases import rebuild_release_reports
+from app.shared.infrastructure.resource_versions import ensure_versions
+from app.shared.interface.dependencies import get_user_from_token
+from app.shared.interface.static_assets import STATIC_EXTENSIONS, UIStaticFiles
 
 app = FastAPI(
     title="Scrum Calendar",
@@ -30,25 +49,10 @@ app.add_middleware(
 )
 
 
-def _load_valid_session(token: str | None):
+async def _load_valid_session(token: str | None):
     if not token:
         return None
-    db = SessionLocal()
-    try:
-        session = (
-            db.query(Sesion)
-            .options(joinedload(Sesion.usuario))
-            .filter(Sesion.token == token)
-            .first()
-        )
-        if not session or session.expira_en < now_py() or not session.usuario or not session.usuario.activo:
-            if session and session.expira_en < now_py():
-                db.delete(session)
-                db.commit()
-            return None
-        return session.usuario
-    finally:
-        db.close()
+    return await run_db(lambda db: get_user_from_token(db, token))
 
 
 def _request_ip(request: Request) -> str:
@@ -86,33 +90,24 @@ async def auth_middleware(request: Request, call_next):
     if request.method == "OPTIONS":
         return _apply_security_headers(await call_next(request))
     if path.startswith("/ui"):
-        static_ext = (
-            ".css",
-            ".js",
-            ".map",
-            ".png",
-            ".jpg",
-            ".jpeg",
-            ".svg",
-            ".ico",
-            ".gif",
-            ".webp",
-            ".woff",
-            ".woff2",
-            ".ttf",
-            ".eot",
-        )
+        if path.endswith(STATIC_EXTENSIONS):
+            # UIStaticFiles sets immutable/revalidate caching per asset.
+            return _apply_security_headers(await call_next(request))
         if (
             path.endswith("/login.html")
             or path.endswith("/retro-public.html")
             or path.endswith("/poker-public.html")
-            or path.endswith(static_ext)
         ):
             response = await call_next(request)
             response.headers["Cache-Control"] = "no-store"
             return _apply_security_headers(response)
         token = request.cookies.get("scrum_session")
-        user = _load_valid_session(token)
+        if settings.ui_hint_enabled and UI_SESSION_HINTS.verify(request.cookies.get(UI_HINT_COOKIE), token):
+            # Recently validated session: route the page without a DB hit.
+            response = await call_next(request)
+            response.headers["Cache-Control"] = "no-store"
+            return _apply_security_headers(response)
+        user = await _load_valid_session(token)
         if not user:
             log_security_event(
                 "ui_auth_rejected",
@@ -124,10 +119,13 @@ async def auth_middleware(request: Request, call_next):
             )
             response = RedirectResponse(url="/ui/login.html")
             response.delete_cookie("scrum_session", path="/")
+            clear_ui_hint_cookie(response)
             response.headers["Cache-Control"] = "no-store"
             return _apply_security_headers(response)
         request.state.user = user
         response = await call_next(request)
+        if settings.ui_hint_enabled:
+            set_ui_hint_cookie(response, token, user.id)
         response.headers["Cache-Control"] = "no-store"
         return _apply_security_headers(response)
     if (
@@ -156,7 +154,7 @@ async def auth_middleware(request: Request, call_next):
             reason="missing_token",
         )
         return _apply_security_headers(JSONResponse(status_code=401, content={"detail": "No autenticado"}))
-    user = _load_valid_session(token)
+    user = await _load_valid_session(token)
     if not user:
         log_security_event(
             "api_auth_rejected",
@@ -173,6 +171,33 @@ async def auth_middleware(request: Request, call_next):
     return _apply_security_headers(await call_next(request))
 
 
+@app.middleware("http")
+async def instrumentation_middleware(request: Request, call_next):
+    # Registered after auth_middleware so session lookups count as request time.
+    if not settings.metrics_enabled:
+        return await call_next(request)
+    stats, reset_token = start_request()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        if settings.n_plus_one_detection_enabled:
+            response.headers["X-DB-Queries"] = str(stats.queries)
+        return response
+    finally:
+        duration = time.perf_counter() - started
+        finish_request(reset_token)
+        route = route_label(request.scope)
+        METRICS.observe(request.method, route, status_code, duration, stats)
+        if duration * 1000 >= settings.slow_request_ms:
+            log_slow_request(request.method, request.url.path, route, status_code, duration, stats)
+        if settings.n_plus_one_detection_enabled:
+            repeated = stats.repeated(settings.n_plus_one_threshold)
+            if repeated:
+                log_repeated_statements(request.method, request.url.path, route, stats, repeated)
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_audit_handler(request: Request, exc: HTTPException):
     if exc.status_code in {401, 403, 429}:
@@ -197,9 +222,27 @@ def healthcheck():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics(_: Usuario = Depends(get_current_admin)):
+    return PlainTextResponse(METRICS.render() + POOL_METRICS.render(engine), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.on_event("startup")
 def startup():
     Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        ensure_versions(db)
+        # Closure table: rebuilt when turned on over an existing tree, emptied
+        # when off so a later switch-on never trusts stale paths.
+        task_repo = SqlAlchemyTaskRepository(db)
+        if settings.task_closure_enabled and not task_repo.closure_in_sync():
+            task_repo.rebuild_closure()
+        elif not settings.task_closure_enabled and db.query(TaskClosure.ancestro_id).first() is not None:
+            db.query(TaskClosure).delete()
+        db.commit()
+    finally:
+        db.close()
     # Test suite uses SQLite; these lightweight "migrations" are Postgres-specific.
     if getattr(engine.dialect, "name", "") != "postgresql":
         return
@@ -217,6 +260,13 @@ def startup():
             conn.execute(text("alter table release_items add column quarter varchar(20)"))
         if "release_issue_key" not in column_names:
             conn.execute(text("alter table release_items add column release_issue_key varchar(60)"))
+        # Reportes: GROUP BY celula/sprint aggregates.
+        conn.execute(
+            text(
+                "create index if not exists ix_release_items_celula_sprint "
+                "on release_items (celula_id, sprint_id)"
+            )
+        )
         columns = conn.execute(
             text(
                 "select column_name from information_schema.columns "
@@ -259,6 +309,8 @@ def startup():
                 conn.execute(text("alter table poker_claims add column client_id varchar(64)"))
 
         # Tasks: add new columns if the table already exists (create_all doesn't alter).
+        rebuild_task_rollups = False
+        backfill_segment_keys = False
         tasks_cols = conn.execute(
             text(
                 "select column_name from information_schema.columns "
@@ -281,6 +333,31 @@ def startup():
                 conn.execute(text("alter table tasks add column segmento varchar(80)"))
             if "release_issue_key" not in task_col_names:
                 conn.execute(text("alter table tasks add column release_issue_key varchar(60)"))
+            if "segmento_key" not in task_col_names:
+                conn.execute(text("alter table tasks add column segmento_key varchar(80)"))
+                backfill_segment_keys = True
+            conn.execute(
+                text(
+                    "create index if not exists ix_tasks_creador_segmento_key "
+                    "on tasks (creado_por_usuario_id, segmento_key)"
+                )
+            )
+            conn.execute(
+                text("create index if not exists ix_tasks_celula_estado_orden on tasks (celula_id, estado, orden)")
+            )
+            # Subtree roll-ups: backfilled below when the columns are new.
+            task_rollup_columns = {
+                "descendientes_total": "integer not null default 0",
+                "descendientes_abiertos": "integer not null default 0",
+                "descendientes_en_curso": "integer not null default 0",
+                "descendientes_min_start_date": "date",
+                "descendientes_puntos": "double precision not null default 0",
+                "descendientes_horas": "double precision not null default 0",
+            }
+            for column, ddl in task_rollup_columns.items():
+                if column not in task_col_names:
+                    conn.execute(text(f"alter table tasks add column {column} {ddl}"))
+                    rebuild_task_rollups = True
 
         # Compras: ensure item ticket-check column exists for cross-device validation.
         compra_items_cols = conn.execute(
@@ -308,9 +385,54 @@ def startup():
                     text("alter table compra_items add column total_ticket_item integer null")
                 )
 
+    # Reportes: seed the materializations once for deployments that predate them.
+    db = SessionLocal()
+    try:
+        missing_metrics = db.query(SprintMetric.sprint_id).first() is None
+        missing_rollups = db.query(QuarterRollup.celula_id).first() is None
+        if (missing_metrics or missing_rollups) and db.query(ReleaseItem.id).first() is not None:
+            rebuild_release_reports(db)
+            db.commit()
+        if rebuild_task_rollups:
+            SqlAlchemyTaskRepository(db).rebuild_rollups()
+            db.commit()
+        if backfill_segment_keys:
+            SqlAlchemyTaskRepository(db).backfill_segment_keys()
+            db.commit()
+        # Tags: link existing comma-separated etiquetas once.
+        if (
+            db.query(task_tag_links.c.task_id).first() is None
+            and db.query(Task.id).filter(Task.etiquetas.isnot(None)).first() is not None
+        ):
+            SqlAlchemyTaskRepository(db).rebuild_tags()
+            db.commit()
+    finally:
+        db.close()
+
+
+_background_jobs: list[asyncio.Task] = []
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    if settings.overdue_reset_job_enabled:
+        _background_jobs.append(asyncio.create_task(overdue_reset_loop()))
+    if settings.task_order_rebalance_interval_seconds > 0:
+        _background_jobs.append(asyncio.create_task(order_rebalance_loop()))
+    if settings.task_changes_retention_hours > 0:
+        _background_jobs.append(asyncio.create_task(changes_prune_loop()))
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    for job in _background_jobs:
+        job.cancel()
+    _background_jobs.clear()
+
 
 app.include_router(router)
 app.include_router(tasks_router)
+app.include_router(reports_router)
 
 frontend_dir = Path(__file__).resolve().parent / "frontend"
 adminlte_dir = Path(__file__).resolve().parent / "ScrumV2" / "dist"
@@ -318,6 +440,6 @@ ui_root = adminlte_dir if adminlte_dir.exists() else frontend_dir
 if ui_root.exists():
     app.mount(
         "/ui",
-        StaticFiles(directory=str(ui_root), html=True),
+        UIStaticFiles(directory=str(ui_root), html=True),
         name="ui",
     )
@@ -7,3 +7,10 @@ VERSION="$(date +%Y%m%d)"
 perl -pi -e "s/\bv=\d{8}\b/v=${VERSION}/g" "${ROOT_DIR}/frontend"/*.html
 
 echo "Updated cache-bust to v=${VERSION} in frontend/*.html"
+
+# Precompressed variants older than their source are ignored; rebuild them
+# in the running container (the compose command also does it on start).
+if docker compose -f "${ROOT_DIR}/docker-compose.yml" ps --status running --services 2>/dev/null | grep -qx api; then
+  docker compose -f "${ROOT_DIR}/docker-compose.yml" exec -T api python -m scripts.build_ui_assets
+  echo "Rebuilt precompressed /ui assets"
+fi
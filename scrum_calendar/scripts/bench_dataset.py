@@ -0,0 +1,296 @@
+"""Synthetic dataset for the benchmark suite (``scripts.bench_suite``).
+
+Usage: python -m scripts.bench_dataset --database-url sqlite:///bench.db [--scale 0.1]
+Volumes default to a large installation and are multiplied by ``--scale``.
+Rows are bulk inserted through Core with a fixed seed, so two runs at the
+same scale produce the same data.
+"""
+
+import argparse
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.modules.reports.application.use_cases import rebuild_release_reports
+from app.modules.reports.domain.status import SPRINT_ITEM_TIPO
+from app.modules.tasks.infrastructure.repository import SqlAlchemyTaskRepository
+from app.shared.infrastructure.resource_versions import ensure_versions
+from data.models import (
+    Base,
+    Celula,
+    Evento,
+    EventoTipo,
+    Feriado,
+    Persona,
+    ReleaseItem,
+    Retrospective,
+    Sprint,
+    Task,
+    now_py,
+    persona_celulas,
+)
+
+VOLUMES = {
+    "celulas": 50,
+    "personas": 1_000,
+    "sprints": 500,
+    "release_items": 200_000,
+    "tasks": 100_000,
+    "eventos": 50_000,
+}
+BATCH_SIZE = 5_000
+FIRST_SPRINT = date(2025, 1, 6)
+SPRINT_STATUSES = ("To Do", "In Progress", "Code Review", "QA", "Finalizada", "Done")
+TASK_STATES = ("backlog", "todo", "doing", "blocked", "done")
+RELEASES_PER_CELULA_QUARTER = 6
+
+
+@dataclass
+class Dataset:
+    volumes: dict
+    celula_ids: list[int] = field(default_factory=list)
+    jira_codes: dict[int, str] = field(default_factory=dict)
+    sprint_ids: list[int] = field(default_factory=list)
+    sprint_names: dict[int, str] = field(default_factory=dict)
+    sprints_by_celula: dict[int, list[int]] = field(default_factory=dict)
+    personas_by_celula: dict[int, list[tuple[int, str]]] = field(default_factory=dict)
+    child_task_ids: list[int] = field(default_factory=list)
+    retro_token: str = ""
+
+
+def scaled_volumes(scale: float) -> dict:
+    volumes = {name: max(1, int(round(total * scale))) for name, total in VOLUMES.items()}
+    volumes["sprints"] = max(volumes["sprints"], volumes["celulas"])
+    return volumes
+
+
+def _insert_batches(session, model, rows) -> None:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            session.execute(insert(model), batch)
+            batch = []
+    if batch:
+        session.execute(insert(model), batch)
+
+
+def sprint_name(code: str, start: date) -> str:
+    year, week, _ = start.isocalendar()
+    return f"{code} Sprint {year}{week:02d}"
+
+
+def generate(session, scale: float = 1.0, seed: int = 20260101) -> Dataset:
+    rng = random.Random(seed)
+    volumes = scaled_volumes(scale)
+    dataset = Dataset(volumes=volumes)
+    created = now_py()
+
+    session.execute(
+        insert(EventoTipo),
+        [
+            {"id": 1, "nombre": "Vacaciones", "impacto_capacidad": 100, "planificado": True, "prioridad": "alta"},
+            {"id": 2, "nombre": "Reposo", "impacto_capacidad": 100, "planificado": False, "prioridad": "alta"},
+            {"id": 3, "nombre": "Soporte", "impacto_capacidad": 50, "planificado": True, "prioridad": "media"},
+        ],
+    )
+    session.execute(
+        insert(Feriado),
+        [
+            {"fecha": date(2025, 5, 1), "nombre": "Dia del Trabajador", "tipo": "nacional"},
+            {"fecha": date(2025, 5, 15), "nombre": "Independencia", "tipo": "nacional"},
+            {"fecha": date(2025, 12, 25), "nombre": "Navidad", "tipo": "nacional"},
+        ],
+    )
+
+    for idx in range(volumes["celulas"]):
+        celula_id = idx + 1
+        code = f"B{idx:03d}"
+        dataset.celula_ids.append(celula_id)
+        dataset.jira_codes[celula_id] = code
+    session.execute(
+        insert(Celula),
+        [
+            {"id": celula_id, "nombre": f"Celula {code}", "jira_codigo": code, "activa": True}
+            for celula_id, code in dataset.jira_codes.items()
+        ],
+    )
+
+    personas = []
+    links = []
+    for idx in range(volumes["personas"]):
+        persona_id = idx + 1
+        celula_id = dataset.celula_ids[idx % len(dataset.celula_ids)]
+        nombre, apellido = f"Persona{idx}", f"Bench{idx % 97}"
+        personas.append(
+            {
+                "id": persona_id,
+                "nombre": nombre,
+                "apellido": apellido,
+                "rol": rng.choice(("Dev", "QA", "SM", "PO")),
+                "capacidad_diaria_horas": 7.0,
+                "activo": True,
+            }
+        )
+        links.append({"persona_id": persona_id, "celula_id": celula_id})
+        dataset.personas_by_celula.setdefault(celula_id, []).append((persona_id, f"{nombre} {apellido}"))
+    _insert_batches(session, Persona, personas)
+    _insert_batches(session, persona_celulas, links)
+
+    sprints = []
+    for idx in range(volumes["sprints"]):
+        sprint_id = idx + 1
+        celula_id = dataset.celula_ids[idx % len(dataset.celula_ids)]
+        start = FIRST_SPRINT + timedelta(days=14 * (idx // len(dataset.celula_ids)))
+        name = sprint_name(dataset.jira_codes[celula_id], start)
+        sprints.append(
+            {
+                "id": sprint_id,
+                "nombre": name,
+                "celula_id": celula_id,
+                "fecha_inicio": start,
+                "fecha_fin": start + timedelta(days=13),
+            }
+        )
+        dataset.sprint_ids.append(sprint_id)
+        dataset.sprint_names[sprint_id] = name
+        dataset.sprints_by_celula.setdefault(celula_id, []).append(sprint_id)
+    _insert_batches(session, Sprint, sprints)
+    sprint_rows = {row["id"]: row for row in sprints}
+
+    def release_rows():
+        releases_total = max(1, volumes["release_items"] // 20)
+        release_keys: dict[int, list[str]] = {}
+        for idx in range(releases_total):
+            celula_id = dataset.celula_ids[idx % len(dataset.celula_ids)]
+            quarter_idx = (idx // len(dataset.celula_ids)) // RELEASES_PER_CELULA_QUARTER % 8
+            year, quarter = 2025 + quarter_idx // 4, quarter_idx % 4 + 1
+            key = f"{dataset.jira_codes[celula_id]}-R{idx}"
+            release_keys.setdefault(celula_id, []).append(key)
+            yield {
+                "celula_id": celula_id,
+                "issue_type": "Release",
+                "issue_key": key,
+                "summary": f"Release {idx}",
+                "status": rng.choice(SPRINT_STATUSES),
+                "story_points": float(rng.choice((3, 5, 8, 13))),
+                "release_tipo": rng.choice(("comprometido", "comprometido", "nuevo")),
+                "quarter": f"Q{quarter} {year}",
+                "creado_en": created,
+            }
+        for idx in range(volumes["release_items"] - releases_total):
+            sprint_id = dataset.sprint_ids[idx % len(dataset.sprint_ids)]
+            sprint = sprint_rows[sprint_id]
+            celula_id = sprint["celula_id"]
+            persona_id, persona_name = rng.choice(dataset.personas_by_celula.get(celula_id) or [(None, None)])
+            keys = release_keys.get(celula_id)
+            status = rng.choice(SPRINT_STATUSES)
+            start = sprint["fecha_inicio"] + timedelta(days=rng.randint(0, 9))
+            yield {
+                "celula_id": celula_id,
+                "sprint_id": sprint_id,
+                "persona_id": persona_id,
+                "issue_type": rng.choice(("Story", "Task", "Bug")),
+                "issue_key": f"{dataset.jira_codes[celula_id]}-{idx}",
+                "release_issue_key": rng.choice(keys) if keys and idx % 3 == 0 else None,
+                "summary": f"Item {idx}",
+                "status": status,
+                "story_points": float(rng.choice((1, 2, 3, 5, 8))),
+                "assignee_nombre": persona_name,
+                "sprint_nombre": sprint["nombre"],
+                "release_tipo": SPRINT_ITEM_TIPO,
+                "start_date": start,
+                "end_date": start + timedelta(days=3) if status in ("Finalizada", "Done") else None,
+                "due_date": sprint["fecha_fin"],
+                "creado_en": created + timedelta(microseconds=idx),
+            }
+
+    _insert_batches(session, ReleaseItem, release_rows())
+
+    # Tasks come in families: one parent with up to four children.
+    today = created.date()
+    task_id = 0
+    tasks = []
+    while task_id < volumes["tasks"]:
+        celula_id = dataset.celula_ids[task_id % len(dataset.celula_ids)]
+        parent_id = task_id + 1
+        family = min(rng.randint(1, 5), volumes["tasks"] - task_id)
+        if family > 1:
+            dataset.child_task_ids.append(parent_id + 1)
+        for offset in range(family):
+            task_id += 1
+            estado = rng.choice(TASK_STATES)
+            tasks.append(
+                {
+                    "id": task_id,
+                    "celula_id": celula_id,
+                    "parent_id": parent_id if offset else None,
+                    "titulo": f"Tarea {task_id}",
+                    "estado": estado,
+                    "prioridad": rng.choice(("baja", "media", "alta")),
+                    "fecha_vencimiento": today + timedelta(days=rng.randint(-20, 20)),
+                    "start_date": today - timedelta(days=5) if estado in ("doing", "done") else None,
+                    "orden": float(task_id),
+                    "creado_en": created + timedelta(microseconds=task_id),
+                    "actualizado_en": created,
+                }
+            )
+    _insert_batches(session, Task, tasks)
+
+    def evento_rows():
+        for idx in range(volumes["eventos"]):
+            persona_id = (idx % volumes["personas"]) + 1
+            start = FIRST_SPRINT + timedelta(days=rng.randint(0, 700))
+            yield {
+                "persona_id": persona_id,
+                "tipo_evento_id": rng.randint(1, 3),
+                "fecha_inicio": start,
+                "fecha_fin": start + timedelta(days=rng.randint(0, 4)),
+                "jornada": "completo",
+                "impacto_capacidad": 100.0,
+                "planificado": True,
+                "creado_en": created + timedelta(microseconds=idx),
+            }
+
+    _insert_batches(session, Evento, evento_rows())
+
+    dataset.retro_token = "bench-retro"
+    session.execute(
+        insert(Retrospective).values(
+            celula_id=dataset.celula_ids[0],
+            sprint_id=dataset.sprints_by_celula[dataset.celula_ids[0]][0],
+            token=dataset.retro_token,
+        )
+    )
+    ensure_versions(session)
+    rebuild_release_reports(session)
+    task_repo = SqlAlchemyTaskRepository(session)
+    task_repo.rebuild_rollups()
+    if task_repo.closure_enabled:
+        task_repo.rebuild_closure()
+    session.commit()
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True, help="empty database to fill")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=20260101)
+    args = parser.parse_args()
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        dataset = generate(session, args.scale, args.seed)
+    finally:
+        session.close()
+        engine.dispose()
+    print({name: total for name, total in dataset.volumes.items()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Rows/sec of the /release-items read path: ORM + Pydantic vs fast path.
+
+Usage: python -m scripts.bench_list_serialization [--rows 10000 100000] [--output bench.json]
+Runs against a throwaway SQLite file so it never touches the configured DB.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from api.schemas import ReleaseItemOut
+from app.shared.interface.pagination import PageParams, fast_page
+from app.shared.interface.responses import orjson
+from data.models import Base, Celula, ReleaseItem, now_py
+
+
+def seed(session, rows: int) -> None:
+    session.execute(insert(Celula).values(id=1, nombre="Bench", jira_codigo="BEN", activa=True))
+    created = now_py()
+    start = date(2026, 1, 5)
+    batch = []
+    for idx in range(rows):
+        batch.append(
+            {
+                "celula_id": 1,
+                "sprint_id": None,
+                "issue_type": "Task",
+                "issue_key": f"BEN-{idx}",
+                "summary": f"Item de benchmark {idx}",
+                "status": "Finalizada" if idx % 3 == 0 else "In Progress",
+                "story_points": float(idx % 8),
+                "assignee_nombre": f"Persona {idx % 25}",
+                "release_tipo": "comprometido",
+                "quarter": "Q1 2026",
+                "start_date": start + timedelta(days=idx % 90),
+                "creado_en": created + timedelta(microseconds=idx),
+            }
+        )
+        if len(batch) == 5000:
+            session.execute(insert(ReleaseItem), batch)
+            batch = []
+    if batch:
+        session.execute(insert(ReleaseItem), batch)
+    session.commit()
+
+
+def orm_path(session) -> bytes:
+    items = session.query(ReleaseItem).order_by(ReleaseItem.creado_en.desc()).all()
+    payload = jsonable_encoder([ReleaseItemOut.model_validate(item) for item in items])
+    return JSONResponse(content=payload).body
+
+
+def fast_path(session) -> bytes:
+    query = session.query(ReleaseItem).order_by(ReleaseItem.creado_en.desc())
+    return fast_page(query, ReleaseItem, PageParams(), ReleaseItemOut).body
+
+
+def measure(session_factory, fn, rows: int, repeat: int) -> dict:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        session = session_factory()
+        try:
+            started = time.perf_counter()
+            size = len(fn(session))
+            timings.append(time.perf_counter() - started)
+        finally:
+            session.close()
+    best = min(timings)
+    return {"seconds": round(best, 4), "rows_per_sec": round(rows / best, 1), "bytes": size}
+
+
+def run(rows: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        session = session_factory()
+        try:
+            seed(session, rows)
+        finally:
+            session.close()
+        orm = measure(session_factory, orm_path, rows, repeat)
+        fast = measure(session_factory, fast_path, rows, repeat)
+        engine.dispose()
+    return {
+        "rows": rows,
+        "orm_pydantic": orm,
+        "fast_path": fast,
+        "speedup": round(orm["seconds"] / fast["seconds"], 2) if fast["seconds"] else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+    report = {
+        "encoder": "orjson" if orjson is not None else "json",
+        "results": [run(rows, args.repeat) for rows in args.rows],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
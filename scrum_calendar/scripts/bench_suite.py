@@ -0,0 +1,313 @@
+"""Throughput and p50/p95/p99 latency of the key endpoints on a synthetic dataset.
+
+Usage: python -m scripts.bench_suite [--scale 0.05] [--output bench.json] [--compare previous.json]
+Requests go through the ASGI app in-process (TestClient) against a throwaway
+SQLite file filled by ``scripts.bench_dataset``; pass ``--database-url`` with
+an empty database to measure Postgres instead.
+"""
+
+import argparse
+import csv
+import io
+import json
+import subprocess
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy import and_, create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+import data.db as db
+import main as main_mod
+from config.settings import settings
+from data.db import engine_options
+from data.models import Base, Task, now_py
+from scripts.bench_dataset import Dataset, generate
+
+DEFAULT_ITERATIONS = {
+    "list_release_items_page": 50,
+    "list_release_items_celula": 10,
+    "list_tasks_celula": 20,
+    "list_eventos_page": 50,
+    "list_personas": 20,
+    "capacity_sprint": 30,
+    "reports_velocity": 30,
+    "tasks_cascade": 30,
+    "overdue_reset": 3,
+    "import_sprint_items": 3,
+    "ws_fanout": 20,
+}
+IMPORT_ROWS = 2_000
+WS_CLIENTS = 20
+IMPORT_HEADERS = [
+    "Issue Type",
+    "Issue Key",
+    "Summary",
+    "Status",
+    "Custom field (Story Points)",
+    "Assignee",
+    "Custom field (Start Date)",
+    "Custom field (End Date)",
+    "Due Date",
+    "Sprint",
+]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(durations: list[float], errors: int, wall: float) -> dict:
+    ordered = sorted(durations)
+    return {
+        "iterations": len(durations),
+        "errors": errors,
+        "throughput_rps": round(len(durations) / wall, 2) if wall else None,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+def run_scenario(
+    iterations: int,
+    call: Callable[[int], bool],
+    prepare: Optional[Callable[[int], None]] = None,
+) -> dict:
+    durations: list[float] = []
+    errors = 0
+    wall = 0.0
+    for idx in range(iterations):
+        if prepare:
+            prepare(idx)
+        started = time.perf_counter()
+        ok = call(idx)
+        elapsed = time.perf_counter() - started
+        wall += elapsed
+        durations.append(elapsed)
+        errors += 0 if ok else 1
+    return summarize(durations, errors, wall)
+
+
+def import_csv(dataset: Dataset, celula_id: int, rows: int) -> bytes:
+    code = dataset.jira_codes[celula_id]
+    sprint_id = dataset.sprints_by_celula[celula_id][0]
+    personas = dataset.personas_by_celula.get(celula_id) or [(None, "")]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(IMPORT_HEADERS)
+    for idx in range(rows):
+        writer.writerow(
+            [
+                "Task",
+                f"{code}-IMP{idx}",
+                f"Importado {idx}",
+                "In Progress" if idx % 4 else "Done",
+                idx % 8,
+                personas[idx % len(personas)][1],
+                "2025-01-07",
+                "2025-01-10" if idx % 4 == 0 else "",
+                "2025-01-17",
+                dataset.sprint_names[sprint_id],
+            ]
+        )
+    return buffer.getvalue().encode("utf-8")
+
+
+def ws_fanout(client: TestClient, token: str, clients: int, iterations: int) -> dict:
+    """Time from one ``join`` until every connected socket sees it in the
+    presence broadcast."""
+    contexts = [client.websocket_connect(f"/ws/retros/{token}") for _ in range(clients)]
+    sockets = [context.__enter__() for context in contexts]
+    try:
+
+        def call(idx: int) -> bool:
+            marker = f"bench-{idx}-{time.perf_counter_ns()}"
+            sockets[0].send_text(json.dumps({"type": "join", "persona_id": None, "nombre": marker}))
+            for socket in sockets:
+                while marker not in json.dumps(socket.receive_json()):
+                    pass
+            return True
+
+        return run_scenario(iterations, call)
+    finally:
+        for context in reversed(contexts):
+            context.__exit__(None, None, None)
+
+
+def run_suite(client: TestClient, session_factory, dataset: Dataset, iterations: dict) -> dict:
+    celula_ids = dataset.celula_ids
+    sprint_ids = dataset.sprint_ids
+    children = dataset.child_task_ids or [1]
+
+    def get(url, **params) -> Callable[[int], bool]:
+        def call(idx: int) -> bool:
+            resolved = {key: value(idx) if callable(value) else value for key, value in params.items()}
+            return client.get(url(idx) if callable(url) else url, params=resolved).status_code == 200
+
+        return call
+
+    def cascade(idx: int) -> bool:
+        task_id = children[idx % len(children)]
+        estado = "doing" if (idx // len(children)) % 2 == 0 else "todo"
+        return client.put(f"/tasks/{task_id}", json={"estado": estado}).status_code == 200
+
+    def age_tasks(_: int) -> None:
+        session = session_factory()
+        try:
+            overdue = now_py().date() - timedelta(days=3)
+            session.execute(
+                update(Task)
+                .where(and_(Task.id % 7 == 0, ~Task.estado.in_(("done", "archived"))))
+                .values(fecha_vencimiento=overdue)
+            )
+            session.commit()
+        finally:
+            session.close()
+
+    payload = import_csv(dataset, celula_ids[0], IMPORT_ROWS)
+
+    def import_items(_: int) -> bool:
+        files = {"file": ("bench.csv", payload, "text/csv")}
+        return client.post("/imports/sprint-items", files=files).status_code == 200
+
+    scenarios = {
+        "list_release_items_page": lambda n: run_scenario(n, get("/release-items", limit=200)),
+        "list_release_items_celula": lambda n: run_scenario(
+            n, get("/release-items", celula_id=lambda idx: celula_ids[idx % len(celula_ids)])
+        ),
+        "list_tasks_celula": lambda n: run_scenario(
+            n, get("/tasks", celula_id=lambda idx: celula_ids[idx % len(celula_ids)])
+        ),
+        "list_eventos_page": lambda n: run_scenario(n, get("/eventos", limit=200)),
+        "list_personas": lambda n: run_scenario(n, get("/personas")),
+        "capacity_sprint": lambda n: run_scenario(
+            n, get(lambda idx: f"/sprints/{sprint_ids[idx % len(sprint_ids)]}/capacidad")
+        ),
+        "reports_velocity": lambda n: run_scenario(
+            n, get("/reports/velocity", celula_id=lambda idx: celula_ids[idx % len(celula_ids)])
+        ),
+        "tasks_cascade": lambda n: run_scenario(n, cascade),
+        "overdue_reset": lambda n: run_scenario(
+            n, lambda _: client.post("/tasks/overdue-to-today").status_code == 200, age_tasks
+        ),
+        "import_sprint_items": lambda n: run_scenario(n, import_items),
+        "ws_fanout": lambda n: ws_fanout(client, dataset.retro_token, WS_CLIENTS, n),
+    }
+    results = {}
+    for name, scenario in scenarios.items():
+        if iterations.get(name, 0) > 0:
+            results[name] = scenario(iterations[name])
+            print(f"{name}: {results[name]}")
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, previous: dict) -> list[str]:
+    lines = [f"{'scenario':<28}{'p95 before':>12}{'p95 now':>12}{'delta':>10}"]
+    for name, stats in current["scenarios"].items():
+        before = (previous.get("scenarios") or {}).get(name)
+        if not before or not before.get("p95_ms"):
+            lines.append(f"{name:<28}{'-':>12}{stats['p95_ms']:>12}{'new':>10}")
+            continue
+        delta = (stats["p95_ms"] - before["p95_ms"]) * 100.0 / before["p95_ms"]
+        lines.append(f"{name:<28}{before['p95_ms']:>12}{stats['p95_ms']:>12}{delta:>+9.1f}%")
+    return lines
+
+
+def bind_app(engine) -> sessionmaker:
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db.engine = engine
+    db.SessionLocal = session_factory
+    main_mod.engine = engine
+    main_mod.SessionLocal = session_factory
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    return session_factory
+
+
+def run(database_url: str, scale: float, iterations: dict) -> dict:
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args, **engine_options(database_url))
+    Base.metadata.create_all(bind=engine)
+    session_factory = bind_app(engine)
+    # Keep the per-request detectors quiet; the suite measures, it does not police.
+    settings.n_plus_one_threshold = 0
+    settings.slow_request_ms = 10**9
+    started = time.perf_counter()
+    session = session_factory()
+    try:
+        dataset = generate(session, scale)
+    finally:
+        session.close()
+    dataset_seconds = round(time.perf_counter() - started, 2)
+    print(f"dataset {dataset.volumes} in {dataset_seconds}s")
+    with TestClient(main_mod.app) as client:
+        resp = client.post("/auth/bootstrap", json={"username": "bench", "password": "bench"})
+        resp.raise_for_status()
+        scenarios = run_suite(client, session_factory, dataset, iterations)
+    main_mod.app.dependency_overrides.clear()
+    engine.dispose()
+    return {
+        "commit": git_commit(),
+        "created_at": now_py().isoformat(),
+        "database": engine.dialect.name,
+        "scale": scale,
+        "volumes": dataset.volumes,
+        "dataset_seconds": dataset_seconds,
+        "scenarios": scenarios,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--database-url", help="empty database; defaults to a temporary SQLite file")
+    parser.add_argument("--iterations", type=float, default=1.0, help="multiplier for per-scenario iterations")
+    parser.add_argument("--only", nargs="+", choices=sorted(DEFAULT_ITERATIONS), help="run a subset")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="previous --output file to diff p95 against")
+    args = parser.parse_args()
+    iterations = {
+        name: max(1, int(round(count * args.iterations)))
+        for name, count in DEFAULT_ITERATIONS.items()
+        if not args.only or name in args.only
+    }
+    if args.database_url:
+        report = run(args.database_url, args.scale, iterations)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'bench.db'}", args.scale, iterations)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    if args.compare:
+        print("\n".join(compare(report, json.loads(args.compare.read_text(encoding="utf-8")))))
+
+
+if __name__ == "__main__":
+    main()
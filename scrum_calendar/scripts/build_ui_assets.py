@@ -0,0 +1,86 @@
+"""Precompress the /ui bundle into .gz (and .br when brotli is installed).
+
+Usage: python -m scripts.build_ui_assets [--min-bytes 1024] [--clean]
+UIStaticFiles serves a variant only when it is not older than its source, so
+re-run this after editing assets (the Docker image runs it at build time).
+"""
+
+import argparse
+import gzip
+import os
+from pathlib import Path
+
+from app.shared.interface.static_assets import COMPRESSIBLE_EXTENSIONS, PRECOMPRESSED_VARIANTS
+
+try:
+    import brotli
+except ImportError:  # optional: gzip alone already covers every browser
+    brotli = None
+
+ROOT = Path(__file__).resolve().parents[1]
+UI_DIRS = (ROOT / "ScrumV2" / "dist", ROOT / "frontend")
+
+
+def _compress(encoding: str, payload: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(payload, quality=11)
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def build(directory: Path, min_bytes: int) -> dict:
+    encodings = [(name, suffix) for name, suffix in PRECOMPRESSED_VARIANTS if name != "br" or brotli is not None]
+    stats = {"files": 0, "written": 0, "bytes_in": 0, "bytes_out": 0}
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or not path.name.endswith(COMPRESSIBLE_EXTENSIONS):
+            continue
+        payload = path.read_bytes()
+        if len(payload) < min_bytes:
+            continue
+        stats["files"] += 1
+        stats["bytes_in"] += len(payload)
+        for encoding, suffix in encodings:
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime >= path.stat().st_mtime:
+                stats["bytes_out"] += target.stat().st_size
+                continue
+            compressed = _compress(encoding, payload)
+            if len(compressed) >= len(payload):
+                continue
+            target.write_bytes(compressed)
+            stats["written"] += 1
+            stats["bytes_out"] += len(compressed)
+    return stats
+
+
+def clean(directory: Path) -> int:
+    removed = 0
+    for _, suffix in PRECOMPRESSED_VARIANTS:
+        for path in directory.rglob(f"*{suffix}"):
+            if path.name[: -len(suffix)].endswith(COMPRESSIBLE_EXTENSIONS):
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-bytes", type=int, default=1024)
+    parser.add_argument("--clean", action="store_true", help="remove precompressed variants instead")
+    args = parser.parse_args()
+    for directory in UI_DIRS:
+        if not directory.exists():
+            continue
+        if args.clean:
+            print(f"{directory.relative_to(ROOT)}: removed {clean(directory)} variants")
+            continue
+        stats = build(directory, args.min_bytes)
+        print(
+            f"{directory.relative_to(ROOT)}: {stats['files']} assets, {stats['written']} variants written"
+            f" ({stats['bytes_in']} -> {stats['bytes_out']} bytes across encodings)"
+        )
+    if brotli is None and not args.clean:
+        print("brotli not installed: only .gz variants were produced")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from app.modules.reports.application.use_cases import rebuild_release_reports
+from data.db import SessionLocal
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        totals = rebuild_release_reports(db)
+        db.commit()
+        print(
+            f"Reportes reconstruidos: {totals['sprints']} sprints (sprint_metrics), "
+            f"{totals['celulas']} celulas (quarter_rollups)."
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""Overdue-to-today reset for every user; schedule once per business day (cron).
+
+Usage: python -m scripts.reset_overdue_tasks
+Safe next to OVERDUE_RESET_JOB_ENABLED workers: whichever runs first wins the day.
+"""
+
+from app.modules.tasks.interface.jobs import run_daily_overdue_reset
+
+
+def main() -> None:
+    changed = run_daily_overdue_reset()
+    if changed is None:
+        print("Reset de tareas vencidas omitido: dia no habil o ya ejecutado hoy.")
+    else:
+        print(f"Reset de tareas vencidas: {changed} tareas actualizadas.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""WebSocket load test for retro and poker rooms.
+
+Usage: python -m scripts.ws_load [--rooms 10] [--participants 30] [--rounds 5] [--output ws.json]
+Starts the app under uvicorn on a local port (temporary SQLite by default,
+``--database-url`` for an empty local Postgres), seeds one retro and one
+poker session per room, then every participant joins, pings, and sends
+``submit_item`` / ``submit_vote`` each round. Reports ack and broadcast
+latency plus deliveries that never arrived.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+import websockets
+from sqlalchemy import create_engine, insert
+
+import main as main_mod
+from data.db import engine_options
+from data.models import Base, Celula, Persona, PokerSession, Retrospective, Sprint, persona_celulas
+from scripts.bench_suite import bind_app, summarize
+
+POKER_VALUES = (1, 2, 3, 5, 8, 13, 21)
+
+
+@dataclass
+class Room:
+    kind: str
+    token: str
+    personas: list[int]
+
+
+@dataclass
+class KindStats:
+    sends: int = 0
+    expected: int = 0
+    delivered: int = 0
+    submit_errors: int = 0
+    connect_errors: int = 0
+    closed_early: int = 0
+    ack_latencies: list[float] = field(default_factory=list)
+    broadcast_latencies: list[float] = field(default_factory=list)
+
+    def report(self) -> dict:
+        ack = summarize(self.ack_latencies, 0, sum(self.ack_latencies))
+        broadcast = summarize(self.broadcast_latencies, 0, sum(self.broadcast_latencies))
+        return {
+            "sends": self.sends,
+            "expected_deliveries": self.expected,
+            "delivered": self.delivered,
+            "dropped": self.expected - self.delivered,
+            "submit_errors": self.submit_errors,
+            "connect_errors": self.connect_errors,
+            "closed_early": self.closed_early,
+            "ack": {key: ack[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")},
+            "broadcast": {key: broadcast[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")},
+        }
+
+
+def seed_rooms(session_factory, rooms: int, participants: int) -> list[Room]:
+    session = session_factory()
+    try:
+        result: list[Room] = []
+        start = date(2026, 1, 5)
+        for idx in range(rooms):
+            celula_id = session.execute(
+                insert(Celula).values(nombre=f"Celula WS {idx}", jira_codigo=f"WS{idx:02d}", activa=True)
+            ).inserted_primary_key[0]
+            personas = []
+            for member in range(participants):
+                persona_id = session.execute(
+                    insert(Persona).values(
+                        nombre=f"Ws{idx}",
+                        apellido=f"Persona{member}",
+                        rol="Dev",
+                        capacidad_diaria_horas=7,
+                        activo=True,
+                    )
+                ).inserted_primary_key[0]
+                session.execute(insert(persona_celulas).values(persona_id=persona_id, celula_id=celula_id))
+                personas.append(persona_id)
+            sprint_id = session.execute(
+                insert(Sprint).values(
+                    nombre=f"WS Sprint {idx}",
+                    celula_id=celula_id,
+                    fecha_inicio=start,
+                    fecha_fin=start + timedelta(days=13),
+                )
+            ).inserted_primary_key[0]
+            retro_token, poker_token = f"ws-retro-{idx}", f"ws-poker-{idx}"
+            session.execute(
+                insert(Retrospective).values(
+                    celula_id=celula_id, sprint_id=sprint_id, token=retro_token, estado="abierta", fase="bien"
+                )
+            )
+            session.execute(
+                insert(PokerSession).values(
+                    celula_id=celula_id, token=poker_token, estado="abierta", fase="votacion"
+                )
+            )
+            result.append(Room("retro", retro_token, personas))
+            result.append(Room("poker", poker_token, personas))
+        session.commit()
+        return result
+    finally:
+        session.close()
+
+
+class Participant:
+    def __init__(self, room: Room, persona_id: int, stats: KindStats, pending: dict) -> None:
+        self.room = room
+        self.persona_id = persona_id
+        self.stats = stats
+        # Broadcast key -> send timestamp, shared by everyone in the room.
+        self.pending = pending
+        self.acks: asyncio.Queue = asyncio.Queue()
+        self.ws = None
+        self.audience = 0
+
+    def broadcast_key(self, payload: dict) -> Optional[str]:
+        if self.room.kind == "retro" and payload.get("type") == "item_added":
+            return (payload.get("item") or {}).get("detalle")
+        if self.room.kind == "poker" and payload.get("type") == "vote_cast":
+            return f"{payload.get('persona_id')}:{payload.get('valor')}"
+        return None
+
+    async def listen(self) -> None:
+        try:
+            async for message in self.ws:
+                received = time.perf_counter()
+                payload = json.loads(message)
+                kind = payload.get("type")
+                if kind in {"submit_ack", "submit_error"}:
+                    await self.acks.put((kind, received))
+                    continue
+                key = self.broadcast_key(payload)
+                sent = self.pending.get(key) if key else None
+                if sent is not None:
+                    self.stats.delivered += 1
+                    self.stats.broadcast_latencies.append(received - sent)
+        except websockets.ConnectionClosed:
+            self.stats.closed_early += 1
+
+    async def submit(self, round_idx: int) -> None:
+        if self.room.kind == "retro":
+            key = f"aporte {self.room.token} {self.persona_id} {round_idx}"
+            item = {"tipo": "bien", "detalle": key, "persona_id": self.persona_id}
+            message = {"type": "submit_item", "item": item}
+        else:
+            # Consecutive rounds use different values so vote_cast stays unique.
+            valor = POKER_VALUES[(self.persona_id + round_idx) % len(POKER_VALUES)]
+            key = f"{self.persona_id}:{valor}"
+            message = {"type": "submit_vote", "vote": {"persona_id": self.persona_id, "valor": valor}}
+        sent = time.perf_counter()
+        self.pending[key] = sent
+        self.stats.sends += 1
+        self.stats.expected += self.audience
+        await self.ws.send(json.dumps(message))
+        try:
+            kind, received = await asyncio.wait_for(self.acks.get(), timeout=10)
+        except asyncio.TimeoutError:
+            self.stats.submit_errors += 1
+            return
+        if kind == "submit_error":
+            self.stats.submit_errors += 1
+        else:
+            self.stats.ack_latencies.append(received - sent)
+
+
+async def run_room(
+    base_url: str,
+    room: Room,
+    stats: KindStats,
+    rounds: int,
+    ping_every: float,
+    drain: float,
+) -> None:
+    pending: dict = {}
+    participants = [Participant(room, persona_id, stats, pending) for persona_id in room.personas]
+    path = "retros" if room.kind == "retro" else "poker"
+    for participant in participants:
+        try:
+            participant.ws = await websockets.connect(f"{base_url}/ws/{path}/{room.token}")
+        except (OSError, websockets.WebSocketException):
+            stats.connect_errors += 1
+    connected = [participant for participant in participants if participant.ws is not None]
+    for participant in connected:
+        participant.audience = len(connected)
+    listeners = [asyncio.create_task(participant.listen()) for participant in connected]
+    for participant in connected:
+        await participant.ws.send(
+            json.dumps(
+                {"type": "join", "persona_id": participant.persona_id, "nombre": f"P{participant.persona_id}"}
+            )
+        )
+
+    async def pinger() -> None:
+        while True:
+            await asyncio.sleep(ping_every)
+            for participant in connected:
+                try:
+                    await participant.ws.send("ping")
+                except websockets.ConnectionClosed:
+                    pass
+
+    ping_task = asyncio.create_task(pinger())
+    for round_idx in range(rounds):
+        await asyncio.gather(*[participant.submit(round_idx) for participant in connected], return_exceptions=True)
+    await asyncio.sleep(drain)
+    ping_task.cancel()
+    for participant in connected:
+        await participant.ws.close()
+    await asyncio.gather(*listeners, return_exceptions=True)
+
+
+async def run_load(base_url: str, rooms: list[Room], rounds: int, ping_every: float, drain: float) -> dict:
+    stats = {"retro": KindStats(), "poker": KindStats()}
+    started = time.perf_counter()
+    await asyncio.gather(*[run_room(base_url, room, stats[room.kind], rounds, ping_every, drain) for room in rooms])
+    elapsed = time.perf_counter() - started
+    return {"seconds": round(elapsed, 2), **{kind: value.report() for kind, value in stats.items()}}
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def serve(port: int) -> tuple[uvicorn.Server, threading.Thread]:
+    server = uvicorn.Server(uvicorn.Config(main_mod.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn did not start")
+        time.sleep(0.05)
+    return server, thread
+
+
+def run(database_url: str, rooms: int, participants: int, rounds: int, ping_every: float, drain: float) -> dict:
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args, **engine_options(database_url))
+    Base.metadata.create_all(bind=engine)
+    session_factory = bind_app(engine)
+    seeded = seed_rooms(session_factory, rooms, participants)
+    port = free_port()
+    server, thread = serve(port)
+    try:
+        results = asyncio.run(run_load(f"ws://127.0.0.1:{port}", seeded, rounds, ping_every, drain))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        main_mod.app.dependency_overrides.clear()
+        engine.dispose()
+    return {
+        "database": engine.dialect.name,
+        "rooms": rooms,
+        "participants": participants,
+        "rounds": rounds,
+        **results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--participants", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--ping-every", type=float, default=2.0)
+    parser.add_argument("--drain", type=float, default=2.0, help="seconds to wait for late broadcasts")
+    parser.add_argument("--database-url", help="empty database; defaults to a temporary SQLite file")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+    options = (args.rooms, args.participants, args.rounds, args.ping_every, args.drain)
+    if args.database_url:
+        report = run(args.database_url, *options)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'ws_load.db'}", *options)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
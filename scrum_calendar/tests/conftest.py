@@ -1,7 +1,43 @@
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
+
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from config.settings import settings  # noqa: E402
+from core.instrumentation import capture_queries  # noqa: E402
+
+
+def _query_report(stats) -> str:
+    lines = [f"{stats.queries} statements executed:"]
+    for entry in stats.top_queries(len(stats.statements)):
+        lines.append(f"  {entry['count']:>4}x {entry['statement']}")
+    return "\n".join(lines)
+
+
+@pytest.fixture()
+def max_queries():
+    """Query budget for the calls inside the block::
+
+        with max_queries(4):
+            client.get("/celulas")
+
+    Fails when more than ``limit`` statements run or when one statement shape
+    repeats ``repeat`` times or more (defaults to ``n_plus_one_threshold``).
+    """
+
+    @contextmanager
+    def budget(limit: int, repeat=None):
+        with capture_queries() as stats:
+            yield stats
+        assert stats.queries <= limit, f"query budget {limit} exceeded\n{_query_report(stats)}"
+        threshold = settings.n_plus_one_threshold if repeat is None else repeat
+        repeated = stats.repeated(threshold)
+        assert not repeated, f"repeated statements (N+1?)\n{_query_report(stats)}"
+
+    return budget
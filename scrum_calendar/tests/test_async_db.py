@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import data.db as db
+from config.settings import settings
+from data.models import Base, Celula
+
+
+@pytest.fixture()
+def sqlite_db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "SessionLocal", session_local)
+    session = session_local()
+    session.add(Celula(nombre="Celula A", jira_codigo="CA", activa=True))
+    session.commit()
+    session.close()
+    yield engine
+    engine.dispose()
+
+
+def count_celulas(session) -> int:
+    return session.query(Celula).count()
+
+
+def test_async_database_url_maps_sync_drivers():
+    url = "postgresql+psycopg2://u:p@db:5432/scrum"
+    assert db.async_database_url(url) == "postgresql+asyncpg://u:p@db:5432/scrum"
+    assert db.async_database_url("postgresql://db/scrum") == "postgresql+asyncpg://db/scrum"
+    assert db.async_database_url("sqlite:////tmp/x.db") == "sqlite+aiosqlite:////tmp/x.db"
+    assert db.async_database_url("mysql+pymysql://db/scrum") is None
+
+
+def test_async_pool_is_sized_separately_from_the_sync_pool(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 10)
+    monkeypatch.setattr(settings, "db_max_overflow", 10)
+    monkeypatch.setattr(settings, "async_db_pool_size", 3)
+    monkeypatch.setattr(settings, "async_db_max_overflow", 1)
+    url = "postgresql+psycopg2://u:p@db:5432/scrum"
+    sync_options = db.engine_options(url)
+    async_options = db.engine_options(db.async_database_url(url), use_async=True)
+    assert (sync_options["pool_size"], sync_options["max_overflow"]) == (10, 10)
+    assert (async_options["pool_size"], async_options["max_overflow"]) == (3, 1)
+
+
+def test_run_db_falls_back_to_a_sync_session_when_async_is_disabled(sqlite_db, monkeypatch):
+    monkeypatch.setattr(settings, "async_db_enabled", False)
+    assert db.async_session_factory() is None
+    assert asyncio.run(db.run_db(count_celulas)) == 1
+    assert asyncio.run(db.run_ws_db(count_celulas)) == 1
+
+
+def test_run_db_uses_the_async_driver_for_the_current_engine(sqlite_db):
+    pytest.importorskip("aiosqlite")
+    factory = db.async_session_factory()
+    assert factory is not None
+    assert factory.kw["bind"].url.drivername == "sqlite+aiosqlite"
+    assert asyncio.run(db.run_db(count_celulas)) == 1
@@ -0,0 +1,96 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import main as main_mod
+import data.db as db
+from data.models import Base
+
+
+@pytest.fixture()
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db.engine = engine
+    db.SessionLocal = testing_session_local
+    main_mod.engine = engine
+    main_mod.SessionLocal = testing_session_local
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        session = testing_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as test_client:
+        test_client.engine = engine
+        yield test_client
+    main_mod.app.dependency_overrides.clear()
+
+
+def bootstrap_admin(client: TestClient) -> None:
+    resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+    assert resp.status_code == 200
+
+
+def test_catalog_list_returns_304_until_a_write_bumps_the_version(client: TestClient):
+    bootstrap_admin(client)
+    resp = client.post("/celulas", json={"nombre": "Celula ETag", "jira_codigo": "ETG", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+
+    first = client.get("/celulas")
+    assert first.status_code == 200
+    assert [row["nombre"] for row in first.json()] == ["Celula ETag"]
+    etag = first.headers["ETag"]
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.lower())
+
+    event.listen(client.engine, "before_cursor_execute", record)
+    try:
+        cached = client.get("/celulas", headers={"If-None-Match": etag})
+    finally:
+        event.remove(client.engine, "before_cursor_execute", record)
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert not any("from celulas" in statement for statement in statements)
+
+    resp = client.put(f"/celulas/{celula_id}", json={"nombre": "Celula Renombrada"})
+    assert resp.status_code == 200
+    fresh = client.get("/celulas", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert [row["nombre"] for row in fresh.json()] == ["Celula Renombrada"]
+
+
+def test_catalog_etag_varies_by_query_and_tracks_related_writes(client: TestClient):
+    bootstrap_admin(client)
+    resp = client.post("/celulas", json={"nombre": "Celula Sprints", "jira_codigo": "SPR", "activa": True})
+    celula_id = resp.json()["id"]
+    sprints = client.get("/sprints")
+    assert sprints.json() == []
+    resp = client.post(
+        "/sprints",
+        json={"nombre": "Sprint 1", "celula_id": celula_id, "fecha_inicio": "2026-01-05", "fecha_fin": "2026-01-16"},
+    )
+    assert resp.status_code == 201
+    again = client.get("/sprints", headers={"If-None-Match": sprints.headers["ETag"]})
+    assert again.status_code == 200
+    assert len(again.json()) == 1
+
+    personas_all = client.get("/personas")
+    personas_page = client.get("/personas?limit=1")
+    assert personas_all.headers["ETag"] != personas_page.headers["ETag"]
+    resp = client.delete(f"/celulas/{celula_id}")
+    assert resp.status_code == 200
+    assert client.get("/personas", headers={"If-None-Match": personas_all.headers["ETag"]}).status_code == 200
+    assert client.get("/sprints").json() == []
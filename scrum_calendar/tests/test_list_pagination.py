@@ -0,0 +1,135 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import main as main_mod
+import data.db as db
+from config.settings import settings
+from api.schemas import PersonaOut, ReleaseItemOut
+from app.shared.interface.pagination import encode_cursor
+from data.models import Base
+
+
+@pytest.fixture()
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db.engine = engine
+    db.SessionLocal = testing_session_local
+    main_mod.engine = engine
+    main_mod.SessionLocal = testing_session_local
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        session = testing_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as test_client:
+        yield test_client
+    main_mod.app.dependency_overrides.clear()
+
+
+def seed_releases(client: TestClient, total: int) -> int:
+    resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+    assert resp.status_code == 200
+    resp = client.post("/celulas", json={"nombre": "Celula Paginas", "jira_codigo": "PAG", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+    for idx in range(total):
+        resp = client.post(
+            "/release-items",
+            json={
+                "celula_id": celula_id,
+                "issue_type": "Release",
+                "issue_key": f"PAG-{idx}",
+                "summary": f"Release {idx}",
+                "release_tipo": "comprometido",
+            },
+        )
+        assert resp.status_code == 201
+    return celula_id
+
+
+def test_release_items_keyset_pages_cover_full_list(client: TestClient):
+    seed_releases(client, 5)
+    full = client.get("/release-items").json()
+    assert len(full) == 5
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/release-items", params=params)
+        assert resp.status_code == 200
+        seen.extend(row["id"] for row in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [row["id"] for row in full]
+
+
+def test_release_items_projection_and_cap(client: TestClient, monkeypatch):
+    celula_id = seed_releases(client, 4)
+    resp = client.get(f"/release-items?celula_id={celula_id}&fields=issue_key,status")
+    assert resp.status_code == 200
+    assert resp.json()[0] == {"issue_key": "PAG-3", "status": "Backlog"}
+    assert "X-Next-Cursor" not in resp.headers
+
+    resp = client.get("/release-items?fields=issue_key&limit=3")
+    assert [row["issue_key"] for row in resp.json()] == ["PAG-3", "PAG-2", "PAG-1"]
+    resp = client.get("/release-items", params={"fields": "issue_key", "cursor": resp.headers["X-Next-Cursor"]})
+    assert [row["issue_key"] for row in resp.json()] == ["PAG-0"]
+
+    monkeypatch.setattr(settings, "list_page_size_max", 2)
+    resp = client.get("/release-items?limit=500")
+    assert len(resp.json()) == 2
+    assert resp.headers.get("X-Next-Cursor")
+
+    assert client.get("/release-items?fields=celula").status_code == 400
+    assert client.get("/release-items?cursor=not-a-cursor").status_code == 400
+
+
+def test_personas_page_by_id_without_creado_en(client: TestClient):
+    seed_releases(client, 0)
+    for idx in range(3):
+        resp = client.post(
+            "/personas",
+            json={"nombre": f"P{idx}", "apellido": "Test", "rol": "Dev", "capacidad_diaria_horas": 7},
+        )
+        assert resp.status_code == 201, resp.text
+    first = client.get("/personas?limit=2&fields=id,nombre")
+    assert [row["nombre"] for row in first.json()] == ["P2", "P1"]
+    rest = client.get("/personas", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [row["nombre"] for row in rest.json()] == ["P0"]
+
+    # Every page is serialized the same way, the last one included.
+    full = client.get("/personas", params={"limit": 2})
+    last = client.get("/personas", params={"limit": 2, "cursor": full.headers["X-Next-Cursor"]})
+    assert "X-Next-Cursor" not in last.headers
+    assert [set(row) for row in full.json() + last.json()] == [set(PersonaOut.model_fields)] * 3
+
+
+def test_cursor_without_creado_en_is_rejected_for_dated_models(client: TestClient):
+    seed_releases(client, 2)
+    resp = client.get("/release-items", params={"limit": 1, "cursor": encode_cursor(None, 99)})
+    assert resp.status_code == 400
+
+
+def test_fast_path_lists_match_response_schema(client: TestClient):
+    celula_id = seed_releases(client, 2)
+    rows = client.get(f"/release-items?celula_id={celula_id}").json()
+    assert [set(row) for row in rows] == [set(ReleaseItemOut.model_fields)] * 2
+    assert [ReleaseItemOut.model_validate(row).issue_key for row in rows] == ["PAG-1", "PAG-0"]
+
+    resp = client.post("/tasks", json={"titulo": "Tarea rapida", "celula_id": celula_id})
+    assert resp.status_code == 201
+    tasks = client.get("/tasks").json()
+    assert tasks == [resp.json()]
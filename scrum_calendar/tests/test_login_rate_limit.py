@@ -0,0 +1,111 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import api.routes as routes_mod
+import core.rate_limit as rate_limit
+import data.db as db
+import main as main_mod
+from data.models import Base, LoginRateLimit
+from core.rate_limit import DatabaseLoginRateLimiter, MemoryLoginRateLimiter, RateLimitState
+
+
+@pytest.fixture()
+def session_local(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "SessionLocal", testing_session_local)
+    monkeypatch.setattr(main_mod, "engine", engine)
+    monkeypatch.setattr(main_mod, "SessionLocal", testing_session_local)
+    Base.metadata.create_all(bind=engine)
+    yield testing_session_local
+    engine.dispose()
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = {"ts": 1_000_000.0}
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now["ts"])
+    return now
+
+
+@pytest.mark.parametrize("backend", [MemoryLoginRateLimiter, DatabaseLoginRateLimiter])
+def test_blocks_after_max_attempts_and_success_clears(backend, session_local, clock):
+    limiter = backend(3, 100, 60)
+    for _ in range(2):
+        limiter.fail("ip::ana")
+    assert limiter.check("ip::ana") == (True, 0)
+    limiter.fail("ip::ana")
+    assert limiter.check("ip::ana") == (False, 60)
+    clock["ts"] += 61
+    assert limiter.check("ip::ana") == (True, 0)
+
+    limiter.fail("ip::luis")
+    limiter.success("ip::luis")
+    limiter.fail("ip::luis")
+    limiter.fail("ip::luis")
+    assert limiter.check("ip::luis") == (True, 0)
+
+
+def test_previous_window_is_weighted_by_overlap():
+    limiter = MemoryLoginRateLimiter(4, 100, 60)
+    state = RateLimitState(window=9_999, attempts=3)
+    # 25% into the next window, three earlier failures still weigh 2.25.
+    assert limiter.estimate(state, 1_000_025.0) == pytest.approx(2.25)
+    assert limiter.estimate(state, 1_000_100.0) == 0.0
+    blocked = limiter.record_failure(limiter.record_failure(state, 1_000_025.0), 1_000_026.0)
+    assert blocked.blocked_until == 1_000_026.0 + 60
+
+
+def test_database_backend_is_shared_between_workers(session_local, clock):
+    worker_a = DatabaseLoginRateLimiter(4, 100, 60)
+    worker_b = DatabaseLoginRateLimiter(4, 100, 60)
+    worker_a.fail("ip::ana")
+    worker_b.fail("ip::ana")
+    worker_a.fail("ip::ana")
+    assert worker_b.check("ip::ana") == (True, 0)
+    worker_b.fail("ip::ana")
+    assert worker_a.check("ip::ana") == (False, 60)
+
+
+def test_prune_drops_expired_rows_only(session_local, clock):
+    limiter = DatabaseLoginRateLimiter(2, 100, 500)
+    limiter.fail("ip::old")
+    limiter.fail("ip::blocked")
+    limiter.fail("ip::blocked")
+    clock["ts"] += 300
+    limiter.fail("ip::new")
+
+    session = session_local()
+    try:
+        assert {row.clave for row in session.query(LoginRateLimit)} == {"ip::blocked", "ip::new"}
+    finally:
+        session.close()
+
+
+def test_login_returns_429_from_the_configured_backend(session_local, monkeypatch):
+    monkeypatch.setattr(routes_mod, "LOGIN_RATE_LIMITER", DatabaseLoginRateLimiter(2, 900, 900))
+
+    def override_get_db():
+        session = session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    try:
+        with TestClient(main_mod.app) as client:
+            resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+            assert resp.status_code == 200
+            client.post("/auth/logout")
+            for _ in range(2):
+                resp = client.post("/auth/login", json={"username": "admin", "password": "wrong"})
+                assert resp.status_code == 401
+            resp = client.post("/auth/login", json={"username": "admin", "password": "secret"})
+            assert resp.status_code == 429
+            assert int(resp.headers["Retry-After"]) > 0
+    finally:
+        main_mod.app.dependency_overrides.clear()
@@ -0,0 +1,134 @@
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import sessionmaker
+
+import main as main_mod
+import data.db as db
+from config.settings import settings
+from core.instrumentation import METRICS, POOL_METRICS, TimedQueuePool
+from data.models import Base
+
+
+@pytest.fixture()
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db.engine = engine
+    db.SessionLocal = testing_session_local
+    main_mod.engine = engine
+    main_mod.SessionLocal = testing_session_local
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        session = testing_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    METRICS.reset()
+    with TestClient(main_mod.app) as test_client:
+        yield test_client
+    main_mod.app.dependency_overrides.clear()
+
+
+def bootstrap_admin(client: TestClient) -> None:
+    resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+    assert resp.status_code == 200
+
+
+def metric_value(body: str, prefix: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} not found")
+
+
+def test_metrics_reports_route_latency_and_db_usage(client: TestClient):
+    bootstrap_admin(client)
+    for _ in range(3):
+        assert client.get("/celulas").status_code == 200
+    assert client.get("/celulas/999/sprints").status_code in {200, 404}
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    labels = '{method="GET",route="/celulas"}'
+    assert metric_value(body, f"scrum_http_request_duration_seconds_count{labels}") == 3
+    inf_bucket = 'scrum_http_request_duration_seconds_bucket{method="GET",route="/celulas",le="+Inf"}'
+    assert metric_value(body, inf_bucket) == 3
+    assert metric_value(body, 'scrum_http_responses_total{method="GET",route="/celulas",status="200"}') == 3
+    # Session lookup in auth_middleware plus the handler's own queries.
+    assert metric_value(body, f"scrum_db_queries_per_request_sum{labels}") >= 6
+    assert metric_value(body, f"scrum_db_query_seconds_total{labels}") > 0
+
+
+def test_metrics_is_admin_only(client: TestClient):
+    assert client.get("/metrics").status_code == 401
+    bootstrap_admin(client)
+    resp = client.post(
+        "/usuarios",
+        json={"username": "member", "password": "secret", "rol": "member", "activo": True},
+    )
+    assert resp.status_code == 201
+    client.post("/auth/logout")
+    assert client.post("/auth/login", json={"username": "member", "password": "secret"}).status_code == 200
+    assert client.get("/metrics").status_code == 403
+
+
+def test_slow_requests_are_logged_with_top_queries(client: TestClient, monkeypatch):
+    records = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            records.append(json.loads(record.getMessage()))
+
+    handler = Capture()
+    logger = logging.getLogger("scrum.perf")
+    logger.addHandler(handler)
+    monkeypatch.setattr(settings, "slow_request_ms", 0)
+    try:
+        bootstrap_admin(client)
+        assert client.get("/celulas").status_code == 200
+    finally:
+        logger.removeHandler(handler)
+
+    entry = next(item for item in records if item["route"] == "/celulas")
+    assert entry["event"] == "slow_request"
+    assert entry["db_queries"] >= 1
+    assert entry["top_queries"]
+    assert {"statement", "count", "ms"} <= set(entry["top_queries"][0])
+
+
+def test_metrics_reports_pool_checkout_wait_and_saturation(client: TestClient, tmp_path, monkeypatch):
+    bootstrap_admin(client)
+    POOL_METRICS.reset()
+    pooled = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        connect_args={"check_same_thread": False},
+    )
+    held = pooled.connect()
+    try:
+        with pytest.raises(exc.TimeoutError):
+            pooled.connect()
+        monkeypatch.setattr(main_mod, "engine", pooled)
+        body = client.get("/metrics").text
+    finally:
+        held.close()
+        pooled.dispose()
+
+    assert metric_value(body, "scrum_db_pool_size") == 1
+    assert metric_value(body, "scrum_db_pool_checked_out") == 1
+    assert metric_value(body, "scrum_db_pool_checkout_wait_seconds_count") == 1
+    assert metric_value(body, "scrum_db_pool_timeouts_total") == 1
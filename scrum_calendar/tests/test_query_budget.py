@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import main as main_mod
+import data.db as db
+from data.models import Base, Persona, Retrospective, RetrospectiveItem, Sprint
+
+
+@pytest.fixture()
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db.engine = engine
+    db.SessionLocal = testing_session_local
+    main_mod.engine = engine
+    main_mod.SessionLocal = testing_session_local
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        session = testing_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as test_client:
+        test_client.session_factory = testing_session_local
+        yield test_client
+    main_mod.app.dependency_overrides.clear()
+
+
+def seed(client: TestClient, retros: int) -> int:
+    resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+    assert resp.status_code == 200
+    resp = client.post("/celulas", json={"nombre": "Celula Budget", "jira_codigo": "BGT", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+    session = client.session_factory()
+    try:
+        start = date(2026, 1, 5)
+        for idx in range(retros):
+            persona = Persona(nombre=f"Persona {idx}", apellido="Budget", rol="Dev", capacidad_diaria_horas=7)
+            sprint = Sprint(
+                nombre=f"Sprint {idx}",
+                celula_id=celula_id,
+                fecha_inicio=start + timedelta(days=14 * idx),
+                fecha_fin=start + timedelta(days=14 * idx + 13),
+            )
+            session.add_all([persona, sprint])
+            session.flush()
+            retro = Retrospective(celula_id=celula_id, sprint_id=sprint.id, token=f"budget-{idx}")
+            session.add(retro)
+            session.flush()
+            session.add(
+                RetrospectiveItem(
+                    retro_id=retro.id,
+                    tipo="compromiso",
+                    detalle=f"Compromiso {idx}",
+                    asignado_id=persona.id,
+                )
+            )
+        session.commit()
+    finally:
+        session.close()
+    for idx in range(retros):
+        resp = client.post("/tasks", json={"titulo": f"Padre {idx}", "celula_id": celula_id})
+        assert resp.status_code == 201
+        child = client.post(
+            "/tasks",
+            json={"titulo": f"Hija {idx}", "celula_id": celula_id, "parent_id": resp.json()["id"]},
+        )
+        assert child.status_code == 201
+    return celula_id
+
+
+@pytest.mark.parametrize("rows", [3, 12])
+def test_list_endpoints_stay_within_query_budget(client: TestClient, max_queries, rows: int):
+    celula_id = seed(client, rows)
+    with max_queries(4):
+        assert client.get("/celulas").status_code == 200
+    with max_queries(4):
+        resp = client.get("/retros/compromisos", params={"celula_id": celula_id})
+        assert resp.status_code == 200
+        assert len(resp.json()) == rows
+        assert all(item["sprint_nombre"] and item["asignado_nombre"] for item in resp.json())
+    with max_queries(4):
+        resp = client.get("/tasks", params={"celula_id": celula_id})
+        assert resp.status_code == 200
+        assert len(resp.json()) == rows * 2
+    with max_queries(4):
+        assert client.get("/personas").status_code == 200
+
+
+def test_budget_fixture_flags_repeated_statement_shapes(client: TestClient, max_queries):
+    seed(client, 1)
+    with pytest.raises(AssertionError, match="repeated statements"):
+        with max_queries(50, repeat=3):
+            for _ in range(3):
+                client.get("/celulas")
+    with pytest.raises(AssertionError, match="query budget 1 exceeded"):
+        with max_queries(1):
+            client.get("/celulas")
+
+
+def test_responses_report_query_count_outside_production(client: TestClient):
+    seed(client, 1)
+    resp = client.get("/celulas")
+    assert resp.status_code == 200
+    assert int(resp.headers["X-DB-Queries"]) >= 1
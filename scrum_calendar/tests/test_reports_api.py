@@ -0,0 +1,284 @@
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import main as main_mod
+import data.db as db
+from data.models import Base, now_py
+
+
+@pytest.fixture(params=[False])
+def client(tmp_path, request):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    if request.param:
+        # Enforce foreign keys like Postgres does.
+        event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db.engine = engine
+    db.SessionLocal = testing_session_local
+    main_mod.engine = engine
+    main_mod.SessionLocal = testing_session_local
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        session = testing_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as test_client:
+        yield test_client
+    main_mod.app.dependency_overrides.clear()
+
+
+def seed(client: TestClient):
+    resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+    assert resp.status_code == 200
+    resp = client.post("/celulas", json={"nombre": "Celula Reportes", "jira_codigo": "REP", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+    today = now_py().date()
+    sprints = []
+    for idx, offset in enumerate((28, 14)):
+        start = today - timedelta(days=offset)
+        resp = client.post(
+            "/sprints",
+            json={
+                "nombre": f"Sprint {idx + 1}",
+                "celula_id": celula_id,
+                "fecha_inicio": start.isoformat(),
+                "fecha_fin": (start + timedelta(days=12)).isoformat(),
+            },
+        )
+        assert resp.status_code == 201
+        sprints.append(resp.json()["id"])
+    items = [
+        ("REP-1", sprints[0], "Finalizada", 3, today - timedelta(days=20)),
+        ("REP-2", sprints[0], "In Progress", 5, None),
+        ("REP-3", sprints[1], "Done", 8, today - timedelta(days=5)),
+        ("REP-4", sprints[1], "Done", None, None),
+    ]
+    for issue_key, sprint_id, status, points, end_date in items:
+        resp = client.post(
+            "/sprint-items",
+            json={
+                "celula_id": celula_id,
+                "sprint_id": sprint_id,
+                "issue_key": issue_key,
+                "issue_type": "Task",
+                "summary": issue_key,
+                "status": status,
+                "story_points": points,
+                "end_date": end_date.isoformat() if end_date else None,
+            },
+        )
+        assert resp.status_code == 201
+    releases = (("REL-1", "Released", today - timedelta(days=3)), ("REL-2", "Backlog", None))
+    for issue_key, status, end_date in releases:
+        resp = client.post(
+            "/release-items",
+            json={
+                "celula_id": celula_id,
+                "issue_type": "Release",
+                "issue_key": issue_key,
+                "summary": issue_key,
+                "status": status,
+                "story_points": 2,
+                "release_tipo": "comprometido",
+                "quarter": "Q1 2026",
+                "end_date": end_date.isoformat() if end_date else None,
+            },
+        )
+        assert resp.status_code == 201
+    return celula_id, sprints
+
+
+def test_reports_aggregate_velocity_carry_over_and_quality(client: TestClient):
+    celula_id, sprints = seed(client)
+
+    resp = client.get(f"/reports/velocity?celula_id={celula_id}")
+    assert resp.status_code == 200
+    velocity = {row["sprint_id"]: row for row in resp.json()}
+    assert velocity[sprints[0]]["items"] == 2
+    assert velocity[sprints[0]]["items_finalizados"] == 1
+    assert velocity[sprints[0]]["story_points"] == 8
+    assert velocity[sprints[0]]["story_points_completados"] == 3
+    assert velocity[sprints[1]]["story_points_completados"] == 8
+    assert velocity[sprints[1]]["cumplimiento"] == 100.0
+
+    resp = client.get(f"/reports/velocity?celula_id={celula_id}&sprints=1")
+    assert [row["sprint_id"] for row in resp.json()] == [sprints[1]]
+
+    resp = client.get(f"/reports/throughput?celula_id={celula_id}")
+    assert resp.status_code == 200
+    assert sum(row["items"] for row in resp.json()) == 2
+    assert sum(row["story_points"] for row in resp.json()) == 11
+
+    resp = client.get(f"/reports/carry-over?celula_id={celula_id}")
+    assert resp.status_code == 200
+    carry = resp.json()
+    assert len(carry) == 1
+    assert carry[0]["sprint_id"] == sprints[0]
+    assert carry[0]["items"] == 1
+
+    resp = client.get("/reports/quarter-burnup?quarter=Q1 2026")
+    assert resp.status_code == 200
+    burnup = resp.json()
+    assert burnup[0]["items"] == 2
+    assert burnup[0]["items_finalizados"] == 1
+    assert burnup[0]["serie"][-1]["story_points_completados"] == 2
+
+    resp = client.get(f"/reports/data-quality?celula_id={celula_id}")
+    assert resp.status_code == 200
+    quality = resp.json()[0]
+    assert quality["items"] == 4
+    assert quality["sin_responsable"] == 4
+    assert quality["sin_story_points"] == 1
+    assert quality["finalizados_sin_end_date"] == 1
+    assert quality["releases"] == 2
+    assert quality["releases_sin_quarter"] == 0
+
+
+def test_reports_require_session(client: TestClient):
+    resp = client.get("/reports/velocity")
+    assert resp.status_code == 401
+
+
+def test_sprint_metrics_refresh_on_item_writes_and_rebuild(client: TestClient):
+    celula_id, sprints = seed(client)
+
+    resp = client.get(f"/reports/sprint-metrics?celula_id={celula_id}")
+    assert resp.status_code == 200
+    metrics = {row["sprint_id"]: row for row in resp.json()}
+    assert metrics[sprints[0]]["items"] == 2
+    assert metrics[sprints[0]]["por_estado"]["In Progress"]["story_points"] == 5
+    assert metrics[sprints[1]]["por_persona"][0]["story_points_completados"] == 8
+
+    items = client.get(f"/sprint-items?celula_id={celula_id}").json()
+    moved = next(item for item in items if item["issue_key"] == "REP-2")
+    resp = client.put(f"/sprint-items/{moved['id']}", json={"sprint_id": sprints[1], "status": "Done"})
+    assert resp.status_code == 200
+    metrics = {row["sprint_id"]: row for row in client.get("/reports/sprint-metrics").json()}
+    assert metrics[sprints[0]]["items"] == 1
+    assert metrics[sprints[1]]["items"] == 3
+    assert metrics[sprints[1]]["story_points_completados"] == 13
+
+    removed = next(item for item in items if item["issue_key"] == "REP-1")
+    assert client.delete(f"/sprint-items/{removed['id']}").status_code == 204
+    metrics = {row["sprint_id"]: row for row in client.get("/reports/sprint-metrics").json()}
+    assert metrics[sprints[0]]["items"] == 0
+    velocity = client.get(f"/reports/velocity?celula_id={celula_id}").json()
+    assert [row["sprint_id"] for row in velocity] == [sprints[1]]
+
+    resp = client.post("/reports/rebuild")
+    assert resp.status_code == 200
+    assert resp.json() == {"sprints": 2, "celulas": 1}
+    rebuilt = {row["sprint_id"]: row for row in client.get("/reports/sprint-metrics").json()}
+    assert rebuilt[sprints[1]]["items"] == 3
+
+    assert client.delete(f"/sprints/{sprints[0]}").status_code == 200
+    remaining = [row["sprint_id"] for row in client.get("/reports/sprint-metrics").json()]
+    assert remaining == [sprints[1]]
+
+
+def test_quarter_rollup_tracks_releases_and_linked_tasks(client: TestClient):
+    celula_id, _ = seed(client)
+    resp = client.post(
+        "/release-items",
+        json={
+            "celula_id": celula_id,
+            "issue_type": "Release",
+            "issue_key": "REL-3",
+            "summary": "Nuevo release",
+            "status": "In Progress",
+            "release_tipo": "nuevo",
+            "start_date": "2026-05-04",
+        },
+    )
+    assert resp.status_code == 201
+
+    rollups = {row["quarter"]: row for row in client.get(f"/reports/quarter-rollup?celula_id={celula_id}").json()}
+    assert list(rollups) == ["Q1 2026", "Q2 2026"]
+    assert rollups["Q1 2026"]["comprometidos"] == 2
+    assert rollups["Q1 2026"]["comprometidos_finalizados"] == 1
+    assert rollups["Q1 2026"]["cumplimiento"] == 50.0
+    assert rollups["Q1 2026"]["tareas"] == 0
+    assert rollups["Q2 2026"]["nuevos"] == 1
+
+    items = client.get(f"/sprint-items?celula_id={celula_id}").json()
+    for issue_key in ("REP-2", "REP-3"):
+        item = next(row for row in items if row["issue_key"] == issue_key)
+        resp = client.put(f"/sprint-items/{item['id']}", json={"release_issue_key": "REL-2"})
+        assert resp.status_code == 200
+
+    q1 = client.get("/reports/quarter-rollup?quarter=Q1 2026").json()[0]
+    assert q1["tareas"] == 2
+    assert q1["tareas_finalizadas"] == 1
+    assert q1["tareas_story_points_completados"] == 8
+    assert q1["avance_tareas"] == 50.0
+    linked = {row["issue_key"]: row for row in q1["por_release"]}
+    assert linked["REL-2"]["tareas"] == 2
+    assert linked["REL-1"]["tareas"] == 0
+
+    release = next(row for row in client.get("/release-items").json() if row["issue_key"] == "REL-2")
+    resp = client.put(f"/release-items/{release['id']}", json={"quarter": "Q2 2026", "status": "Finalizada"})
+    assert resp.status_code == 200
+    rollups = {row["quarter"]: row for row in client.get("/reports/quarter-rollup").json()}
+    assert rollups["Q1 2026"]["comprometidos"] == 1
+    assert rollups["Q1 2026"]["tareas"] == 0
+    assert rollups["Q2 2026"]["comprometidos_finalizados"] == 1
+    assert rollups["Q2 2026"]["tareas"] == 2
+
+
+@pytest.mark.parametrize("client", [True], indirect=True)
+def test_deleting_a_celula_clears_its_report_rows(client: TestClient):
+    celula_id, sprints = seed(client)
+    items = client.get(f"/sprint-items?celula_id={celula_id}").json()
+    assert client.delete(f"/sprint-items/{items[0]['id']}").status_code == 204
+    assert client.get(f"/reports/sprint-metrics?celula_id={celula_id}").json()
+    assert client.get(f"/reports/quarter-rollup?celula_id={celula_id}").json()
+    for item in items[1:]:
+        assert client.delete(f"/sprint-items/{item['id']}").status_code == 204
+    for release in client.get("/release-items").json():
+        assert client.delete(f"/release-items/{release['id']}").status_code in (200, 204)
+
+    resp = client.delete(f"/celulas/{celula_id}")
+    assert resp.status_code == 200
+    assert client.get("/reports/sprint-metrics").json() == []
+    assert client.get("/reports/quarter-rollup").json() == []
+
+
+def test_release_import_refreshes_the_quarter_rollup(client: TestClient):
+    celula_id, _ = seed(client)
+    items = client.get(f"/sprint-items?celula_id={celula_id}").json()
+    for issue_key in ("REP-2", "REP-3"):
+        item = next(row for row in items if row["issue_key"] == issue_key)
+        resp = client.put(f"/sprint-items/{item['id']}", json={"release_issue_key": "REP-9"})
+        assert resp.status_code == 200
+    before = client.get(f"/reports/quarter-rollup?celula_id={celula_id}&quarter=Q1 2026").json()[0]
+    assert (before["comprometidos"], before["tareas"]) == (2, 0)
+
+    headers = (
+        "Issue Type,Issue key,Issue id,Summary,Reporter,Reporter Id,Status,Story Points,"
+        "Assignee,Assignee Id,Start date,End date,Due date,Sprint,Quarter"
+    )
+    csv = f"{headers}\nRelease,REP-9,9009,Importado,,,Released,3,,,,,,,Q1 2026\n"
+    resp = client.post(
+        "/imports/release-items",
+        data={"tipo_release": "comprometido"},
+        files={"file": ("releases.csv", csv.encode(), "text/csv")},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["created"] == 1
+
+    after = client.get(f"/reports/quarter-rollup?celula_id={celula_id}&quarter=Q1 2026").json()[0]
+    assert after["comprometidos"] == 3
+    assert after["comprometidos_finalizados"] == 2
+    assert after["tareas"] == 2
+    assert {row["issue_key"]: row["tareas"] for row in after["por_release"]}["REP-9"] == 2
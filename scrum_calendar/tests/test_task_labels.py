@@ -0,0 +1,136 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import data.db as db
+import main as main_mod
+from app.modules.tasks.infrastructure.repository import SqlAlchemyTaskRepository
+from data.models import Base, Task
+
+
+@pytest.fixture()
+def session_local(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "SessionLocal", testing_session_local)
+    monkeypatch.setattr(main_mod, "engine", engine)
+    monkeypatch.setattr(main_mod, "SessionLocal", testing_session_local)
+    Base.metadata.create_all(bind=engine)
+    yield testing_session_local
+    engine.dispose()
+
+
+@pytest.fixture()
+def client(session_local):
+    def override_get_db():
+        session = session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as client:
+        resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+        assert resp.status_code == 200
+        yield client
+    main_mod.app.dependency_overrides.clear()
+
+
+def segments_by_title(client):
+    return {task["titulo"]: task["segmento"] for task in client.get("/tasks").json()}
+
+
+def test_segment_rename_and_delete_update_tasks_in_one_statement(client, max_queries):
+    for idx in range(30):
+        segmento = "Front  End" if idx % 2 else "Backend"
+        assert client.post("/tasks", json={"titulo": f"T{idx}", "segmento": segmento}).status_code == 201
+    segments = {item["nombre"]: item["id"] for item in client.get("/tasks/segments").json()}
+    assert set(segments) == {"Front End", "Backend"}
+
+    with max_queries(15, repeat=3):
+        resp = client.put(f"/tasks/segments/{segments['Front End']}", json={"nombre": "Frontend Web"})
+    assert resp.status_code == 200
+    by_title = segments_by_title(client)
+    assert by_title["T1"] == "Frontend Web"
+    assert by_title["T0"] == "Backend"
+
+    with max_queries(15, repeat=3):
+        assert client.delete(f"/tasks/segments/{segments['Front End']}").status_code == 204
+    by_title = segments_by_title(client)
+    assert by_title["T1"] is None
+    assert by_title["T0"] == "Backend"
+
+
+def test_backfill_segment_keys_for_existing_rows(session_local):
+    session = session_local()
+    try:
+        session.add_all(
+            [
+                Task(titulo="Vieja", estado="backlog", prioridad="media", segmento="  Diseño   UX "),
+                Task(titulo="Sin segmento", estado="backlog", prioridad="media"),
+            ]
+        )
+        session.commit()
+        assert SqlAlchemyTaskRepository(session).backfill_segment_keys() == 1
+        session.commit()
+        assert {task.titulo: task.segmento_key for task in session.query(Task)} == {
+            "Vieja": "diseno ux",
+            "Sin segmento": None,
+        }
+    finally:
+        session.close()
+
+
+def test_tasks_filter_and_count_by_normalized_tags(client, max_queries):
+    for titulo, etiquetas in (
+        ("A", "UI, Backend"),
+        ("B", "ui,  api"),
+        ("C", "Backend, backend"),
+        ("D", None),
+    ):
+        assert client.post("/tasks", json={"titulo": titulo, "etiquetas": etiquetas}).status_code == 201
+
+    def titles(*tags):
+        return sorted(task["titulo"] for task in client.get("/tasks", params={"etiqueta": list(tags)}).json())
+
+    assert titles("ui") == ["A", "B"]
+    assert titles("BACKEND", "ui") == ["A"]
+    assert client.get("/tasks/tags").json() == [
+        {"nombre": "Backend", "total": 2},
+        {"nombre": "UI", "total": 2},
+        {"nombre": "api", "total": 1},
+    ]
+    assert client.get("/tasks/tags", params={"etiqueta": "api"}).json() == [
+        {"nombre": "api", "total": 1},
+        {"nombre": "UI", "total": 1},
+    ]
+
+    task_b = next(task for task in client.get("/tasks").json() if task["titulo"] == "B")
+    assert client.put(f"/tasks/{task_b['id']}", json={"etiquetas": "backend"}).status_code == 200
+    assert titles("ui") == ["A"]
+    assert titles("backend") == ["A", "B", "C"]
+    assert client.post("/tasks", json={"titulo": "E", "etiquetas": "x" * 81}).status_code == 400
+
+    with max_queries(10):
+        assert client.get("/tasks", params={"etiqueta": ["ui", "backend"]}).status_code == 200
+
+
+def test_rebuild_tags_backfills_existing_etiquetas(session_local):
+    session = session_local()
+    try:
+        session.add_all(
+            [
+                Task(titulo="Vieja", estado="backlog", prioridad="media", etiquetas="Diseño, diseno , QA"),
+                Task(titulo="Otra", estado="backlog", prioridad="media", etiquetas="qa"),
+            ]
+        )
+        session.commit()
+        repo = SqlAlchemyTaskRepository(session)
+        assert repo.rebuild_tags() == 3
+        session.commit()
+        assert repo.tag_counts() == [("QA", 2), ("Diseño", 1)]
+    finally:
+        session.close()
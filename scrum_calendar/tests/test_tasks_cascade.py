@@ -247,3 +247,186 @@ def test_rejects_parent_cycles_and_allows_detach_parent(client: TestClient):
     resp = client.put(f"/tasks/{b_id}", json={"parent_id": None})
     assert resp.status_code == 200
     assert resp.json()["parent_id"] is None
+
+
+def test_cascade_statements_do_not_grow_with_depth(client: TestClient, max_queries):
+    bootstrap_admin(client)
+    resp = client.post("/celulas", json={"nombre": "Celula Deep", "jira_codigo": "DEP", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+
+    chain = []
+    parent_id = None
+    for idx in range(12):
+        resp = client.post("/tasks", json={"titulo": f"Nivel {idx}", "celula_id": celula_id, "parent_id": parent_id})
+        assert resp.status_code == 201
+        parent_id = resp.json()["id"]
+        chain.append(parent_id)
+
+    with max_queries(40) as shallow:
+        assert client.put(f"/tasks/{chain[2]}", json={"estado": "doing"}).status_code == 200
+    with max_queries(40) as deep:
+        assert client.put(f"/tasks/{chain[-1]}", json={"estado": "doing"}).status_code == 200
+    assert deep.queries == shallow.queries
+
+    items = {t["id"]: t for t in client.get(f"/tasks?celula_id={celula_id}").json()}
+    assert all(items[task_id]["estado"] == "doing" for task_id in chain)
+    assert items[chain[0]]["start_date"] == now_py().date().isoformat()
+
+
+def test_subtree_rollups_follow_create_update_move_and_delete(client: TestClient):
+    bootstrap_admin(client)
+    resp = client.post("/celulas", json={"nombre": "Celula Rollup", "jira_codigo": "ROL", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+
+    def create(titulo, parent_id=None, **extra):
+        resp = client.post(
+            "/tasks",
+            json={"titulo": titulo, "celula_id": celula_id, "parent_id": parent_id, **extra},
+        )
+        assert resp.status_code == 201
+        return resp.json()["id"]
+
+    def rollup(task_id):
+        items = {t["id"]: t for t in client.get(f"/tasks?celula_id={celula_id}").json()}
+        item = items[task_id]
+        return (
+            item["descendientes_total"],
+            item["descendientes_abiertos"],
+            item["descendientes_puntos"],
+            item["descendientes_horas"],
+        )
+
+    root = create("Raiz")
+    mid = create("Medio", root, puntos=2)
+    leaf = create("Hoja", mid, puntos=3, horas_estimadas=5, start_date="2026-03-02")
+    other = create("Otra raiz")
+    assert rollup(root) == (2, 2, 5.0, 5.0)
+    assert rollup(mid) == (1, 1, 3.0, 5.0)
+
+    assert client.put(f"/tasks/{leaf}", json={"estado": "done", "puntos": 8}).status_code == 200
+    assert rollup(root) == (2, 1, 10.0, 5.0)
+
+    assert client.put(f"/tasks/{mid}", json={"parent_id": other}).status_code == 200
+    assert rollup(root) == (0, 0, 0.0, 0.0)
+    assert rollup(other) == (2, 1, 10.0, 5.0)
+
+    assert client.delete(f"/tasks/{leaf}").status_code == 204
+    assert rollup(other) == (1, 1, 2.0, 0.0)
+    assert rollup(mid) == (0, 0, 0.0, 0.0)
+
+
+def test_parent_stays_doing_while_any_descendant_is_in_progress(client: TestClient):
+    bootstrap_admin(client)
+    resp = client.post("/celulas", json={"nombre": "Celula Nietos", "jira_codigo": "NIE", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+
+    def create(titulo, parent_id=None, **extra):
+        resp = client.post(
+            "/tasks",
+            json={"titulo": titulo, "celula_id": celula_id, "parent_id": parent_id, **extra},
+        )
+        assert resp.status_code == 201
+        return resp.json()["id"]
+
+    def estado(task_id):
+        return {t["id"]: t for t in client.get(f"/tasks?celula_id={celula_id}").json()}[task_id]["estado"]
+
+    root = create("Raiz")
+    sibling = create("Hermana", root)
+    branch = create("Rama", root)
+    grandchild = create("Nieta", branch)
+    assert client.put(f"/tasks/{grandchild}", json={"estado": "doing"}).status_code == 200
+    assert estado(root) == "doing"
+
+    # The in-progress task is a grandchild: neither of root's children is.
+    assert client.put(f"/tasks/{branch}", json={"estado": "backlog"}).status_code == 200
+    assert client.put(f"/tasks/{root}", json={"estado": "backlog"}).status_code == 200
+    items = {t["id"]: t for t in client.get(f"/tasks?celula_id={celula_id}").json()}
+    assert items[root]["descendientes_en_curso"] == 1
+    assert items[grandchild]["estado"] == "doing"
+
+    assert client.put(f"/tasks/{sibling}", json={"estado": "done"}).status_code == 200
+    assert estado(root) == "doing"
+
+
+def test_reparent_cycle_check_and_breadcrumb_are_one_query_per_tree_depth(client: TestClient, max_queries):
+    bootstrap_admin(client)
+    resp = client.post("/celulas", json={"nombre": "Celula Path", "jira_codigo": "PTH", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+
+    chain = []
+    parent_id = None
+    for idx in range(15):
+        resp = client.post("/tasks", json={"titulo": f"Nivel {idx}", "celula_id": celula_id, "parent_id": parent_id})
+        assert resp.status_code == 201
+        parent_id = resp.json()["id"]
+        chain.append(parent_id)
+    loose = [
+        client.post("/tasks", json={"titulo": f"Suelta {idx}", "celula_id": celula_id}).json()["id"]
+        for idx in range(2)
+    ]
+
+    resp = client.get(f"/tasks/{chain[-1]}/path")
+    assert resp.status_code == 200
+    assert [item["id"] for item in resp.json()] == chain
+    assert client.get("/tasks/999999/path").status_code == 404
+
+    assert client.put(f"/tasks/{chain[0]}", json={"parent_id": chain[-1]}).status_code == 400
+    with max_queries(40) as shallow:
+        assert client.put(f"/tasks/{loose[0]}", json={"parent_id": chain[1]}).status_code == 200
+    with max_queries(40) as deep:
+        assert client.put(f"/tasks/{loose[1]}", json={"parent_id": chain[-1]}).status_code == 200
+    assert deep.queries == shallow.queries
+
+
+def test_batch_update_reorders_and_moves_in_one_transaction(client: TestClient, max_queries):
+    bootstrap_admin(client)
+    resp = client.post("/celulas", json={"nombre": "Celula Board", "jira_codigo": "BRD", "activa": True})
+    assert resp.status_code == 201
+    celula_id = resp.json()["id"]
+
+    def create(titulo, **extra):
+        resp = client.post("/tasks", json={"titulo": titulo, "celula_id": celula_id, **extra})
+        assert resp.status_code == 201
+        return resp.json()["id"]
+
+    epic = create("Epica")
+    cards = [create(f"Card {idx}", puntos=1) for idx in range(50)]
+
+    def reorder(ids):
+        items = [{"id": task_id, "orden": float(len(ids) - pos)} for pos, task_id in enumerate(ids)]
+        resp = client.patch("/tasks:batch", json={"items": items})
+        assert resp.status_code == 200
+        return resp.json()
+
+    with max_queries(25) as few:
+        reorder(cards[:5])
+    with max_queries(25) as many:
+        result = reorder(cards)
+    assert many.queries == few.queries
+    assert [item["id"] for item in result] == cards
+    assert result[0]["orden"] == 50.0
+
+    items = [{"id": task_id, "parent_id": epic} for task_id in cards[:3]]
+    items[1]["estado"] = "doing"
+    resp = client.patch("/tasks:batch", json={"items": items})
+    assert resp.status_code == 200
+    tasks = {t["id"]: t for t in client.get(f"/tasks?celula_id={celula_id}").json()}
+    assert tasks[epic]["estado"] == "doing"
+    assert tasks[epic]["start_date"] == now_py().date().isoformat()
+    assert (tasks[epic]["descendientes_total"], tasks[epic]["descendientes_puntos"]) == (3, 3.0)
+
+    # Any invalid item rolls the whole batch back.
+    resp = client.patch(
+        "/tasks:batch",
+        json={"items": [{"id": cards[3], "titulo": "Renombrada"}, {"id": cards[4], "sprint_id": 999}]},
+    )
+    assert resp.status_code == 404
+    tasks = {t["id"]: t for t in client.get(f"/tasks?celula_id={celula_id}").json()}
+    assert tasks[cards[3]]["titulo"] == "Card 3"
+    resp = client.patch("/tasks:batch", json={"items": [{"id": epic, "parent_id": cards[0]}]})
+    assert resp.status_code == 400
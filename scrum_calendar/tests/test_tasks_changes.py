@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.websockets import WebSocketDisconnect
+
+import data.db as db
+import main as main_mod
+from app.modules.tasks.infrastructure.repository import SqlAlchemyTaskRepository
+from app.modules.tasks.interface.jobs import prune_task_changes
+from config.settings import settings
+from data.models import now_py
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "SessionLocal", testing_session_local)
+    monkeypatch.setattr(main_mod, "engine", engine)
+    monkeypatch.setattr(main_mod, "SessionLocal", testing_session_local)
+
+    def override_get_db():
+        session = testing_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as client:
+        resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+        assert resp.status_code == 200
+        yield client
+    main_mod.app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def changes(client, since, **params):
+    resp = client.get("/tasks/changes", params={"since": since, **params})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_feed_returns_the_latest_change_per_task_after_the_cursor(client):
+    start = client.get("/tasks/changes").json()
+    assert start == {"cursor": 0, "reset": False, "has_more": False, "changes": []}
+
+    parent_id = client.post("/tasks", json={"titulo": "Padre", "segmento": "Web"}).json()["id"]
+    child_id = client.post("/tasks", json={"titulo": "Hija", "parent_id": parent_id}).json()["id"]
+    loose_id = client.post("/tasks", json={"titulo": "Suelta"}).json()["id"]
+    assert client.put(f"/tasks/{loose_id}", json={"titulo": "Suelta 2"}).status_code == 200
+    assert client.delete(f"/tasks/{child_id}").status_code == 204
+
+    feed = changes(client, start["cursor"])
+    # The delete refreshed the parent's roll-up, so the parent comes last.
+    assert [(item["task_id"], item["op"]) for item in feed["changes"]] == [
+        (loose_id, "upsert"),
+        (child_id, "delete"),
+        (parent_id, "upsert"),
+    ]
+    versions = [item["version"] for item in feed["changes"]]
+    assert versions == sorted(versions) and feed["cursor"] == versions[-1]
+    # Upserts carry the current row, roll-ups included.
+    assert feed["changes"][0]["task"]["titulo"] == "Suelta 2"
+    assert feed["changes"][1]["task"] is None
+    assert feed["changes"][2]["task"]["descendientes_total"] == 0
+    assert changes(client, feed["cursor"])["changes"] == []
+
+    # Bulk writes are logged too: a segment rename touches every tagged task.
+    segment_id = client.get("/tasks/segments").json()[0]["id"]
+    assert client.put(f"/tasks/segments/{segment_id}", json={"nombre": "Web App"}).status_code == 200
+    renamed = changes(client, feed["cursor"])
+    assert [(item["task_id"], item["task"]["segmento"]) for item in renamed["changes"]] == [(parent_id, "Web App")]
+
+
+def test_feed_pages_with_limit_and_asks_for_a_reload_past_retention(client):
+    ids = [client.post("/tasks", json={"titulo": f"T{index}"}).json()["id"] for index in range(3)]
+
+    first = changes(client, 0, limit=2)
+    assert [item["task_id"] for item in first["changes"]] == ids[:2]
+    assert first["has_more"] is True
+    rest = changes(client, first["cursor"], limit=2)
+    assert [item["task_id"] for item in rest["changes"]] == ids[2:]
+    assert rest["has_more"] is False
+
+    # Everything but the newest entry ages out: old cursors must reload.
+    assert prune_task_changes(now_py() + timedelta(hours=settings.task_changes_retention_hours + 1)) == 2
+    assert changes(client, 0) == {"cursor": rest["cursor"], "reset": True, "has_more": False, "changes": []}
+    assert changes(client, rest["cursor"])["reset"] is False
+    assert changes(client, rest["cursor"] + 50)["reset"] is True
+
+
+def test_changes_are_written_at_commit_and_dropped_on_rollback(client):
+    task_id = client.post("/tasks", json={"titulo": "Base"}).json()["id"]
+    cursor = client.get("/tasks/changes").json()["cursor"]
+    session = db.SessionLocal()
+    try:
+        repo = SqlAlchemyTaskRepository(session)
+        repo.log_changes([task_id])
+        session.rollback()
+        session.commit()
+        assert changes(client, cursor)["changes"] == []
+
+        repo.log_changes([task_id], "delete")
+        repo.log_changes([task_id])
+        session.commit()
+    finally:
+        session.close()
+    assert [(item["task_id"], item["op"]) for item in changes(client, cursor)["changes"]] == [(task_id, "upsert")]
+
+
+def test_websocket_pushes_new_changes(client, monkeypatch):
+    monkeypatch.setattr(settings, "task_changes_poll_seconds", 0.1)
+    with client.websocket_connect("/ws/tasks") as ws:
+        hello = ws.receive_json()
+        assert hello["type"] == "cursor"
+        task_id = client.post("/tasks", json={"titulo": "En vivo"}).json()["id"]
+        pushed = ws.receive_json()
+    assert pushed["type"] == "task_changes"
+    assert pushed["since"] == hello["cursor"]
+    assert [(item["task_id"], item["task"]["titulo"]) for item in pushed["changes"]] == [(task_id, "En vivo")]
+
+    client.post("/auth/logout")
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/ws/tasks") as ws:
+            ws.receive_json()
@@ -0,0 +1,126 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import data.db as db
+import main as main_mod
+from app.modules.tasks.infrastructure.repository import SqlAlchemyTaskRepository
+from config.settings import settings
+from data.models import Base, Task, TaskClosure, TaskComment
+
+
+@pytest.fixture()
+def session_local(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "task_closure_enabled", True)
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "SessionLocal", testing_session_local)
+    monkeypatch.setattr(main_mod, "engine", engine)
+    monkeypatch.setattr(main_mod, "SessionLocal", testing_session_local)
+    Base.metadata.create_all(bind=engine)
+    yield testing_session_local
+    engine.dispose()
+
+
+@pytest.fixture()
+def client(session_local):
+    def override_get_db():
+        session = session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as client:
+        resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+        assert resp.status_code == 200
+        yield client
+    main_mod.app.dependency_overrides.clear()
+
+
+def closure_rows(session_local):
+    session = session_local()
+    try:
+        return {(row.ancestro_id, row.descendiente_id, row.profundidad) for row in session.query(TaskClosure)}
+    finally:
+        session.close()
+
+
+def rebuilt_rows(session_local):
+    session = session_local()
+    try:
+        SqlAlchemyTaskRepository(session).rebuild_closure()
+        rows = {(row.ancestro_id, row.descendiente_id, row.profundidad) for row in session.query(TaskClosure)}
+        session.rollback()
+        return rows
+    finally:
+        session.close()
+
+
+def test_closure_follows_create_move_and_subtree_delete(client, session_local):
+    resp = client.post("/celulas", json={"nombre": "Celula Arbol", "jira_codigo": "ARB", "activa": True})
+    celula_id = resp.json()["id"]
+
+    def create(titulo, parent_id=None):
+        resp = client.post("/tasks", json={"titulo": titulo, "celula_id": celula_id, "parent_id": parent_id})
+        assert resp.status_code == 201
+        return resp.json()["id"]
+
+    root = create("Raiz")
+    mid = create("Medio", root)
+    leaf = create("Hoja", mid)
+    other = create("Otra")
+    assert (root, leaf, 2) in closure_rows(session_local)
+    assert closure_rows(session_local) == rebuilt_rows(session_local)
+
+    assert client.put(f"/tasks/{root}", json={"parent_id": leaf}).status_code == 400
+    assert client.put(f"/tasks/{mid}", json={"parent_id": other}).status_code == 200
+    rows = closure_rows(session_local)
+    assert (other, leaf, 2) in rows and (root, leaf, 2) not in rows
+    assert rows == rebuilt_rows(session_local)
+    assert [item["id"] for item in client.get(f"/tasks/{leaf}/path").json()] == [other, mid, leaf]
+
+    assert client.post(f"/tasks/{leaf}/comments", json={"texto": "nota"}).status_code == 201
+    assert client.delete(f"/tasks/{mid}").status_code == 204
+    session = session_local()
+    try:
+        assert {task.id for task in session.query(Task)} == {root, other}
+        assert session.query(TaskComment).count() == 0
+    finally:
+        session.close()
+    assert closure_rows(session_local) == {(root, root, 0), (other, other, 0)}
+    assert client.get(f"/tasks?celula_id={celula_id}").json()[0]["descendientes_total"] == 0
+
+
+def test_repository_queries_match_the_recursive_fallback(session_local, monkeypatch):
+    session = session_local()
+    try:
+        session.add_all(
+            [
+                Task(id=1, titulo="Raiz", estado="backlog", prioridad="media"),
+                Task(id=2, titulo="Medio", estado="backlog", prioridad="media", parent_id=1),
+                Task(id=3, titulo="Hoja", estado="backlog", prioridad="media", parent_id=2),
+                Task(id=4, titulo="Hermana", estado="backlog", prioridad="media", parent_id=1),
+            ]
+        )
+        session.flush()
+        repo = SqlAlchemyTaskRepository(session)
+        assert repo.rebuild_closure() == 8
+
+        answers = []
+        for enabled in (True, False):
+            monkeypatch.setattr(settings, "task_closure_enabled", enabled)
+            answers.append(
+                (
+                    repo.ancestor_ids(3),
+                    sorted(repo.descendant_ids(1)),
+                    repo.would_create_parent_cycle(1, 3),
+                    repo.would_create_parent_cycle(4, 3),
+                )
+            )
+        assert answers[0] == answers[1] == ([3, 2, 1], [1, 2, 3, 4], True, False)
+    finally:
+        session.close()
@@ -1,7 +1,9 @@
 from datetime import date
 
 from app.modules.tasks.domain.hierarchy import (
+    SubtreeRollup,
     TaskNode,
+    build_subtree_rollups,
     descendants_rollup,
     same_optional_int,
     subtree_info,
@@ -52,3 +54,19 @@ def test_descendants_rollup_ignores_parent_self():
     assert info.min_start_date == date(2026, 5, 3)
     assert info.any_doing is False
 
+
+def test_build_subtree_rollups_counts_open_points_and_earliest_start():
+    rows = [
+        (1, None, "backlog", None, 1.0, None),
+        (2, 1, "done", date(2026, 3, 5), 2.0, 4.0),
+        (3, 2, "todo", date(2026, 3, 2), 3.0, None),
+        (4, 1, "archived", None, None, 1.0),
+    ]
+    rollups = build_subtree_rollups(rows)
+    assert rollups[1] == SubtreeRollup(
+        count=3, open_count=1, in_progress_count=1, min_start_date=date(2026, 3, 2), points=5.0, hours=5.0
+    )
+    assert rollups[2] == SubtreeRollup(
+        count=1, open_count=1, in_progress_count=1, min_start_date=date(2026, 3, 2), points=3.0, hours=0.0
+    )
+    assert rollups[3] == SubtreeRollup()
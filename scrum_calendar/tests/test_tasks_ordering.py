@@ -0,0 +1,108 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import data.db as db
+import main as main_mod
+from app.modules.tasks.domain.ordering import ORDER_GAP, is_crowded, order_between, spaced_orders
+from app.modules.tasks.interface.jobs import rebalance_crowded_columns
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "SessionLocal", testing_session_local)
+    monkeypatch.setattr(main_mod, "engine", engine)
+    monkeypatch.setattr(main_mod, "SessionLocal", testing_session_local)
+
+    def override_get_db():
+        session = testing_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as client:
+        resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+        assert resp.status_code == 200
+        yield client
+    main_mod.app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_order_between_neighbours_and_ends():
+    assert order_between(None, None) == ORDER_GAP
+    assert order_between(10.0, None) == 10.0 + ORDER_GAP
+    assert order_between(None, 10.0) == 10.0 - ORDER_GAP
+    assert order_between(1.0, 2.0) == 1.5
+    assert order_between(1.0, 1.0) is None
+    assert order_between(1.0, 1.0 + 2.0**-52) is None
+    assert is_crowded(1.0, 1.0001) and not is_crowded(1.0, 2.0)
+    assert spaced_orders(3) == [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP]
+
+
+def column_titles(client, celula_id):
+    tasks = client.get(f"/tasks?celula_id={celula_id}&estado=backlog").json()
+    return [task["titulo"] for task in sorted(tasks, key=lambda task: (task["orden"], task["id"]))]
+
+
+def test_moves_write_one_row_and_crowded_columns_get_respaced(client, max_queries):
+    resp = client.post("/celulas", json={"nombre": "Celula Orden", "jira_codigo": "ORD", "activa": True})
+    celula_id = resp.json()["id"]
+    ids = {}
+    for titulo, orden in (("A", 1.0), ("B", 2.0), ("C", 3.0)):
+        resp = client.post("/tasks", json={"titulo": titulo, "celula_id": celula_id, "orden": orden})
+        ids[titulo] = resp.json()["id"]
+
+    # Keep dropping a card right above B: the gap halves on every move, and
+    # the background job (run here every 10 moves) respaces the column in time.
+    rebalanced = 0
+    for step in range(60):
+        card, before = ("C", "A") if step % 2 == 0 else ("A", "C")
+        with max_queries(10) as stats:
+            resp = client.post(f"/tasks/{ids[card]}/move", json={"before_id": ids[before], "after_id": ids["B"]})
+        assert resp.status_code == 200
+        writes = [shape for shape in stats.statements if shape.startswith("UPDATE tasks")]
+        assert [stats.statements[shape][0] for shape in writes] == [1]
+        if step % 10 == 9:
+            rebalanced += rebalance_crowded_columns()
+    assert rebalanced >= 2
+    assert column_titles(client, celula_id)[-1] == "B"
+
+    # Out of room with no job in between: the move respaces the column itself.
+    assert client.put(f"/tasks/{ids['A']}", json={"orden": 5.0}).status_code == 200
+    assert client.put(f"/tasks/{ids['C']}", json={"orden": 5.0}).status_code == 200
+    resp = client.post(f"/tasks/{ids['B']}/move", json={"before_id": ids["A"], "after_id": ids["C"]})
+    assert resp.status_code == 200
+    assert column_titles(client, celula_id) == ["A", "B", "C"]
+    assert sorted(task["orden"] for task in client.get(f"/tasks?celula_id={celula_id}").json()) == [
+        ORDER_GAP,
+        1.5 * ORDER_GAP,
+        2 * ORDER_GAP,
+    ]
+    assert rebalance_crowded_columns() == 0
+
+    assert client.post(f"/tasks/{ids['A']}/move", json={"before_id": ids["A"]}).status_code == 400
+    assert client.post(f"/tasks/{ids['A']}/move", json={"after_id": 999}).status_code == 404
+    resp = client.post(f"/tasks/{ids['B']}/move", json={"after_id": ids["A"]})
+    assert resp.status_code == 200
+    assert column_titles(client, celula_id)[0] == "B"
+
+
+def test_move_rejects_neighbours_from_another_column(client):
+    resp = client.post("/celulas", json={"nombre": "Celula Mix", "jira_codigo": "MIX", "activa": True})
+    celula_id = resp.json()["id"]
+    card = client.post("/tasks", json={"titulo": "Card", "celula_id": celula_id, "orden": 1.0}).json()
+    same = client.post("/tasks", json={"titulo": "Same", "celula_id": celula_id, "orden": 2.0}).json()
+    doing = client.post("/tasks", json={"titulo": "Doing", "celula_id": celula_id, "estado": "doing"}).json()
+    other_board = client.post("/tasks", json={"titulo": "Other", "orden": 3.0}).json()
+
+    for neighbour in (doing, other_board):
+        resp = client.post(f"/tasks/{card['id']}/move", json={"before_id": same["id"], "after_id": neighbour["id"]})
+        assert resp.status_code == 409
+    assert client.get(f"/tasks?celula_id={celula_id}&estado=backlog").json()[0]["orden"] == 1.0
+    assert client.post(f"/tasks/{card['id']}/move", json={"before_id": same["id"]}).status_code == 200
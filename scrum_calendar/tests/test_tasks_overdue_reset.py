@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -6,7 +6,9 @@ from sqlalchemy.orm import sessionmaker
 
 import main as main_mod
 import data.db as db
-from data.models import Base, now_py
+from app.modules.tasks.interface.jobs import OVERDUE_RESET_JOB, run_daily_overdue_reset, seconds_until_next_run
+from config.settings import settings
+from data.models import Base, Feriado, JobRun, Task, now_py
 
 
 def build_client(tmp_path):
@@ -83,3 +85,80 @@ def test_overdue_reset_moves_parent_and_child_from_doing_to_todo(tmp_path):
             assert updated[task_id]["estado"] == "todo"
             assert updated[task_id]["fecha_vencimiento"] == today
     main_mod.app.dependency_overrides.clear()
+
+
+def add_overdue_tasks(count: int, estado: str = "doing"):
+    overdue = now_py().date() - timedelta(days=2)
+    session = db.SessionLocal()
+    try:
+        session.add_all(
+            Task(titulo=f"Vencida {idx}", estado=estado, prioridad="media", fecha_vencimiento=overdue)
+            for idx in range(count)
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_overdue_reset_statements_do_not_grow_with_matches(tmp_path, max_queries):
+    with build_client(tmp_path) as client:
+        assert client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"}).status_code == 200
+        add_overdue_tasks(3)
+        with max_queries(20) as few:
+            assert len(client.post("/tasks/overdue-to-today").json()) == 3
+        add_overdue_tasks(40)
+        add_overdue_tasks(5, estado="todo")
+        with max_queries(20) as many:
+            reset = client.post("/tasks/overdue-to-today").json()
+        assert len(reset) == 45
+        assert {task["estado"] for task in reset} == {"todo"}
+        assert {task["fecha_vencimiento"] for task in reset} == {now_py().date().isoformat()}
+        assert many.queries == few.queries
+    main_mod.app.dependency_overrides.clear()
+
+
+def next_monday():
+    today = now_py().date()
+    return today + timedelta(days=7 - today.weekday())
+
+
+def test_daily_job_resets_every_user_once_per_business_day(tmp_path):
+    with build_client(tmp_path):
+        add_overdue_tasks(4)
+        monday = next_monday()
+        assert run_daily_overdue_reset(monday) == 4
+        add_overdue_tasks(2)
+        assert run_daily_overdue_reset(monday) is None
+        # The next day every open task due Monday is overdue again.
+        assert run_daily_overdue_reset(monday + timedelta(days=1)) == 6
+    main_mod.app.dependency_overrides.clear()
+
+
+def test_daily_job_skips_weekends_and_company_holidays(tmp_path):
+    with build_client(tmp_path):
+        add_overdue_tasks(3)
+        monday = next_monday()
+        session = db.SessionLocal()
+        try:
+            session.add(Feriado(fecha=monday, nombre="Feriado nacional"))
+            session.commit()
+        finally:
+            session.close()
+        assert run_daily_overdue_reset(monday - timedelta(days=2)) is None
+        assert run_daily_overdue_reset(monday - timedelta(days=1)) is None
+        assert run_daily_overdue_reset(monday) is None
+        assert run_daily_overdue_reset(monday + timedelta(days=1)) == 3
+        session = db.SessionLocal()
+        try:
+            claim = session.get(JobRun, OVERDUE_RESET_JOB)
+            assert claim.ultimo_dia == monday + timedelta(days=1)
+            assert claim.ejecutado_en is not None
+        finally:
+            session.close()
+    main_mod.app.dependency_overrides.clear()
+
+
+def test_daily_job_waits_for_the_configured_time(monkeypatch):
+    monkeypatch.setattr(settings, "overdue_reset_job_time", "05:30")
+    assert seconds_until_next_run(datetime(2026, 3, 2, 5, 0)) == 30 * 60
+    assert seconds_until_next_run(datetime(2026, 3, 2, 6, 0)) == 23.5 * 3600
@@ -1,3 +1,5 @@
+from datetime import date
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -32,3 +34,59 @@ def test_task_repository_tree_and_cycle_detection(tmp_path):
     finally:
         db.close()
 
+
+def test_ancestor_rollups_aggregate_other_children_per_level(tmp_path):
+    db = build_session(tmp_path)
+    try:
+        root = Task(id=1, titulo="Raiz", celula_id=1, estado="backlog", prioridad="media")
+        mid = Task(id=2, titulo="Medio", celula_id=1, estado="backlog", prioridad="media", parent_id=1)
+        leaf = Task(id=3, titulo="Hoja", celula_id=1, estado="doing", prioridad="media", parent_id=2)
+        sibling = Task(
+            id=4, titulo="Hermana", celula_id=1, estado="todo", prioridad="media", parent_id=1,
+            start_date=date(2026, 3, 2),
+        )
+        db.add_all([root, mid, leaf, sibling])
+        db.commit()
+
+        rollups = SqlAlchemyTaskRepository(db).ancestor_rollups(2, 3)
+
+        assert [item.id for item in rollups] == [2, 1]
+        assert rollups[0].other_children.in_progress_count == 0
+        assert rollups[0].other_children.count == 0
+        assert rollups[0].other_children.min_start_date is None
+        assert rollups[1].other_children.in_progress_count == 1
+        assert rollups[1].other_children.count == 1
+        assert rollups[1].other_children.min_start_date == date(2026, 3, 2)
+    finally:
+        db.close()
+
+
+def test_rebuild_rollups_summarises_every_subtree(tmp_path):
+    db = build_session(tmp_path)
+    try:
+        db.add_all(
+            [
+                Task(id=1, titulo="Raiz", celula_id=1, estado="backlog", prioridad="media", puntos=1),
+                Task(
+                    id=2, titulo="Medio", celula_id=1, estado="done", prioridad="media", parent_id=1,
+                    puntos=2, horas_estimadas=4, start_date=date(2026, 3, 5),
+                ),
+                Task(
+                    id=3, titulo="Hoja", celula_id=1, estado="todo", prioridad="media", parent_id=2,
+                    puntos=3, start_date=date(2026, 3, 2),
+                ),
+            ]
+        )
+        db.commit()
+
+        assert SqlAlchemyTaskRepository(db).rebuild_rollups() == 3
+        db.commit()
+
+        root, mid, leaf = (db.get(Task, task_id) for task_id in (1, 2, 3))
+        assert (root.descendientes_total, root.descendientes_abiertos) == (2, 1)
+        assert root.descendientes_min_start_date == date(2026, 3, 2)
+        assert (root.descendientes_puntos, root.descendientes_horas) == (5.0, 4.0)
+        assert (mid.descendientes_total, mid.descendientes_puntos) == (1, 3.0)
+        assert (leaf.descendientes_total, leaf.descendientes_min_start_date) == (0, None)
+    finally:
+        db.close()
@@ -0,0 +1,104 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import main as main_mod
+import data.db as db
+from core.ui_session import UI_HINT_COOKIE, UI_SESSION_HINTS
+from data.models import Base
+
+
+@pytest.fixture()
+def client(tmp_path):
+    if not main_mod.ui_root.exists():
+        pytest.skip("UI bundle not present")
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db.engine = engine
+    db.SessionLocal = testing_session_local
+    main_mod.engine = engine
+    main_mod.SessionLocal = testing_session_local
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        session = testing_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main_mod.app.dependency_overrides[db.get_db] = override_get_db
+    with TestClient(main_mod.app) as test_client:
+        yield test_client
+    main_mod.app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def session_lookups(monkeypatch):
+    calls = []
+    original = main_mod._load_valid_session
+
+    async def counting(token):
+        calls.append(token)
+        return await original(token)
+
+    monkeypatch.setattr(main_mod, "_load_valid_session", counting)
+    return calls
+
+
+def bootstrap_admin(client: TestClient) -> None:
+    resp = client.post("/auth/bootstrap", json={"username": "admin", "password": "secret"})
+    assert resp.status_code == 200
+
+
+def test_ui_pages_skip_session_lookup_while_hint_is_valid(client: TestClient, session_lookups):
+    bootstrap_admin(client)
+    first = client.get("/ui/index.html")
+    assert first.status_code == 200
+    assert UI_HINT_COOKIE in first.cookies
+    assert len(session_lookups) == 1
+
+    for _ in range(3):
+        resp = client.get("/ui/index.html")
+        assert resp.status_code == 200
+        assert resp.headers["Cache-Control"] == "no-store"
+    assert len(session_lookups) == 1
+
+
+def test_tampered_or_foreign_hint_falls_back_to_the_database(client: TestClient, session_lookups):
+    bootstrap_admin(client)
+    token = client.cookies.get("scrum_session")
+    hint = UI_SESSION_HINTS.issue(token, 1)
+    payload, signature = hint.rsplit(".", 1)
+    client.cookies.set(UI_HINT_COOKIE, f"{payload}.{signature[:-2]}xx", path="/ui")
+    assert client.get("/ui/index.html").status_code == 200
+    assert len(session_lookups) == 1
+
+    other_session_hint = UI_SESSION_HINTS.issue("another-token", 1)
+    client.cookies.set(UI_HINT_COOKIE, other_session_hint, path="/ui")
+    assert client.get("/ui/index.html").status_code == 200
+    assert len(session_lookups) == 2
+
+
+def test_logout_and_user_changes_revoke_outstanding_hints(client: TestClient):
+    bootstrap_admin(client)
+    token = client.cookies.get("scrum_session")
+    assert client.get("/ui/index.html").status_code == 200
+    hint = client.cookies.get(UI_HINT_COOKIE)
+    assert UI_SESSION_HINTS.verify(hint, token) == 1
+
+    UI_SESSION_HINTS.revoke_user(1)
+    assert UI_SESSION_HINTS.verify(hint, token) is None
+    assert client.get("/ui/index.html").status_code == 200
+    hint = client.cookies.get(UI_HINT_COOKIE)
+    assert UI_SESSION_HINTS.verify(hint, token) == 1
+
+    assert client.post("/auth/logout").status_code == 200
+    assert UI_SESSION_HINTS.verify(hint, token) is None
+    replay = TestClient(main_mod.app, cookies={"scrum_session": token})
+    replay.cookies.set(UI_HINT_COOKIE, hint, path="/ui")
+    resp = replay.get("/ui/index.html", follow_redirects=False)
+    assert resp.status_code in {302, 307}
+    assert resp.headers["location"].endswith("/ui/login.html")
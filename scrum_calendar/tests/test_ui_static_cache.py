@@ -0,0 +1,80 @@
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import main as main_mod
+from app.shared.interface.static_assets import UIStaticFiles
+
+
+@pytest.fixture()
+def ui_client(tmp_path):
+    (tmp_path / "js").mkdir()
+    script = b"console.log('scrum calendar');\n" * 200
+    (tmp_path / "js" / "app.js").write_bytes(script)
+    (tmp_path / "js" / "app.js.gz").write_bytes(gzip.compress(script))
+    (tmp_path / "page.html").write_text(
+        '<link href="./styles.css?v=20260806"><script src="./js/app.js"></script>'
+        '<script src="https://cdn.example.com/lib.js"></script>',
+        encoding="utf-8",
+    )
+    (tmp_path / "styles.css").write_text("body { color: #000; }\n", encoding="utf-8")
+    app = FastAPI()
+    app.mount("/ui", UIStaticFiles(directory=str(tmp_path), html=True), name="ui")
+    return TestClient(app)
+
+
+def test_html_is_no_store_and_references_content_hashes(ui_client: TestClient):
+    resp = ui_client.get("/ui/page.html")
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == "no-store"
+    assert 'href="./styles.css?v=20260806"' not in resp.text
+    assert "https://cdn.example.com/lib.js\"" in resp.text
+    script_ref = resp.text.split('src="')[1].split('"')[0]
+    assert script_ref.startswith("./js/app.js?v=")
+
+    asset = ui_client.get(f"/ui/{script_ref[2:]}")
+    assert asset.status_code == 200
+    assert asset.headers["Cache-Control"].endswith("immutable")
+
+
+def test_unhashed_or_stale_asset_urls_revalidate_with_etag(ui_client: TestClient):
+    for url in ("/ui/styles.css", "/ui/styles.css?v=20260806"):
+        resp = ui_client.get(url)
+        assert resp.status_code == 200
+        assert resp.headers["Cache-Control"] == "no-cache"
+    again = ui_client.get("/ui/styles.css", headers={"If-None-Match": resp.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_precompressed_variant_served_only_when_accepted_and_fresh(ui_client: TestClient, tmp_path):
+    gz = ui_client.get("/ui/js/app.js", headers={"Accept-Encoding": "gzip"})
+    assert gz.status_code == 200
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gz.headers["Vary"] == "Accept-Encoding"
+    assert gz.headers["Content-Type"].startswith("text/javascript")
+    assert gz.content.startswith(b"console.log")
+
+    plain = ui_client.get("/ui/js/app.js", headers={"Accept-Encoding": "identity, gzip;q=0"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.content == gz.content
+
+    source = tmp_path / "js" / "app.js"
+    variant_mtime = os.stat(tmp_path / "js" / "app.js.gz").st_mtime
+    os.utime(source, (variant_mtime + 10, variant_mtime + 10))
+    stale = ui_client.get("/ui/js/app.js", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in stale.headers
+
+
+def test_auth_middleware_leaves_asset_caching_to_the_mount():
+    if not main_mod.ui_root.exists():
+        pytest.skip("UI bundle not present")
+    client = TestClient(main_mod.app)
+    asset = next(path for path in sorted(main_mod.ui_root.rglob("*.css")))
+    resp = client.get("/ui/" + asset.relative_to(main_mod.ui_root).as_posix())
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == "no-cache"
+    login = client.get("/ui/login.html")
+    assert login.headers["Cache-Control"] == "no-store"